@@ -0,0 +1,28 @@
+"""snapshot comparison fingerprint
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fingerprint of the normalized content, computed once when the snapshot is written.
+    # Existing rows keep NULL and are fingerprinted lazily on their next check.
+    op.add_column('snapshots', sa.Column('fingerprint', sa.String(64), nullable=True))
+    op.add_column('snapshots', sa.Column('fingerprint_key', sa.String(100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('snapshots', 'fingerprint_key')
+    op.drop_column('snapshots', 'fingerprint')
@@ -0,0 +1,26 @@
+"""change log diff format
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # How change_logs.diff is encoded: 'unified', 'json_pointer' or 'summary'.
+    # Existing rows keep NULL, which clients treat as 'unified'.
+    op.add_column('change_logs', sa.Column('diff_format', sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('change_logs', 'diff_format')
@@ -0,0 +1,29 @@
+"""watcher region selector
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Optional CSS/XPath selector limiting comparison to part of a page
+    op.add_column('watchers', sa.Column('selector', sa.Text(), nullable=True))
+    op.add_column('watchers', sa.Column('selector_type', sa.String(10), nullable=False, server_default='css'))
+    op.add_column('watchers', sa.Column('extract_text', sa.Boolean(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('watchers', 'extract_text')
+    op.drop_column('watchers', 'selector_type')
+    op.drop_column('watchers', 'selector')
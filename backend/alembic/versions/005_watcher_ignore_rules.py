@@ -0,0 +1,25 @@
+"""watcher ignore rules
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # {"regex": [...], "json_paths": [...]} stripped before fingerprinting
+    op.add_column('watchers', sa.Column('ignore_rules', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('watchers', 'ignore_rules')
@@ -0,0 +1,35 @@
+"""change similarity and severity
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SimHash of the current content, so the previous side is never rehashed
+    op.add_column('snapshots', sa.Column('simhash', sa.String(16), nullable=True))
+
+    # Similarity score and severity (minor, moderate, major) of each change
+    op.add_column('change_logs', sa.Column('similarity', sa.Float(), nullable=True))
+    op.add_column('change_logs', sa.Column('severity', sa.String(20), nullable=True))
+
+    # Changes at least this similar are recorded without a diff
+    op.add_column('watchers', sa.Column('similarity_threshold', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('watchers', 'similarity_threshold')
+    op.drop_column('change_logs', 'severity')
+    op.drop_column('change_logs', 'similarity')
+    op.drop_column('snapshots', 'simhash')
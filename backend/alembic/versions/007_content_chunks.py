@@ -0,0 +1,49 @@
+"""content chunks for binary content
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deduplicated content-defined chunks, reference counted by manifest entries
+    op.create_table(
+        'content_chunks',
+        sa.Column('hash', sa.String(64), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+
+    # Binary content is stored as a chunk manifest instead of an inline blob
+    op.add_column('snapshots', sa.Column('chunk_manifest', sa.JSON(), nullable=True))
+    op.alter_column('snapshots', 'content', existing_type=sa.LargeBinary(), nullable=True)
+
+    op.add_column('change_logs', sa.Column('old_chunks', sa.JSON(), nullable=True))
+    op.add_column('change_logs', sa.Column('new_chunks', sa.JSON(), nullable=True))
+    op.alter_column('change_logs', 'new_content', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade() -> None:
+    # Chunked rows have no inline content and must be materialized before downgrading
+    op.alter_column('change_logs', 'new_content', existing_type=sa.LargeBinary(), nullable=False)
+    op.drop_column('change_logs', 'new_chunks')
+    op.drop_column('change_logs', 'old_chunks')
+
+    op.alter_column('snapshots', 'content', existing_type=sa.LargeBinary(), nullable=False)
+    op.drop_column('snapshots', 'chunk_manifest')
+
+    op.drop_table('content_chunks')
@@ -0,0 +1,44 @@
+"""content-addressed blob store
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Content stored once, keyed by SHA256, reference counted
+    op.create_table(
+        'content_blobs',
+        sa.Column('hash', sa.String(64), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+
+    # How each row stores its content: 'blob', 'chunks', or NULL for inline
+    op.add_column('snapshots', sa.Column('storage', sa.String(20), nullable=True))
+    op.add_column('change_logs', sa.Column('storage', sa.String(20), nullable=True))
+    op.execute("UPDATE snapshots SET storage = 'chunks' WHERE chunk_manifest IS NOT NULL")
+    op.execute("UPDATE change_logs SET storage = 'chunks' WHERE new_chunks IS NOT NULL")
+
+    # Existing inline content is moved by migrate_content_to_blobs.py, in batches
+
+
+def downgrade() -> None:
+    # Blob-stored rows have no inline content and must be materialized before downgrading
+    op.drop_column('change_logs', 'storage')
+    op.drop_column('snapshots', 'storage')
+    op.drop_table('content_blobs')
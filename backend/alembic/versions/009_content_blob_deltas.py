@@ -0,0 +1,30 @@
+"""reverse-delta content blobs
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Older versions are stored as deltas against their successor, with a full keyframe every N
+    op.add_column('content_blobs', sa.Column('kind', sa.String(10), nullable=False, server_default='full'))
+    op.add_column('content_blobs', sa.Column('base_hash', sa.String(64), nullable=True))
+    op.add_column('content_blobs', sa.Column('chain_length', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    # Delta blobs must be materialized before downgrading
+    op.drop_column('content_blobs', 'chain_length')
+    op.drop_column('content_blobs', 'base_hash')
+    op.drop_column('content_blobs', 'kind')
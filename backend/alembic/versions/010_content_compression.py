@@ -0,0 +1,47 @@
+"""content compression and per-watcher dictionaries
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # zstd dictionaries trained on a watcher's recent content
+    op.create_table(
+        'compression_dictionaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('watcher_id', sa.Integer(), nullable=True),
+        sa.Column('codec', sa.String(20), nullable=False, server_default='zstd'),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['watcher_id'], ['watchers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_compression_dictionaries_id'), 'compression_dictionaries', ['id'], unique=False)
+    op.create_index(op.f('ix_compression_dictionaries_watcher_id'), 'compression_dictionaries', ['watcher_id'], unique=False)
+
+    # Codec tag per blob; existing blobs are uncompressed (NULL)
+    op.add_column('content_blobs', sa.Column('codec', sa.String(20), nullable=True))
+    op.add_column('content_blobs', sa.Column('dictionary_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    # Compressed blobs must be decompressed before downgrading
+    op.drop_column('content_blobs', 'dictionary_id')
+    op.drop_column('content_blobs', 'codec')
+    op.drop_index(op.f('ix_compression_dictionaries_watcher_id'), table_name='compression_dictionaries')
+    op.drop_index(op.f('ix_compression_dictionaries_id'), table_name='compression_dictionaries')
+    op.drop_table('compression_dictionaries')
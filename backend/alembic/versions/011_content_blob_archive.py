@@ -0,0 +1,28 @@
+"""pack-file archive for content blobs
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Large blob bodies live in pack files under ARCHIVE_DIR; the row keeps the location
+    op.add_column('content_blobs', sa.Column('archive_path', sa.String(500), nullable=True))
+    op.alter_column('content_blobs', 'data', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade() -> None:
+    # Archived blobs must be read back into the database before downgrading
+    op.alter_column('content_blobs', 'data', existing_type=sa.LargeBinary(), nullable=False)
+    op.drop_column('content_blobs', 'archive_path')
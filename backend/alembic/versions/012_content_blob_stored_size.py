@@ -0,0 +1,30 @@
+"""stored size of content blobs
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bytes actually stored per blob, so the retention size budget is a cheap SUM
+    op.add_column('content_blobs', sa.Column('stored_size', sa.Integer(), nullable=True))
+    op.execute("UPDATE content_blobs SET stored_size = LENGTH(data) WHERE data IS NOT NULL")
+    op.execute(
+        "UPDATE content_blobs SET stored_size = CAST(SUBSTRING_INDEX(archive_path, ':', -1) AS UNSIGNED) "
+        "WHERE archive_path IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('content_blobs', 'stored_size')
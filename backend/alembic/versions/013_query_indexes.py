@@ -0,0 +1,43 @@
+"""composite indexes for per-watcher queries
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-watcher history, newest first, and per-watcher counts by type
+    op.create_index('ix_change_logs_watcher_id_detected_at', 'change_logs', ['watcher_id', 'detected_at'], unique=False)
+    op.create_index('ix_change_logs_watcher_id_change_type', 'change_logs', ['watcher_id', 'change_type'], unique=False)
+
+    # Latest snapshot of a watcher
+    op.create_index('ix_snapshots_watcher_id_created_at', 'snapshots', ['watcher_id', 'created_at'], unique=False)
+
+    # Cookies of a watcher, and expiry scans
+    op.create_index('ix_cookies_watcher_id', 'cookies', ['watcher_id'], unique=False)
+    op.create_index('ix_cookies_expires', 'cookies', ['expires'], unique=False)
+
+    # Execution history of a workflow, newest first
+    op.create_index(
+        'ix_workflow_executions_workflow_id_started_at', 'workflow_executions', ['workflow_id', 'started_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workflow_executions_workflow_id_started_at', table_name='workflow_executions')
+    op.drop_index('ix_cookies_expires', table_name='cookies')
+    op.drop_index('ix_cookies_watcher_id', table_name='cookies')
+    op.drop_index('ix_snapshots_watcher_id_created_at', table_name='snapshots')
+    op.drop_index('ix_change_logs_watcher_id_change_type', table_name='change_logs')
+    op.drop_index('ix_change_logs_watcher_id_detected_at', table_name='change_logs')
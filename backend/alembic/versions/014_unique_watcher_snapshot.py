@@ -0,0 +1,53 @@
+"""one snapshot per watcher, with the response ETag
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only the newest snapshot of a watcher is ever read; release the blob
+    # references of older duplicates (left at 0 they are swept by the
+    # retention job's compaction) and delete them. Duplicates only come from
+    # racing first checks; chunk references of binary ones are not released.
+    op.execute(
+        "UPDATE content_blobs b JOIN ("
+        "  SELECT s.content_hash, COUNT(*) AS n FROM snapshots s"
+        "  WHERE s.storage = 'blob' AND s.id NOT IN ("
+        "    SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM snapshots GROUP BY watcher_id) k"
+        "  ) GROUP BY s.content_hash"
+        ") d ON b.hash = d.content_hash "
+        "SET b.ref_count = b.ref_count - d.n"
+    )
+    op.execute(
+        "DELETE FROM snapshots WHERE id NOT IN ("
+        "  SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM snapshots GROUP BY watcher_id) k"
+        ")"
+    )
+
+    # The unique index replaces the (watcher_id, created_at) lookup index.
+    # Create it first: the composite index is the only one covering the
+    # watcher_id foreign key, and MySQL/MariaDB refuse to drop it before
+    # another index does (error 1553)
+    op.create_index(op.f('ix_snapshots_watcher_id'), 'snapshots', ['watcher_id'], unique=True)
+    op.drop_index('ix_snapshots_watcher_id_created_at', table_name='snapshots')
+
+    # ETag of the response the snapshot was last confirmed against
+    op.add_column('snapshots', sa.Column('etag', sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('snapshots', 'etag')
+    op.create_index('ix_snapshots_watcher_id_created_at', 'snapshots', ['watcher_id', 'created_at'], unique=False)
+    op.drop_index(op.f('ix_snapshots_watcher_id'), table_name='snapshots')
@@ -0,0 +1,38 @@
+"""full-text search over change log diffs
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Decoded diff text per change log, searched through a FULLTEXT index
+    # instead of LIKE over the diff blob; filled by index_change_logs.py for
+    # existing rows
+    op.create_table(
+        'change_log_search',
+        sa.Column('change_log_id', sa.Integer(), nullable=False),
+        sa.Column('watcher_id', sa.Integer(), nullable=False),
+        sa.Column('detected_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('content', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=False),
+        sa.ForeignKeyConstraint(['change_log_id'], ['change_logs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('change_log_id')
+    )
+    op.create_index('ft_change_log_search_content', 'change_log_search', ['content'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ft_change_log_search_content', table_name='change_log_search')
+    op.drop_table('change_log_search')
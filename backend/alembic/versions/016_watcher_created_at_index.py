@@ -0,0 +1,26 @@
+"""index for keyset pagination of watchers
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Watcher pages are keyed on (created_at, id); InnoDB appends the primary
+    # key to secondary indexes, so this covers both
+    op.create_index(op.f('ix_watchers_created_at'), 'watchers', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_watchers_created_at'), table_name='watchers')
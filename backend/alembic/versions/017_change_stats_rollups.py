@@ -0,0 +1,47 @@
+"""hourly and daily change statistics rollups
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('change_stats_hourly', 'change_stats_daily')
+
+
+def upgrade() -> None:
+    # Change log counts and sizes per watcher and hour/day, kept up to date on
+    # every insert and read by the statistics endpoint; filled by
+    # rebuild_change_stats.py for existing rows
+    for table in TABLES:
+        op.create_table(
+            table,
+            sa.Column('watcher_id', sa.Integer(), nullable=False),
+            sa.Column('bucket', sa.DateTime(), nullable=False),
+            sa.Column('total_count', sa.Integer(), nullable=False),
+            sa.Column('new_count', sa.Integer(), nullable=False),
+            sa.Column('modified_count', sa.Integer(), nullable=False),
+            sa.Column('error_count', sa.Integer(), nullable=False),
+            sa.Column('size_sum', sa.BigInteger(), nullable=False),
+            sa.Column('min_size', sa.Integer(), nullable=True),
+            sa.Column('max_size', sa.Integer(), nullable=True),
+            sa.Column('last_change', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['watcher_id'], ['watchers.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('watcher_id', 'bucket')
+        )
+        op.create_index(f'ix_{table}_bucket', table, ['bucket'])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_bucket', table_name=table)
+        op.drop_table(table)
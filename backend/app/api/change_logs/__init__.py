@@ -4,6 +4,7 @@ from .list import router as list_router
 from .get import router as get_router
 from .statistics import router as statistics_router
 from .compare import router as compare_router
+from .export import router as export_router
 
 router = APIRouter(prefix="/change-logs", tags=["change-logs"])
 
@@ -11,4 +12,5 @@ router = APIRouter(prefix="/change-logs", tags=["change-logs"])
 router.include_router(list_router)
 router.include_router(statistics_router)  # Move before get_router
 router.include_router(compare_router)
+router.include_router(export_router)
 router.include_router(get_router)  # Move after specific routes
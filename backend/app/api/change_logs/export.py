@@ -0,0 +1,107 @@
+"""Export change logs endpoint (streamed NDJSON or CSV)"""
+import csv
+import io
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, AsyncSessionLocal
+from app.services.change_log_service import ChangeLogService, EXPORT_FIELDS, EXPORT_DIFF_FIELDS
+
+router = APIRouter()
+
+# Bytes buffered before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _format_value(value):
+    """JSON/CSV representation of a column value"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+@router.get("/export")
+async def export_change_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format"),
+    watcher_id: Optional[int] = Query(None),
+    change_type: Optional[str] = Query(None, pattern="^(new|modified|error|unchanged)$"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    min_size: Optional[int] = Query(None, ge=0, description="Minimum change size in bytes"),
+    max_size: Optional[int] = Query(None, ge=0, description="Maximum change size in bytes"),
+    search: Optional[str] = Query(None, description="Search in diff content"),
+    order_by: str = Query("detected_at", pattern="^(detected_at|new_size|change_type)$"),
+    order_direction: str = Query("desc", pattern="^(asc|desc)$"),
+    include_diff: bool = Query(False, description="Include the decoded diff of each change"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export all matching change logs in one streamed response
+
+    Takes the filters of the change log list. Rows are read through a
+    server-side cursor and written as they arrive, so memory use stays flat
+    however much history is exported.
+
+    Args:
+        format: ndjson (one JSON object per line) or csv (with a header row)
+        watcher_id: Filter by watcher ID
+        change_type: Filter by change type (new, modified, error)
+        date_from: Filter from date (YYYY-MM-DD)
+        date_to: Filter to date (YYYY-MM-DD)
+        min_size: Minimum change size in bytes
+        max_size: Maximum change size in bytes
+        search: Search in diff content
+        order_by: Field to order by
+        order_direction: Order direction (asc/desc)
+        include_diff: Add diff_format and diff columns
+        db: Database session (used to validate the filters)
+
+    Returns:
+        Streaming response with the change logs
+    """
+    try:
+        filters = ChangeLogService.build_filters(
+            db, watcher_id, change_type, date_from, date_to, min_size, max_size, search
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    fields = EXPORT_FIELDS + (EXPORT_DIFF_FIELDS if include_diff else ())
+
+    async def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if format == 'csv' else None
+        if writer:
+            writer.writerow(fields)
+
+        # The request's session is closed once the response starts, so the
+        # stream has its own
+        async with AsyncSessionLocal() as stream_db:
+            async for record in ChangeLogService.stream_export(
+                stream_db, filters, order_by, order_direction, include_diff
+            ):
+                if writer:
+                    writer.writerow([_format_value(record[field]) for field in fields])
+                else:
+                    buffer.write(json.dumps({field: _format_value(record[field]) for field in fields}))
+                    buffer.write('\n')
+                if buffer.tell() >= CHUNK_SIZE:
+                    yield buffer.getvalue().encode('utf-8')
+                    buffer.seek(0)
+                    buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="change-logs.{format}"'}
+    )
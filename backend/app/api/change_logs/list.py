@@ -1,17 +1,21 @@
 """List change logs endpoint with advanced filtering"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.change_log import ChangeLogListResponse
 from app.services.change_log_service import ChangeLogService
 from app.dependencies import verify_pagination
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.response_cache import response_cache, CHANGE_LOGS
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ChangeLogListResponse])
 async def list_change_logs(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     watcher_id: Optional[int] = Query(None),
@@ -23,6 +27,7 @@ async def list_change_logs(
     search: Optional[str] = Query(None, description="Search in diff content"),
     order_by: str = Query("detected_at", pattern="^(detected_at|new_size|change_type)$"),
     order_direction: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (skip is ignored)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -40,26 +45,37 @@ async def list_change_logs(
         search: Search in diff content
         order_by: Field to order by
         order_direction: Order direction (asc/desc)
+        cursor: Keyset cursor of the next page
         db: Database session
     
     Returns:
-        List of change logs (without binary content)
+        List of change logs (without binary content); when the page is full,
+        the X-Next-Cursor header holds the cursor of the next one. 304 if
+        If-None-Match holds the current ETag
     """
     verify_pagination(skip, limit)
+    params = {
+        'skip': skip, 'limit': limit, 'watcher_id': watcher_id, 'change_type': change_type,
+        'date_from': date_from, 'date_to': date_to, 'min_size': min_size, 'max_size': max_size,
+        'search': search, 'order_by': order_by, 'order_direction': order_direction, 'cursor': cursor
+    }
+
+    async def compute():
+        change_logs = await ChangeLogService.get_change_logs_with_filters(db, **params)
+        return {
+            'items': [ChangeLogListResponse.model_validate(log).model_dump(mode='json') for log in change_logs],
+            'next': next_cursor(change_logs, order_by, limit)
+        }
+
+    try:
+        page = await response_cache.respond(
+            request, response, 'change_logs:list', [CHANGE_LOGS], params, compute
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    change_logs = await ChangeLogService.get_change_logs_with_filters(
-        db,
-        skip=skip,
-        limit=limit,
-        watcher_id=watcher_id,
-        change_type=change_type,
-        date_from=date_from,
-        date_to=date_to,
-        min_size=min_size,
-        max_size=max_size,
-        search=search,
-        order_by=order_by,
-        order_direction=order_direction
-    )
-    
-    return change_logs
+    if isinstance(page, Response):
+        return page
+    if page['next']:
+        response.headers[NEXT_CURSOR_HEADER] = page['next']
+    return page['items']
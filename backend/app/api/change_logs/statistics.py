@@ -1,9 +1,10 @@
 """Change logs statistics endpoint"""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.change_log import ChangeLogStatistics
 from app.services.change_log_service import ChangeLogService
+from app.core.response_cache import response_cache, CHANGE_LOGS
 from typing import Optional
 
 router = APIRouter()
@@ -11,10 +12,12 @@ router = APIRouter()
 
 @router.get("/statistics", response_model=ChangeLogStatistics)
 async def get_change_log_statistics(
+    request: Request,
+    response: Response,
     watcher_id: Optional[int] = Query(None),
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    group_by: str = Query("day", pattern="^(day|week|month)$", description="Group frequency data by"),
+    group_by: str = Query("day", pattern="^(hour|day|week|month)$", description="Group frequency data by"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -24,18 +27,28 @@ async def get_change_log_statistics(
         watcher_id: Filter by watcher ID
         date_from: Filter from date (YYYY-MM-DD)
         date_to: Filter to date (YYYY-MM-DD)
-        group_by: Group frequency data by day/week/month
+        group_by: Group frequency data by hour/day/week/month
         db: Database session
     
     Returns:
-        Comprehensive statistics including totals, frequency data, and top watchers
+        Comprehensive statistics including totals, frequency data, and top
+        watchers; 304 if If-None-Match holds the current ETag
     """
-    statistics = await ChangeLogService.get_statistics(
-        db,
-        watcher_id=watcher_id,
-        date_from=date_from,
-        date_to=date_to,
-        group_by=group_by
+    async def compute():
+        statistics = await ChangeLogService.get_statistics(
+            db,
+            watcher_id=watcher_id,
+            date_from=date_from,
+            date_to=date_to,
+            group_by=group_by
+        )
+        return statistics.model_dump(mode='json')
+
+    return await response_cache.respond(
+        request,
+        response,
+        'change_logs:statistics',
+        [CHANGE_LOGS],
+        {'watcher_id': watcher_id, 'date_from': date_from, 'date_to': date_to, 'group_by': group_by},
+        compute
     )
-    
-    return statistics
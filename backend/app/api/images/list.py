@@ -1,20 +1,23 @@
 """List images endpoint"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.image import ImageResponse
 from app.services.image_service import ImageService
 from app.dependencies import verify_pagination
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ImageResponse])
 async def list_images(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     monitor_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (skip is ignored)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -24,16 +27,25 @@ async def list_images(
         skip: Number of records to skip
         limit: Maximum number of records to return
         monitor_id: Filter by monitor ID
+        cursor: Keyset cursor of the next page
         db: Database session
     
     Returns:
-        List of images
+        List of images; when the page is full, the X-Next-Cursor header
+        holds the cursor of the next one
     """
     verify_pagination(skip, limit)
-    images = await ImageService.get_images(
-        db,
-        skip=skip,
-        limit=limit,
-        monitor_id=monitor_id
-    )
+    try:
+        images = await ImageService.get_images(
+            db,
+            skip=skip,
+            limit=limit,
+            monitor_id=monitor_id,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_page = next_cursor(images, 'downloaded_at', limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return images
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Bulk watcher import and export endpoints"""
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, AsyncSessionLocal
+from app.schemas.watcher import WatcherImportResult
+from app.services.watcher_service import WatcherService
+
+router = APIRouter()
+
+
+@router.post("/import", response_model=WatcherImportResult)
+async def import_watchers(
+    request: Request,
+    skip_existing: bool = Query(False, description="Skip watchers whose URL and method are already watched"),
+    skip_invalid: bool = Query(False, description="Import the valid records even if some are invalid"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create watchers in bulk
+
+    The request body is a JSON array of watchers or NDJSON (one watcher per
+    line), with the fields of POST /watchers. Every record is validated
+    first; by default nothing is imported if any record is invalid.
+
+    Args:
+        request: Request with the JSON/NDJSON body
+        skip_existing: Skip watchers whose URL and method are already watched
+        skip_invalid: Import the valid records even if some are invalid
+        db: Database session
+
+    Returns:
+        Numbers of created and skipped watchers, and the invalid records
+    """
+    try:
+        data = (await request.body()).decode('utf-8')
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 JSON or NDJSON")
+
+    watchers, errors = WatcherService.parse_import(data)
+    if errors and not skip_invalid:
+        raise HTTPException(status_code=422, detail=[error.model_dump() for error in errors])
+
+    created, skipped = await WatcherService.bulk_create(db, watchers, skip_existing=skip_existing)
+    return WatcherImportResult(created=created, skipped=skipped, errors=errors)
+
+
+@router.get("/export")
+async def export_watchers(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="Output format")
+):
+    """
+    Export the configuration of every watcher in the import format
+
+    Args:
+        format: ndjson (one watcher per line) or json (an array)
+
+    Returns:
+        Streaming response with the watchers
+    """
+    async def generate():
+        async with AsyncSessionLocal() as db:
+            first = True
+            if format == 'json':
+                yield b'['
+            async for watcher in WatcherService.export_watchers(db):
+                line = json.dumps(watcher)
+                if format == 'json':
+                    yield (line if first else ',\n' + line).encode('utf-8')
+                else:
+                    yield (line + '\n').encode('utf-8')
+                first = False
+            if format == 'json':
+                yield b']\n'
+
+    media_type = 'application/x-ndjson' if format == 'ndjson' else 'application/json'
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="watchers.{format}"'}
+    )
@@ -1,29 +1,47 @@
 """Watcher list and create endpoints"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.watcher import WatcherCreate, WatcherResponse, WatcherListResponse, WatcherStatistics
 from app.services.watcher_service import WatcherService
 from app.services.change_log_service import ChangeLogService
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.response_cache import response_cache, WATCHERS
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WatcherListResponse])
 async def get_watchers(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = Query(None),
     execution_mode: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (skip is ignored)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get list of watchers with optional filters"""
+    """Get list of watchers with optional filters (X-Next-Cursor holds the next page's cursor, 304 on a matching ETag)"""
+    params = {'skip': skip, 'limit': limit, 'is_active': is_active, 'execution_mode': execution_mode, 'cursor': cursor}
+
+    async def compute():
+        watchers = await WatcherService.get_watchers(db, **params)
+        return {
+            'items': [WatcherListResponse.model_validate(watcher).model_dump(mode='json') for watcher in watchers],
+            'next': next_cursor(watchers, 'created_at', limit)
+        }
+
     try:
-        watchers = await WatcherService.get_watchers(
-            db, skip=skip, limit=limit, is_active=is_active, execution_mode=execution_mode
-        )
-        return watchers
+        page = await response_cache.respond(request, response, 'watchers:list', [WATCHERS], params, compute)
+        if isinstance(page, Response):
+            return page
+        if page['next']:
+            response.headers[NEXT_CURSOR_HEADER] = page['next']
+        return page['items']
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -44,10 +62,13 @@ async def create_watcher(
 
 
 @router.get("/statistics", response_model=WatcherStatistics)
-async def get_watcher_statistics(db: AsyncSession = Depends(get_db)):
-    """Get watcher statistics"""
+async def get_watcher_statistics(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    """Get watcher statistics (304 on a matching ETag)"""
     try:
-        stats = await WatcherService.get_statistics(db)
-        return stats
+        async def compute():
+            stats = await WatcherService.get_statistics(db)
+            return stats.model_dump(mode='json')
+
+        return await response_cache.respond(request, response, 'watchers:statistics', [WATCHERS], {}, compute)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,11 +1,12 @@
 """Get workflow executions endpoint"""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models.workflow_execution import WorkflowExecution
 from app.schemas.workflow import WorkflowExecutionResponse
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor, paginate
 
 router = APIRouter()
 
@@ -13,8 +14,10 @@ router = APIRouter()
 @router.get("/{workflow_id}/executions", response_model=List[WorkflowExecutionResponse])
 async def get_workflow_executions(
     workflow_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (skip is ignored)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -24,18 +27,24 @@ async def get_workflow_executions(
         workflow_id: Workflow ID
         skip: Number of records to skip
         limit: Maximum number of records
+        cursor: Keyset cursor of the next page
         db: Database session
 
     Returns:
-        List of workflow executions
+        List of workflow executions; when the page is full, the
+        X-Next-Cursor header holds the cursor of the next one
     """
-    query = (
-        select(WorkflowExecution)
-        .where(WorkflowExecution.workflow_id == workflow_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(WorkflowExecution.started_at.desc())
-    )
+    query = select(WorkflowExecution).where(WorkflowExecution.workflow_id == workflow_id)
+    try:
+        query = paginate(
+            query, WorkflowExecution.started_at, WorkflowExecution.id, 'started_at', True, cursor, skip, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     result = await db.execute(query)
-    return list(result.scalars().all())
+    executions = list(result.scalars().all())
+    next_page = next_cursor(executions, 'started_at', limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return executions
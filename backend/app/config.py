@@ -31,10 +31,41 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = 5
     REQUEST_TIMEOUT: int = 30
 
+    # Change detection
+    FINGERPRINT_ALGORITHM: str = "blake2b"  # sha256, blake2b, xxh3 (requires xxhash)
+    DIFF_MAX_INPUT_BYTES: int = 8 * 1024 * 1024  # old + new; larger changes get a summary only
+    DIFF_TIME_BUDGET_SECONDS: float = 2.0
+    CPU_POOL_WORKERS: int = 0  # 0 = one worker per CPU core
+    CPU_OFFLOAD_MIN_BYTES: int = 256 * 1024  # smaller payloads are processed inline
+    SNAPSHOT_CACHE_SIZE: int = 50000  # watchers whose snapshot state is cached in memory; 0 = off
+    SEARCH_INDEX_MAX_BYTES: int = 1024 * 1024  # diff text indexed for search per change
+
     # Storage
     ARCHIVE_DIR: str = "archives"
     IMAGE_DIR: str = "images"
     MAX_ARCHIVE_SIZE_MB: int = 1000
+    ARCHIVE_MIN_BYTES: int = 64 * 1024  # stored blobs this large go to pack files in ARCHIVE_DIR; 0 = keep in DB
+    ARCHIVE_PACK_SIZE_MB: int = 256  # start a new pack file past this size
+    DELTA_KEYFRAME_INTERVAL: int = 10  # older versions stored as reverse deltas, full copy every N; 0 = off
+    DELTA_MAX_RATIO: float = 0.5  # keep a delta only if at most this share of the full size
+    CONTENT_CODEC: str = "zstd"  # zstd (requires zstandard, else zlib), zlib, none
+    CONTENT_DICT_SAMPLES: int = 20  # recent versions used to train a per-watcher zstd dictionary
+    CONTENT_DICT_SIZE: int = 64 * 1024
+
+    # Retention (daily job; MAX_ARCHIVE_SIZE_MB is the global content store budget, 0 = unlimited)
+    RETENTION_MAX_AGE_DAYS: int = 0  # delete changes older than this; 0 = keep forever
+    RETENTION_MAX_VERSIONS: int = 0  # changes kept per watcher; 0 = unlimited
+    RETENTION_KEEP_DAILY: bool = True  # spare the first and last change of each day from the version and size rules
+    RETENTION_BATCH_SIZE: int = 500
+    RETENTION_BATCH_PAUSE_SECONDS: float = 0.5  # pause between delete batches
+    RETENTION_PACK_COMPACT_RATIO: float = 0.5  # rewrite packs with at least this share of dead bytes
+    RETENTION_PACK_GRACE_SECONDS: int = 600  # leave packs appended to more recently alone (their records may not be committed yet)
+
+    # Response cache for statistics and list endpoints
+    RESPONSE_CACHE_BACKEND: str = "local"  # local (per process) or redis (shared, requires redis)
+    RESPONSE_CACHE_REDIS_URL: str = "redis://redis:6379/0"
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0  # 0 = off
+    RESPONSE_CACHE_SIZE: int = 1024  # entries kept by the local backend
 
     # Web Push Notifications
     VAPID_PRIVATE_KEY: str = ""
@@ -0,0 +1,141 @@
+"""CPU worker pool for change detection
+
+Normalization, hashing and diffing are CPU-bound. Large payloads are sent to
+a ProcessPoolExecutor so they run on other cores and never block the event
+loop; small payloads are cheaper to process inline. Payload bytes are handed
+to workers through shared memory, so one copy can serve several tasks
+(fingerprint, then diff) without pickling the body each time.
+"""
+import asyncio
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+from loguru import logger
+from app.config import settings
+
+
+class SharedPayload:
+    """Content handed to the CPU pool, backed by shared memory when large"""
+
+    def __init__(self, content: bytes, use_shared_memory: bool):
+        self.content = content
+        self.size = len(content)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        if use_shared_memory and self.size:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.size)
+            self._shm.buf[:self.size] = content
+
+    @property
+    def handle(self) -> tuple:
+        """Picklable reference to the payload for worker processes"""
+        if self._shm is not None:
+            return ('shm', self._shm.name, self.size)
+        return ('bytes', self.content)
+
+    def release(self):
+        """Free the shared memory segment"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _resolve(arg: Any) -> Any:
+    """Turn a payload handle back into bytes inside a worker"""
+    if isinstance(arg, tuple) and len(arg) == 3 and arg[0] == 'shm':
+        shm = shared_memory.SharedMemory(name=arg[1])
+        try:
+            return bytes(shm.buf[:arg[2]])
+        finally:
+            shm.close()
+    if isinstance(arg, tuple) and len(arg) == 2 and arg[0] == 'bytes':
+        return arg[1]
+    return arg
+
+
+def _call(func: Callable, args: tuple) -> Any:
+    """Worker entry point"""
+    return func(*[_resolve(arg) for arg in args])
+
+
+class CpuPool:
+    """Process pool for CPU-heavy change detection work"""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def max_workers(self) -> int:
+        return settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+
+    def start(self):
+        """Start the worker processes"""
+        if self._executor is not None:
+            return
+        # spawn: forking a process with a running event loop and DB pool is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"CPU pool started with {self.max_workers} worker(s)")
+
+    def stop(self):
+        """Stop the worker processes"""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        logger.info("CPU pool stopped")
+
+    def is_large(self, size: int) -> bool:
+        """Whether a payload of this size is worth offloading"""
+        return self._executor is not None and size >= settings.CPU_OFFLOAD_MIN_BYTES
+
+    def share(self, content: bytes) -> SharedPayload:
+        """
+        Wrap content for use with run()
+
+        Large payloads are copied into shared memory once; call release()
+        (or use it as a context manager) when done.
+        """
+        return SharedPayload(content, use_shared_memory=self.is_large(len(content)))
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run func(*args), in a worker process if any payload is large
+
+        Args:
+            func: Module-level (picklable) function
+            *args: Arguments; SharedPayload arguments are passed as bytes
+
+        Returns:
+            Function result
+        """
+        payloads = [arg for arg in args if isinstance(arg, SharedPayload)]
+        offload = any(self.is_large(payload.size) for payload in payloads)
+
+        if offload:
+            handles = tuple(arg.handle if isinstance(arg, SharedPayload) else arg for arg in args)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._executor, _call, func, handles)
+            except BrokenProcessPool:
+                logger.error("CPU pool broken, restarting and running inline")
+                self._executor = None
+                self.start()
+
+        inline_args = [arg.content if isinstance(arg, SharedPayload) else arg for arg in args]
+        return func(*inline_args)
+
+
+# Global CPU pool instance
+cpu_pool = CpuPool()
@@ -0,0 +1,175 @@
+"""Pack-file archive for large stored content
+
+Large blob bodies are appended to append-only pack files under ARCHIVE_DIR
+instead of living in database BLOB columns. Each pack has an .idx sidecar
+with one "key offset length" line per record, so packs can be re-indexed
+without the database. Reads go through memory-mapped files.
+
+A location is "<pack name>:<offset>:<length>", stored in the database.
+"""
+import asyncio
+import fcntl
+import mmap
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+from loguru import logger
+from app.config import settings
+
+PACK_PREFIX = 'pack-'
+PACK_SUFFIX = '.pack'
+INDEX_SUFFIX = '.idx'
+
+_PACK_NAME = re.compile(r'^pack-(\d{6})\.pack$')
+
+
+def parse_location(location: str) -> Tuple[str, int, int]:
+    """
+    Split a location into (pack name, offset, length)
+
+    Raises:
+        ValueError: If the location is malformed
+    """
+    try:
+        name, offset, length = location.rsplit(':', 2)
+        offset, length = int(offset), int(length)
+    except ValueError as e:
+        raise ValueError(f"Invalid archive location '{location}'") from e
+    if not _PACK_NAME.match(name):
+        raise ValueError(f"Invalid archive location '{location}'")
+    return name, offset, length
+
+
+class PackArchive:
+    """Append-only pack files with memory-mapped reads"""
+
+    def __init__(self, directory: Optional[str] = None, max_pack_bytes: Optional[int] = None):
+        self._directory = directory
+        self._max_pack_bytes = max_pack_bytes
+        self._lock = threading.Lock()
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(self._directory or settings.ARCHIVE_DIR, 'packs')
+
+    @property
+    def max_pack_bytes(self) -> int:
+        return self._max_pack_bytes or settings.ARCHIVE_PACK_SIZE_MB * 1024 * 1024
+
+    def pack_names(self) -> list:
+        """Existing pack file names, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if _PACK_NAME.match(name))
+
+    def _current_pack(self, size: int) -> str:
+        """Pack to append `size` bytes to, starting a new one when full"""
+        names = self.pack_names()
+        if names:
+            name = names[-1]
+            if os.path.getsize(os.path.join(self.directory, name)) + size <= self.max_pack_bytes:
+                return name
+            number = int(_PACK_NAME.match(name).group(1)) + 1
+        else:
+            number = 1
+        return f"{PACK_PREFIX}{number:06d}{PACK_SUFFIX}"
+
+    def _append(self, data: bytes, key: str) -> str:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            name = self._current_pack(len(data))
+            path = os.path.join(self.directory, name)
+            with open(path, 'ab') as pack:
+                # Serialize appends across processes too
+                fcntl.flock(pack, fcntl.LOCK_EX)
+                try:
+                    offset = pack.seek(0, os.SEEK_END)
+                    pack.write(data)
+                    pack.flush()
+                    os.fsync(pack.fileno())
+                    with open(path[:-len(PACK_SUFFIX)] + INDEX_SUFFIX, 'a') as index:
+                        index.write(f"{key} {offset} {len(data)}\n")
+                finally:
+                    fcntl.flock(pack, fcntl.LOCK_UN)
+        return f"{name}:{offset}:{len(data)}"
+
+    async def append(self, data: bytes, key: str) -> str:
+        """
+        Append a record to the current pack
+
+        Args:
+            data: Bytes to store
+            key: Record key written to the index sidecar (the blob hash)
+
+        Returns:
+            Location of the record
+        """
+        return await asyncio.to_thread(self._append, data, key)
+
+    def _map(self, name: str, end: int) -> mmap.mmap:
+        """Memory map of a pack covering at least `end` bytes"""
+        mapped = self._maps.get(name)
+        if mapped is None or len(mapped) < end:
+            # Packs only grow; remap to see records appended since
+            if mapped is not None:
+                mapped.close()
+            with open(os.path.join(self.directory, name), 'rb') as pack:
+                mapped = mmap.mmap(pack.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[name] = mapped
+        return mapped
+
+    def read(self, location: str) -> bytes:
+        """
+        Read a record
+
+        Raises:
+            ValueError: If the location is malformed or past the end of the pack
+        """
+        name, offset, length = parse_location(location)
+        with self._lock:
+            try:
+                mapped = self._map(name, offset + length)
+            except FileNotFoundError as e:
+                raise ValueError(f"Missing pack file {name}") from e
+            if offset + length > len(mapped):
+                raise ValueError(f"Archive location '{location}' is past the end of {name}")
+            return mapped[offset:offset + length]
+
+    def pack_size(self, name: str) -> int:
+        """Size of a pack file in bytes"""
+        return os.path.getsize(os.path.join(self.directory, name))
+
+    def last_write(self, name: str) -> float:
+        """Time of the last append to a pack (mtime of the pack or its index)"""
+        base = os.path.join(self.directory, name)[:-len(PACK_SUFFIX)]
+        return max(
+            os.path.getmtime(path)
+            for path in (base + PACK_SUFFIX, base + INDEX_SUFFIX)
+            if os.path.exists(path)
+        )
+
+    def remove(self, name: str):
+        """Delete a pack and its index (after compaction moved its live records)"""
+        with self._lock:
+            mapped = self._maps.pop(name, None)
+            if mapped is not None:
+                mapped.close()
+            base = os.path.join(self.directory, name)[:-len(PACK_SUFFIX)]
+            for path in (base + PACK_SUFFIX, base + INDEX_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+        logger.info(f"Removed pack {name}")
+
+    def close(self):
+        """Unmap all packs"""
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            logger.debug("Pack archive maps closed")
+
+
+# Global pack archive instance
+pack_archive = PackArchive()
@@ -0,0 +1,271 @@
+"""Response cache for read-heavy API endpoints
+
+The dashboard polls statistics and lists that rarely change between polls.
+Responses are cached as JSON under a key that includes the generation of
+every namespace they read (e.g. 'change_logs', 'watchers'). Writers bump the
+generation of what they changed, which makes the old entries unreachable;
+they then age out by TTL or LRU eviction. Entries are never served past
+RESPONSE_CACHE_TTL_SECONDS, so a missed bump costs at most one TTL of
+staleness.
+
+The same generations give the endpoints cheap ETags: a client polling with
+If-None-Match gets a 304 without any query while nothing was written. ETags
+also change every TTL window, so they are never trusted for longer than a
+cached entry would be.
+
+The backend is pluggable: 'local' keeps entries in this process, 'redis'
+shares entries and generations between replicas (requires the redis package).
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from fastapi import Request, Response
+from loguru import logger
+from app.config import settings
+
+# Generation namespaces
+CHANGE_LOGS = 'change_logs'
+WATCHERS = 'watchers'
+
+_GENERATION_PREFIX = 'gen:'
+_ENTRY_PREFIX = 'resp:'
+
+
+class LocalCacheBackend:
+    """In-process backend: TTL entries in a size-bounded LRU, plus generation counters"""
+
+    def __init__(self, max_entries: int):
+        # Counters restart at 0 with the process; the epoch keeps ETags
+        # issued before a restart from matching
+        self.epoch = uuid.uuid4().hex
+        self._max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_generations(self, names: List[str]) -> List[int]:
+        # Generations are kept apart from the LRU: an evicted counter would
+        # restart at 0 and make old entries reachable again
+        with self._lock:
+            return [self._generations.get(name, 0) for name in names]
+
+    async def bump(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Shared backend on Redis (entries expire through Redis TTLs, LRU by maxmemory-policy)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.epoch = ''  # counters are shared and outlive the process
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(_ENTRY_PREFIX + key)
+        return value.decode('utf-8') if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._redis.set(_ENTRY_PREFIX + key, value, px=max(int(ttl * 1000), 1))
+
+    async def get_generations(self, names: List[str]) -> List[int]:
+        values = await self._redis.mget([_GENERATION_PREFIX + name for name in names])
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def bump(self, names: Iterable[str]) -> None:
+        pipeline = self._redis.pipeline(transaction=False)
+        for name in names:
+            pipeline.incr(_GENERATION_PREFIX + name)
+        await pipeline.execute()
+
+    async def clear(self) -> None:
+        # Entries of other replicas are left to expire; bumping every
+        # namespace would be the shared equivalent
+        pass
+
+
+def _create_backend():
+    """Backend for RESPONSE_CACHE_BACKEND, falling back to 'local'"""
+    backend = (settings.RESPONSE_CACHE_BACKEND or 'local').lower()
+    if backend == 'redis':
+        try:
+            return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_BACKEND=redis but redis is not installed, using the local cache")
+    elif backend != 'local':
+        logger.warning(f"Unknown RESPONSE_CACHE_BACKEND '{backend}', using the local cache")
+    return LocalCacheBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+class ResponseCache:
+    """Generation-keyed response cache over a backend"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _create_backend()
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_TTL_SECONDS > 0 and settings.RESPONSE_CACHE_SIZE > 0
+
+    async def get_or_set(
+        self,
+        name: str,
+        namespaces: List[str],
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Cached result of compute(), or compute it and cache it
+
+        Args:
+            name: Endpoint name
+            namespaces: Generation namespaces the result is read from
+            params: Request parameters the result depends on
+            compute: Coroutine function returning a JSON-serializable result
+            ttl: Seconds to keep the result (default RESPONSE_CACHE_TTL_SECONDS)
+
+        Returns:
+            The (possibly cached) result, as decoded JSON
+        """
+        if not self.enabled:
+            return await compute()
+
+        try:
+            generations = await self.backend.get_generations(namespaces)
+            key = f"{name}:{':'.join(map(str, generations))}:{json.dumps(params, sort_keys=True, default=str)}"
+            cached = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return await compute()
+        if cached is not None:
+            return json.loads(cached)
+
+        result = await compute()
+        try:
+            await self.backend.set(key, json.dumps(result), ttl if ttl is not None else settings.RESPONSE_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+        return result
+
+    async def etag(self, name: str, namespaces: List[str], params: Dict[str, Any]) -> Optional[str]:
+        """
+        Weak ETag of a response, from the generations it is read from
+
+        Args:
+            name: Endpoint name
+            namespaces: Generation namespaces the response is read from
+            params: Request parameters the response depends on
+
+        Returns:
+            ETag header value, or None if the cache is off or unavailable
+        """
+        if not self.enabled:
+            return None
+        try:
+            generations = await self.backend.get_generations(namespaces)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        window = int(time.time() // settings.RESPONSE_CACHE_TTL_SECONDS)
+        key = f"{self.backend.epoch}:{window}:{name}:{generations}:{json.dumps(params, sort_keys=True, default=str)}"
+        return f'W/"{hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()}"'
+
+    async def respond(
+        self,
+        request: Request,
+        response: Response,
+        name: str,
+        namespaces: List[str],
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        get_or_set() for an endpoint, answering If-None-Match with 304
+
+        A matching If-None-Match is answered before compute() runs, so an
+        idle poll costs no query.
+
+        Args:
+            request: Incoming request
+            response: Endpoint response, receives the ETag
+            name: Endpoint name
+            namespaces: Generation namespaces the result is read from
+            params: Request parameters the result depends on
+            compute: Coroutine function returning a JSON-serializable result
+
+        Returns:
+            The result, or a 304 response
+        """
+        etag = await self.etag(name, namespaces, params)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'} if etag else {}
+        if etag and _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+
+        result = await self.get_or_set(name, namespaces, params, compute)
+        response.headers.update(headers)
+        return result
+
+    async def bump(self, *namespaces: str) -> None:
+        """Invalidate everything read from these namespaces (call after the write commits)"""
+        try:
+            await self.backend.bump(namespaces)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable, entries expire by TTL: {e}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith('W/') else candidate) == opaque:
+            return True
+    return False
+
+
+# Global response cache instance
+response_cache = ResponseCache()
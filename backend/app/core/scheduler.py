@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import AsyncSessionLocal
 from app.services.cookie_service import CookieService
 from app.services.notification_service import NotificationService
+from app.services.retention_service import RetentionService
 from app.services.watcher_executor import WatcherExecutor
 from app.config import settings
 
@@ -32,6 +33,7 @@ class SchedulerService:
         self._add_cookie_cleanup_task()
         self._add_cookie_notification_task()
         self._add_watcher_execution_task()
+        self._add_retention_task()
 
         self.scheduler.start()
         self._started = True
@@ -91,6 +93,17 @@ class SchedulerService:
         )
         logger.info("Added task: Execute watchers (every 1 minute)")
 
+    def _add_retention_task(self):
+        """Add task to apply retention rules and compact storage (daily at 4 AM UTC)"""
+        self.scheduler.add_job(
+            self._run_retention,
+            trigger=CronTrigger(hour=4, minute=0),
+            id="run_retention",
+            name="Run retention",
+            replace_existing=True
+        )
+        logger.info("Added task: Run retention (daily at 4 AM UTC)")
+
     async def _execute_watchers(self):
         """Execute all active watchers"""
         try:
@@ -141,6 +154,25 @@ class SchedulerService:
         except Exception as e:
             logger.error(f"Error cleaning up expired cookies: {e}")
 
+    async def _run_retention(self):
+        """Delete expired change logs and compact content storage"""
+        logger.info("Running: Retention")
+
+        try:
+            async with AsyncSessionLocal() as db:
+                report = await RetentionService.run(db)
+
+                deleted = report['deleted_by_age'] + report['deleted_by_versions'] + report['deleted_by_size']
+                logger.info(
+                    f"Retention deleted {deleted} change log(s) "
+                    f"(age {report['deleted_by_age']}, versions {report['deleted_by_versions']}, "
+                    f"size {report['deleted_by_size']}), freed {report['freed_bytes'] / 1024 / 1024:.1f} MB "
+                    f"of content and {report['pack_bytes_freed'] / 1024 / 1024:.1f} MB of pack files"
+                )
+
+        except Exception as e:
+            logger.error(f"Error running retention: {e}")
+
     async def _notify_expiring_cookies(self):
         """Send notifications for cookies expiring soon"""
         logger.info("Running: Notify expiring cookies")
@@ -0,0 +1,104 @@
+"""In-process cache of the latest snapshot state per watcher
+
+Each watcher has a single snapshot row. Its comparison state - fingerprint,
+fingerprint key, size and the response ETag - is kept here so an unchanged
+check is decided without reading the snapshot. The cache is filled at
+startup and updated whenever the snapshot is written. Only this process
+writes snapshots (watchers run in the app's scheduler), so it never goes
+stale; a miss simply falls back to the database.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+
+
+class SnapshotState(NamedTuple):
+    """Comparison state of a watcher's snapshot"""
+    fingerprint: Optional[str]
+    fingerprint_key: Optional[str]
+    size: int
+    etag: Optional[str]
+
+
+class SnapshotCache:
+    """LRU of SnapshotState by watcher ID"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries
+        self._entries: 'OrderedDict[int, SnapshotState]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries if self._max_entries is not None else settings.SNAPSHOT_CACHE_SIZE
+
+    def get(self, watcher_id: int) -> Optional[SnapshotState]:
+        """Cached state of a watcher's snapshot, or None on a miss"""
+        with self._lock:
+            state = self._entries.get(watcher_id)
+            if state is not None:
+                self._entries.move_to_end(watcher_id)
+            return state
+
+    def set(self, watcher_id: int, state: SnapshotState):
+        """Record the state of a snapshot that was just written"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[watcher_id] = state
+            self._entries.move_to_end(watcher_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_from_snapshot(self, snapshot) -> SnapshotState:
+        """Record the state of a Snapshot row"""
+        state = SnapshotState(snapshot.fingerprint, snapshot.fingerprint_key, snapshot.content_size, snapshot.etag)
+        self.set(snapshot.watcher_id, state)
+        return state
+
+    def invalidate(self, watcher_id: int):
+        """Forget a watcher (deleted, or its snapshot changed outside the normal path)"""
+        with self._lock:
+            self._entries.pop(watcher_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def load(self, db: AsyncSession) -> int:
+        """
+        Fill the cache from the snapshots table
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of cached watchers
+        """
+        from app.models.snapshot import Snapshot
+
+        if self.max_entries <= 0:
+            return 0
+        result = await db.execute(
+            select(
+                Snapshot.watcher_id, Snapshot.fingerprint, Snapshot.fingerprint_key,
+                Snapshot.content_size, Snapshot.etag
+            )
+            .order_by(Snapshot.updated_at.desc())
+            .limit(self.max_entries)
+        )
+        count = 0
+        # Most recently written last, so they are the last to be evicted
+        for watcher_id, fingerprint, fingerprint_key, size, etag in reversed(result.all()):
+            self.set(watcher_id, SnapshotState(fingerprint, fingerprint_key, size, etag))
+            count += 1
+        logger.info(f"Snapshot cache loaded with {count} watchers")
+        return count
+
+
+# Global snapshot cache instance
+snapshot_cache = SnapshotCache()
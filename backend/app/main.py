@@ -7,6 +7,11 @@ from app.api import api_router
 from app.api.test_endpoints import router as test_router
 from app.api.setup import router as setup_router
 from app.core.scheduler import scheduler_service
+from app.core.cpu_pool import cpu_pool
+from app.core.pack_archive import pack_archive
+from app.core.snapshot_cache import snapshot_cache
+from app.database import AsyncSessionLocal
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 
 @asynccontextmanager
@@ -16,10 +21,15 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events
     """
     # Startup
+    cpu_pool.start()
+    async with AsyncSessionLocal() as db:
+        await snapshot_cache.load(db)
     await scheduler_service.start()
     yield
     # Shutdown
     await scheduler_service.stop()
+    cpu_pool.stop()
+    pack_archive.close()
 
 
 # Initialize FastAPI app
@@ -37,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include API router
@@ -4,6 +4,11 @@ from app.models.cookie import Cookie
 from app.models.header import Header
 from app.models.snapshot import Snapshot
 from app.models.change_log import ChangeLog
+from app.models.change_log_search import ChangeLogSearch
+from app.models.change_stat import ChangeStatHourly, ChangeStatDaily
+from app.models.content_blob import ContentBlob
+from app.models.content_chunk import ContentChunk
+from app.models.compression_dictionary import CompressionDictionary
 from app.models.image import Image
 from app.models.setting import Setting
 from app.models.variable import Variable
@@ -16,6 +21,12 @@ __all__ = [
     "Header",
     "Snapshot",
     "ChangeLog",
+    "ChangeLogSearch",
+    "ChangeStatHourly",
+    "ChangeStatDaily",
+    "ContentBlob",
+    "ContentChunk",
+    "CompressionDictionary",
     "Image",
     "Setting",
     "Variable",
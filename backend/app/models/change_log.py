@@ -1,6 +1,6 @@
 """ChangeLog model - stores detected changes"""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary, Float, JSON, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -9,6 +9,10 @@ class ChangeLog(Base):
     """Change log model for tracking content changes"""
 
     __tablename__ = "change_logs"
+    __table_args__ = (
+        Index("ix_change_logs_watcher_id_detected_at", "watcher_id", "detected_at"),
+        Index("ix_change_logs_watcher_id_change_type", "watcher_id", "change_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -19,13 +23,25 @@ class ChangeLog(Base):
     change_type = Column(String(50), nullable=False)  # 'new', 'modified', 'error'
     
     # Content snapshots
-    old_content = Column(LargeBinary, nullable=True)  # Previous content
-    new_content = Column(LargeBinary, nullable=False)  # New content
+    # Stored in content_blobs under old_hash/new_hash ('blob'), as chunk
+    # manifests ('chunks'), or inline in old_content/new_content (legacy, NULL)
+    # Blob columns are deferred so list queries load metadata only; undefer()
+    # them where needed or use ContentStore.load_change_log()
+    storage = Column(String(20), nullable=True)
+    old_content = deferred(Column(LargeBinary, nullable=True))  # Previous content (legacy inline)
+    new_content = deferred(Column(LargeBinary, nullable=True))  # New content (legacy inline)
+    old_chunks = Column(JSON, nullable=True)  # Chunk manifests for binary content (see ContentChunk)
+    new_chunks = Column(JSON, nullable=True)
     old_hash = Column(String(64), nullable=True)
     new_hash = Column(String(64), nullable=False)
     
     # Diff
-    diff = Column(LargeBinary, nullable=True)  # Unified diff
+    diff = deferred(Column(LargeBinary, nullable=True))  # Unified diff
+    diff_format = Column(String(20), nullable=True)  # 'unified', 'json_pointer', 'summary', 'chunks'
+    
+    # Similarity to previous content (SimHash, 1.0 = identical) and derived severity
+    similarity = Column(Float, nullable=True)
+    severity = Column(String(20), nullable=True)  # 'minor', 'moderate', 'major'
     
     # Size tracking
     old_size = Column(Integer, nullable=True)
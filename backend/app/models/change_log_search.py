@@ -0,0 +1,24 @@
+"""ChangeLogSearch model - searchable text of change log diffs"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Index
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from app.database import Base
+
+
+class ChangeLogSearch(Base):
+    """Decoded diff text of a change log, with a FULLTEXT index on MariaDB"""
+
+    __tablename__ = "change_log_search"
+    __table_args__ = (
+        Index("ft_change_log_search_content", "content", mysql_prefix="FULLTEXT"),
+    )
+
+    change_log_id = Column(Integer, ForeignKey("change_logs.id", ondelete="CASCADE"), primary_key=True)
+
+    # Copied from the change log so searches are scoped without a join
+    watcher_id = Column(Integer, nullable=False)
+    detected_at = Column(DateTime(timezone=True), nullable=False)
+
+    content = Column(Text().with_variant(MEDIUMTEXT(), 'mysql'), nullable=False)  # Diff text, truncated to SEARCH_INDEX_MAX_BYTES
+
+    def __repr__(self):
+        return f"<ChangeLogSearch(change_log_id={self.change_log_id}, watcher_id={self.watcher_id})>"
@@ -0,0 +1,47 @@
+"""Change statistics rollups - change log counts per watcher and hour/day"""
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey, Index
+from app.database import Base
+
+
+class ChangeStatColumns:
+    """Columns shared by the hourly and daily rollups"""
+
+    watcher_id = Column(Integer, ForeignKey("watchers.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour/day of detected_at
+
+    # Change logs per change type
+    total_count = Column(Integer, nullable=False, default=0)
+    new_count = Column(Integer, nullable=False, default=0)
+    modified_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+
+    # new_size aggregates (min/max are not lowered when change logs are deleted)
+    size_sum = Column(BigInteger, nullable=False, default=0)
+    min_size = Column(Integer, nullable=True)
+    max_size = Column(Integer, nullable=True)
+
+    last_change = Column(DateTime(timezone=True), nullable=True)  # Latest detected_at in the bucket
+
+
+class ChangeStatHourly(ChangeStatColumns, Base):
+    """Change log rollup per watcher and hour"""
+
+    __tablename__ = "change_stats_hourly"
+    __table_args__ = (
+        Index("ix_change_stats_hourly_bucket", "bucket"),
+    )
+
+    def __repr__(self):
+        return f"<ChangeStatHourly(watcher_id={self.watcher_id}, bucket='{self.bucket}', total={self.total_count})>"
+
+
+class ChangeStatDaily(ChangeStatColumns, Base):
+    """Change log rollup per watcher and day"""
+
+    __tablename__ = "change_stats_daily"
+    __table_args__ = (
+        Index("ix_change_stats_daily_bucket", "bucket"),
+    )
+
+    def __repr__(self):
+        return f"<ChangeStatDaily(watcher_id={self.watcher_id}, bucket='{self.bucket}', total={self.total_count})>"
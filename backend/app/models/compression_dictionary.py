@@ -0,0 +1,27 @@
+"""CompressionDictionary model - per-watcher trained zstd dictionaries"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CompressionDictionary(Base):
+    """zstd dictionary trained on a watcher's recent content"""
+
+    __tablename__ = "compression_dictionaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Watcher whose history trained it; kept after the watcher is deleted,
+    # since blobs compressed with it may be shared with other watchers
+    watcher_id = Column(Integer, ForeignKey("watchers.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    codec = Column(String(20), nullable=False, default='zstd')
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CompressionDictionary(id={self.id}, watcher_id={self.watcher_id}, size={self.size})>"
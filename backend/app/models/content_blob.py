@@ -0,0 +1,32 @@
+"""ContentBlob model - content-addressed, deduplicated content"""
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ContentBlob(Base):
+    """Content blob keyed by the SHA256 of its content, shared by every row that stores it"""
+
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA256 of the content
+    data = Column(LargeBinary, nullable=True)  # Full content, or a delta against base_hash, encoded by codec
+    archive_path = Column(String(500), nullable=True)  # 'pack-NNNNNN.pack:offset:length' when data lives in a pack file
+    size = Column(Integer, nullable=False)  # Size of the content (not of the stored data)
+    stored_size = Column(Integer, nullable=True)  # Bytes actually stored (after delta/compression), in the DB or a pack
+    ref_count = Column(Integer, nullable=False, default=0)  # Rows referencing this blob, plus deltas based on it
+
+    # Compression: 'zstd', 'zlib', 'none' (NULL = uncompressed), optionally with a trained dictionary
+    codec = Column(String(20), nullable=True)
+    dictionary_id = Column(Integer, nullable=True)
+
+    # Reverse-delta chains: older versions are stored as deltas against their successor
+    kind = Column(String(10), nullable=False, default='full')  # 'full' or 'delta'
+    base_hash = Column(String(64), nullable=True)  # Blob a delta applies to
+    chain_length = Column(Integer, nullable=False, default=0)  # Longest delta chain ending at this full blob
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ContentBlob(hash='{self.hash[:16]}...', kind='{self.kind}', size={self.size}, refs={self.ref_count})>"
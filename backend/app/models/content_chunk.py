@@ -0,0 +1,21 @@
+"""ContentChunk model - deduplicated chunks of binary content"""
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ContentChunk(Base):
+    """Content-defined chunk of a binary payload, shared by every manifest that contains it"""
+
+    __tablename__ = "content_chunks"
+
+    hash = Column(String(64), primary_key=True)  # SHA256 of the chunk
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Manifest entries referencing this chunk
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ContentChunk(hash='{self.hash[:16]}...', size={self.size}, refs={self.ref_count})>"
@@ -11,14 +11,14 @@ class Cookie(Base):
     __tablename__ = "cookies"
 
     id = Column(Integer, primary_key=True, index=True)
-    watcher_id = Column(Integer, ForeignKey("watchers.id"), nullable=False)
+    watcher_id = Column(Integer, ForeignKey("watchers.id"), nullable=False, index=True)
     
     # Cookie data
     name = Column(String(255), nullable=False)
     value = Column(Text, nullable=False)
     domain = Column(String(255), nullable=True)
     path = Column(String(255), nullable=True)
-    expires = Column(DateTime(timezone=True), nullable=True)
+    expires = Column(DateTime(timezone=True), nullable=True, index=True)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
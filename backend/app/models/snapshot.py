@@ -1,5 +1,5 @@
 """Snapshot model - stores current state of monitored resources"""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -12,15 +12,23 @@ class Snapshot(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     
-    # Reference to watcher
-    watcher_id = Column(Integer, ForeignKey("watchers.id"), nullable=False)
+    # Reference to watcher (one snapshot per watcher, updated in place)
+    watcher_id = Column(Integer, ForeignKey("watchers.id"), nullable=False, unique=True, index=True)
     
     # Content
-    content = Column(LargeBinary, nullable=False)  # Store as binary for efficiency
-    content_hash = Column(String(64), nullable=False, index=True)  # SHA256 hash
+    content = Column(LargeBinary, nullable=True)  # Legacy inline content; NULL unless storage is NULL
+    chunk_manifest = Column(JSON, nullable=True)  # [[chunk hash, size], ...] for binary content
+    content_hash = Column(String(64), nullable=False, index=True)  # SHA256 hash, also the content_blobs key
+    storage = Column(String(20), nullable=True)  # 'blob', 'chunks', or NULL for inline content
     content_size = Column(Integer, nullable=False)
     content_type = Column(String(100), nullable=True)  # e.g., 'text/html', 'application/json'
     
+    # Comparison fingerprint (hash of normalized content, computed once per write)
+    fingerprint = Column(String(64), nullable=True)
+    fingerprint_key = Column(String(100), nullable=True)  # e.g., 'blake2b:content_aware'
+    simhash = Column(String(16), nullable=True)  # SimHash of normalized content, for similarity scoring
+    etag = Column(String(255), nullable=True)  # ETag of the last response matching this content
+    
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
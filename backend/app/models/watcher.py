@@ -1,5 +1,5 @@
 """Watcher model - unified model for monitoring webpages, APIs, and requests"""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -31,7 +31,12 @@ class Watcher(Base):
     cookie_watcher_id = Column(Integer, ForeignKey("watchers.id"), nullable=True)
     
     # Change detection
-    comparison_mode = Column(String(50), nullable=False, server_default="hash")  # hash, content_aware, disabled
+    comparison_mode = Column(String(50), nullable=False, server_default="hash")  # hash, content_aware, json, disabled
+    selector = Column(Text, nullable=True)  # compare only the region matched by this selector
+    selector_type = Column(String(10), nullable=False, server_default="css")  # css, xpath
+    extract_text = Column(Boolean, nullable=False, server_default="0")  # compare text only, not markup
+    ignore_rules = Column(JSON, nullable=True)  # {"regex": [...], "json_paths": [...]} stripped before comparison
+    similarity_threshold = Column(Float, nullable=True)  # changes at least this similar (0-1) are recorded without diff
     
     # Status and tracking
     status = Column(String(50), nullable=True, server_default="pending")  # pending, running, success, error
@@ -40,7 +45,7 @@ class Watcher(Base):
     change_count = Column(Integer, nullable=False, server_default="0")
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     last_checked_at = Column(DateTime(timezone=True), nullable=True)
     last_changed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 """Workflow execution model - tracks workflow execution history"""
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -9,6 +9,9 @@ class WorkflowExecution(Base):
     """Workflow execution history model"""
 
     __tablename__ = "workflow_executions"
+    __table_args__ = (
+        Index("ix_workflow_executions_workflow_id_started_at", "workflow_id", "started_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
@@ -27,6 +27,8 @@ class ChangeLogInDB(ChangeLogBase):
     id: int
     watcher_id: int
     archive_path: Optional[str] = None
+    similarity: Optional[float] = None
+    severity: Optional[str] = None
     detected_at: datetime
 
     class Config:
@@ -48,6 +50,7 @@ class ChangeLogWithContent(ChangeLogInDB):
 class ChangeLogWithDiff(ChangeLogInDB):
     """Schema for change log with diff only"""
     diff: Optional[str] = None  # Decoded diff as string
+    diff_format: Optional[str] = None  # unified, json_pointer, summary, chunks
 
 
 # New schemas for advanced functionality
@@ -73,7 +76,7 @@ class ChangeLogFilters(BaseModel):
 
 class FrequencyDataPoint(BaseModel):
     """Single data point for frequency charts"""
-    date: str  # YYYY-MM-DD format
+    date: str  # YYYY-MM-DD format (YYYY-MM-DD HH:00 when grouped by hour)
     count: int
     new_count: int
     modified_count: int
@@ -120,9 +123,11 @@ class ChangeLogComparisonItem(BaseModel):
     id: int
     detected_at: datetime
     change_type: str
+    severity: Optional[str] = None
     old_size: Optional[int]
     new_size: int
     diff: Optional[str]
+    diff_format: Optional[str] = None
     watcher_name: str
     watcher_url: str
 
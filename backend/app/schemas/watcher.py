@@ -1,7 +1,25 @@
 """Pydantic schemas for Watcher"""
-from pydantic import BaseModel, Field
-from typing import Optional
+import re
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 from datetime import datetime
+from app.utils.html_scope import compile_selector
+
+
+class IgnoreRules(BaseModel):
+    """Volatile content removed before change detection"""
+    regex: List[str] = Field(default_factory=list)  # matches are removed from the text
+    json_paths: List[str] = Field(default_factory=list)  # e.g. "/meta/timestamp", "items[*].nonce"
+
+    @field_validator("regex")
+    @classmethod
+    def validate_regex(cls, patterns: List[str]) -> List[str]:
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex '{pattern}': {e}")
+        return patterns
 
 
 class WatcherBase(BaseModel):
@@ -24,12 +42,22 @@ class WatcherBase(BaseModel):
     cookie_watcher_id: Optional[int] = None
     
     # Change detection
-    comparison_mode: str = Field(default="hash", pattern="^(hash|content_aware|disabled)$")
+    comparison_mode: str = Field(default="hash", pattern="^(hash|content_aware|json|disabled)$")
+    selector: Optional[str] = None  # CSS selector or XPath limiting comparison to part of a page
+    selector_type: str = Field(default="css", pattern="^(css|xpath)$")
+    extract_text: bool = Field(default=False)
+    ignore_rules: Optional[IgnoreRules] = None
+    similarity_threshold: Optional[float] = Field(default=None, ge=0, le=1)
 
 
 class WatcherCreate(WatcherBase):
     """Schema for creating a watcher"""
-    pass
+
+    @model_validator(mode="after")
+    def validate_selector(self) -> "WatcherCreate":
+        if self.selector:
+            compile_selector(self.selector, self.selector_type)
+        return self
 
 
 class WatcherUpdate(BaseModel):
@@ -52,7 +80,19 @@ class WatcherUpdate(BaseModel):
     cookie_watcher_id: Optional[int] = None
     
     # Change detection
-    comparison_mode: Optional[str] = Field(None, pattern="^(hash|content_aware|disabled)$")
+    comparison_mode: Optional[str] = Field(None, pattern="^(hash|content_aware|json|disabled)$")
+    selector: Optional[str] = None
+    selector_type: Optional[str] = Field(None, pattern="^(css|xpath)$")
+    extract_text: Optional[bool] = None
+    ignore_rules: Optional[IgnoreRules] = None
+    similarity_threshold: Optional[float] = Field(None, ge=0, le=1)
+
+    @model_validator(mode="after")
+    def validate_selector(self) -> "WatcherUpdate":
+        # Without selector_type the stored type applies (checked on update)
+        if self.selector and self.selector_type:
+            compile_selector(self.selector, self.selector_type)
+        return self
 
 
 class WatcherInDB(WatcherBase):
@@ -111,3 +151,16 @@ class WatcherStatistics(BaseModel):
     by_status: dict
     by_content_type: dict
 
+
+
+class WatcherImportError(BaseModel):
+    """Invalid record of a bulk import"""
+    index: int  # 1-based line (NDJSON) or array position (JSON)
+    error: str
+
+
+class WatcherImportResult(BaseModel):
+    """Outcome of a bulk import"""
+    created: int
+    skipped: int = 0  # already watched (skip_existing)
+    errors: List[WatcherImportError] = Field(default_factory=list)
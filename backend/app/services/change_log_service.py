@@ -1,12 +1,47 @@
 """ChangeLog service - business logic for change log management"""
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_, or_, func, desc, asc, text
+import hashlib
+import json
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Dict, Any
+from sqlalchemy import select, update, and_, or_, asc, desc, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, defer, undefer
 from datetime import datetime, timedelta
+from loguru import logger
+from app.config import settings
+from app.utils import chunking, delta as delta_utils, simhash as simhash_utils
+from app.utils.pagination import paginate
+from app.core.response_cache import response_cache, CHANGE_LOGS
 from app.models.change_log import ChangeLog
 from app.models.watcher import Watcher
-from app.schemas.change_log import ChangeLogCreate, ChangeLogListResponse, ChangeLogStatistics, ChangeLogComparison, ChangeLogComparisonItem, FrequencyDataPoint, TopWatcher, ChangeLogWithDiff
+from app.services.content_store import ContentStore, STORAGE_BLOB, STORAGE_CHUNKS
+from app.services.search_service import SearchService
+from app.services.rollup_service import RollupService
+from app.schemas.change_log import ChangeLogCreate, ChangeLogListResponse, ChangeLogStatistics, ChangeLogComparison, ChangeLogComparisonItem, ChangeLogWithDiff
+
+# Columns of change log exports, in order
+EXPORT_FIELDS = (
+    'id', 'watcher_id', 'watcher_name', 'watcher_url', 'change_type', 'detected_at', 'old_size', 'new_size',
+    'old_hash', 'new_hash', 'similarity', 'severity', 'archive_path'
+)
+EXPORT_DIFF_FIELDS = ('diff_format', 'diff')
+
+
+@lru_cache(maxsize=None)
+def _resolve_fingerprint_algorithm(algorithm: str) -> str:
+    """Validate the fingerprint algorithm once per configured value"""
+    algorithm = (algorithm or 'sha256').lower()
+    if algorithm == 'xxh3':
+        try:
+            import xxhash  # noqa: F401
+        except ImportError:
+            logger.warning("FINGERPRINT_ALGORITHM=xxh3 but xxhash is not installed, using blake2b")
+            return 'blake2b'
+        return 'xxh3'
+    if algorithm in ('sha256', 'blake2b'):
+        return algorithm
+    logger.warning(f"Unknown FINGERPRINT_ALGORITHM '{algorithm}', using sha256")
+    return 'sha256'
 
 
 class ChangeLogService:
@@ -17,7 +52,10 @@ class ChangeLogService:
         """Create a new change log"""
         change_log = ChangeLog(**log_data.model_dump())
         db.add(change_log)
+        await db.flush()
+        await RollupService.add_change_log(db, change_log)
         await db.commit()
+        await response_cache.bump(CHANGE_LOGS)
         await db.refresh(change_log)
         return change_log
 
@@ -71,10 +109,66 @@ class ChangeLogService:
         if not change_log:
             return False
 
+        await ContentStore.release_change_log(db, change_log)
+        await RollupService.remove_change_logs(db, [log_id])
         await db.delete(change_log)
         await db.commit()
+        await response_cache.bump(CHANGE_LOGS)
         return True
 
+    @staticmethod
+    def build_filters(
+        db: AsyncSession,
+        watcher_id: Optional[int] = None,
+        change_type: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> List:
+        """
+        Filters of the change log list and export
+
+        Args:
+            db: Database session (its dialect picks the search strategy)
+            watcher_id: Filter by watcher ID
+            change_type: Filter by change type
+            date_from: Filter from date (YYYY-MM-DD)
+            date_to: Filter to date (YYYY-MM-DD)
+            min_size: Minimum change size
+            max_size: Maximum change size
+            search: Search in diff content (see SearchService.parse_query)
+
+        Returns:
+            List of conditions on ChangeLog
+
+        Raises:
+            ValueError: If a date is invalid
+        """
+        filters = []
+        if watcher_id:
+            filters.append(ChangeLog.watcher_id == watcher_id)
+        if change_type:
+            filters.append(ChangeLog.change_type == change_type)
+        if date_from:
+            filters.append(ChangeLog.detected_at >= datetime.fromisoformat(date_from))
+        if date_to:
+            filters.append(ChangeLog.detected_at <= datetime.fromisoformat(date_to + " 23:59:59"))
+        if min_size:
+            filters.append(ChangeLog.new_size >= min_size)
+        if max_size:
+            filters.append(ChangeLog.new_size <= max_size)
+        if search:
+            # Full-text search over the diff text
+            filters.append(ChangeLog.id.in_(SearchService.matching_ids(
+                db, search, watcher_id,
+                datetime.fromisoformat(date_from) if date_from else None,
+                datetime.fromisoformat(date_to + " 23:59:59") if date_to else None
+            )))
+
+        return filters
+
     @staticmethod
     async def get_change_logs_with_filters(
         db: AsyncSession,
@@ -88,7 +182,8 @@ class ChangeLogService:
         max_size: Optional[int] = None,
         search: Optional[str] = None,
         order_by: str = "detected_at",
-        order_direction: str = "desc"
+        order_direction: str = "desc",
+        cursor: Optional[str] = None
     ) -> List[ChangeLogListResponse]:
         """
         Get change logs with advanced filtering
@@ -103,48 +198,33 @@ class ChangeLogService:
             date_to: Filter to date (YYYY-MM-DD)
             min_size: Minimum change size
             max_size: Maximum change size
-            search: Search in diff content
+            search: Search in diff content (see SearchService.parse_query)
             order_by: Field to order by
             order_direction: Order direction
+            cursor: Continue after this cursor instead of skipping rows
 
         Returns:
             List of change logs with watcher names
+
+        Raises:
+            ValueError: If the cursor is invalid
         """
-        # Build query with joins
+        # Build query with joins (content and diff columns stay deferred)
         query = select(ChangeLog).options(
             selectinload(ChangeLog.watcher)
         )
 
-        # Apply filters
-        filters = []
-        if watcher_id:
-            filters.append(ChangeLog.watcher_id == watcher_id)
-        if change_type:
-            filters.append(ChangeLog.change_type == change_type)
-        if date_from:
-            filters.append(ChangeLog.detected_at >= datetime.fromisoformat(date_from))
-        if date_to:
-            filters.append(ChangeLog.detected_at <= datetime.fromisoformat(date_to + " 23:59:59"))
-        if min_size:
-            filters.append(ChangeLog.new_size >= min_size)
-        if max_size:
-            filters.append(ChangeLog.new_size <= max_size)
-        if search:
-            # Search in diff content (if available)
-            filters.append(ChangeLog.diff.contains(search.encode()))
-
+        filters = ChangeLogService.build_filters(
+            db, watcher_id, change_type, date_from, date_to, min_size, max_size, search
+        )
         if filters:
             query = query.where(and_(*filters))
 
-        # Apply ordering
-        order_column = getattr(ChangeLog, order_by)
-        if order_direction == "desc":
-            query = query.order_by(desc(order_column))
-        else:
-            query = query.order_by(asc(order_column))
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply ordering (ID breaks ties) and pagination
+        query = paginate(
+            query, getattr(ChangeLog, order_by), ChangeLog.id, order_by,
+            order_direction == "desc", cursor, skip, limit
+        )
 
         result = await db.execute(query)
         change_logs = result.scalars().all()
@@ -161,6 +241,8 @@ class ChangeLogService:
                 old_hash=log.old_hash,
                 old_size=log.old_size,
                 archive_path=log.archive_path,
+                similarity=log.similarity,
+                severity=log.severity,
                 detected_at=log.detected_at,
                 watcher_name=log.watcher.name if log.watcher else "Unknown",
                 watcher_url=log.watcher.url if log.watcher else ""
@@ -168,6 +250,55 @@ class ChangeLogService:
 
         return response_logs
 
+    @staticmethod
+    async def stream_export(
+        db: AsyncSession,
+        filters: List,
+        order_by: str = "detected_at",
+        order_direction: str = "desc",
+        include_diff: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream change logs as plain records through a server-side cursor
+
+        Rows are fetched batch_size at a time as tuples, never as ORM
+        objects, so memory use does not depend on the number of rows.
+
+        Args:
+            db: Database session, kept open while iterating
+            filters: Conditions from build_filters()
+            order_by: Field to order by
+            order_direction: Order direction
+            include_diff: Add the decoded diff and its format
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            One dict per change log, keyed by EXPORT_FIELDS (and EXPORT_DIFF_FIELDS)
+        """
+        columns = [
+            ChangeLog.id, ChangeLog.watcher_id, Watcher.name.label('watcher_name'), Watcher.url.label('watcher_url'),
+            ChangeLog.change_type, ChangeLog.detected_at, ChangeLog.old_size, ChangeLog.new_size,
+            ChangeLog.old_hash, ChangeLog.new_hash, ChangeLog.similarity, ChangeLog.severity, ChangeLog.archive_path
+        ]
+        if include_diff:
+            columns += [ChangeLog.diff_format, ChangeLog.diff]
+        query = select(*columns).outerjoin(Watcher, Watcher.id == ChangeLog.watcher_id)
+        if filters:
+            query = query.where(and_(*filters))
+        direction = desc if order_direction == "desc" else asc
+        query = query.order_by(direction(getattr(ChangeLog, order_by)), direction(ChangeLog.id))
+
+        result = await db.stream(query, execution_options={'yield_per': batch_size})
+        async for row in result:
+            record = dict(row._mapping)
+            if include_diff and record['diff'] is not None:
+                try:
+                    record['diff'] = record['diff'].decode('utf-8')
+                except UnicodeDecodeError:
+                    record['diff'] = "[Binary content - cannot display]"
+            yield record
+
     @staticmethod
     async def get_change_log_with_diff(db: AsyncSession, log_id: int) -> Optional[ChangeLogWithDiff]:
         """
@@ -182,7 +313,7 @@ class ChangeLogService:
         """
         result = await db.execute(
             select(ChangeLog)
-            .options(selectinload(ChangeLog.watcher))
+            .options(selectinload(ChangeLog.watcher), undefer(ChangeLog.diff))
             .where(ChangeLog.id == log_id)
         )
         change_log = result.scalar_one_or_none()
@@ -207,8 +338,11 @@ class ChangeLogService:
             old_hash=change_log.old_hash,
             old_size=change_log.old_size,
             archive_path=change_log.archive_path,
+            similarity=change_log.similarity,
+            severity=change_log.severity,
             detected_at=change_log.detected_at,
-            diff=diff_str
+            diff=diff_str,
+            diff_format=change_log.diff_format
         )
 
     @staticmethod
@@ -227,69 +361,29 @@ class ChangeLogService:
             watcher_id: Filter by watcher ID
             date_from: Filter from date
             date_to: Filter to date
-            group_by: Group frequency data by day/week/month
+            group_by: Group frequency data by hour/day/week/month
 
         Returns:
             Comprehensive statistics
         """
-        # Build base query
-        base_query = select(ChangeLog)
-        filters = []
-        
-        if watcher_id:
-            filters.append(ChangeLog.watcher_id == watcher_id)
-        if date_from:
-            filters.append(ChangeLog.detected_at >= datetime.fromisoformat(date_from))
-        if date_to:
-            filters.append(ChangeLog.detected_at <= datetime.fromisoformat(date_to + " 23:59:59"))
-
-        if filters:
-            base_query = base_query.where(and_(*filters))
-
-        # Get totals
-        total_result = await db.execute(select(func.count(ChangeLog.id)).select_from(base_query.subquery()))
-        total_changes = total_result.scalar()
-
-        # Get counts by type
-        new_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(and_(ChangeLog.change_type == 'new', *filters))
-        )
-        new_changes = new_result.scalar()
-
-        modified_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(and_(ChangeLog.change_type == 'modified', *filters))
-        )
-        modified_changes = modified_result.scalar()
-
-        error_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(and_(ChangeLog.change_type == 'error', *filters))
-        )
-        error_changes = error_result.scalar()
-
-        # Get size statistics
-        size_result = await db.execute(
-            select(
-                func.avg(ChangeLog.new_size).label('avg_size'),
-                func.min(ChangeLog.new_size).label('min_size'),
-                func.max(ChangeLog.new_size).label('max_size'),
-                func.sum(ChangeLog.new_size).label('total_size')
-            ).where(and_(*filters))
-        )
-        size_stats = size_result.first()
-        
-        avg_change_size = float(size_stats.avg_size) if size_stats.avg_size else 0.0
-        min_change_size = int(size_stats.min_size) if size_stats.min_size else 0
-        max_change_size = int(size_stats.max_size) if size_stats.max_size else 0
-        total_size_change = int(size_stats.total_size) if size_stats.total_size else 0
-
-        # Get frequency data
-        frequency_data = await ChangeLogService.get_frequency_data(db, filters, group_by)
+        # Served from the rollups: a few hundred bucket rows, not the history
+        buckets = await RollupService.get_buckets(db, watcher_id, date_from, date_to, group_by)
+        frequency_data = RollupService.to_frequency_data(buckets, group_by)
+
+        total_changes = sum(bucket['total_count'] for bucket in buckets)
+        new_changes = sum(bucket['new_count'] for bucket in buckets)
+        modified_changes = sum(bucket['modified_count'] for bucket in buckets)
+        error_changes = sum(bucket['error_count'] for bucket in buckets)
+
+        total_size_change = sum(bucket['size_sum'] for bucket in buckets)
+        mins = [bucket['min_size'] for bucket in buckets if bucket['min_size'] is not None]
+        maxes = [bucket['max_size'] for bucket in buckets if bucket['max_size'] is not None]
+        avg_change_size = total_size_change / total_changes if total_changes else 0.0
+        min_change_size = min(mins) if mins else 0
+        max_change_size = max(maxes) if maxes else 0
 
         # Get top watchers
-        top_watchers = await ChangeLogService.get_top_watchers(db, filters)
+        top_watchers = await RollupService.get_top_watchers(db, watcher_id, date_from, date_to)
 
         return ChangeLogStatistics(
             total_changes=total_changes,
@@ -306,80 +400,6 @@ class ChangeLogService:
             date_to=date_to
         )
 
-    @staticmethod
-    async def get_frequency_data(db: AsyncSession, filters: List, group_by: str) -> List[FrequencyDataPoint]:
-        """Get frequency data for charts"""
-        # Determine date truncation based on group_by
-        if group_by == "day":
-            date_trunc = func.date(ChangeLog.detected_at)
-        elif group_by == "week":
-            date_trunc = func.date_trunc('week', ChangeLog.detected_at)
-        elif group_by == "month":
-            date_trunc = func.date_trunc('month', ChangeLog.detected_at)
-        else:
-            date_trunc = func.date(ChangeLog.detected_at)
-
-        # Build query for frequency data
-        from sqlalchemy import case
-        query = select(
-            date_trunc.label('date'),
-            func.count(ChangeLog.id).label('total_count'),
-            func.sum(case((ChangeLog.change_type == 'new', 1), else_=0)).label('new_count'),
-            func.sum(case((ChangeLog.change_type == 'modified', 1), else_=0)).label('modified_count'),
-            func.sum(case((ChangeLog.change_type == 'error', 1), else_=0)).label('error_count')
-        ).group_by(date_trunc).order_by(date_trunc)
-
-        if filters:
-            query = query.where(and_(*filters))
-
-        result = await db.execute(query)
-        rows = result.all()
-
-        frequency_data = []
-        for row in rows:
-            frequency_data.append(FrequencyDataPoint(
-                date=row.date.strftime('%Y-%m-%d'),
-                count=int(row.total_count),
-                new_count=int(row.new_count),
-                modified_count=int(row.modified_count),
-                error_count=int(row.error_count)
-            ))
-
-        return frequency_data
-
-    @staticmethod
-    async def get_top_watchers(db: AsyncSession, filters: List) -> List[TopWatcher]:
-        """Get top watchers by change count"""
-        query = select(
-            Watcher.id,
-            Watcher.name,
-            Watcher.url,
-            Watcher.execution_mode,
-            func.count(ChangeLog.id).label('change_count'),
-            func.max(ChangeLog.detected_at).label('last_change')
-        ).join(ChangeLog, Watcher.id == ChangeLog.watcher_id).group_by(Watcher.id, Watcher.name, Watcher.url, Watcher.execution_mode)
-
-        if filters:
-            query = query.where(and_(*filters))
-
-        query = query.order_by(desc('change_count')).limit(10)
-
-        result = await db.execute(query)
-        rows = result.all()
-
-        top_watchers = []
-        for row in rows:
-            top_watchers.append(TopWatcher(
-                id=row.id,
-                name=row.name,
-                url=row.url,
-                execution_mode=row.execution_mode,
-                change_count=int(row.change_count),
-                last_change=row.last_change
-            ))
-
-        return top_watchers
-
     @staticmethod
     async def compare_change_logs(db: AsyncSession, log_ids: List[int]) -> Optional[ChangeLogComparison]:
         """
@@ -395,7 +415,7 @@ class ChangeLogService:
         # Get all change logs
         result = await db.execute(
             select(ChangeLog)
-            .options(selectinload(ChangeLog.watcher))
+            .options(selectinload(ChangeLog.watcher), undefer(ChangeLog.diff))
             .where(ChangeLog.id.in_(log_ids))
         )
         change_logs = result.scalars().all()
@@ -417,9 +437,11 @@ class ChangeLogService:
                 id=log.id,
                 detected_at=log.detected_at,
                 change_type=log.change_type,
+                severity=log.severity,
                 old_size=log.old_size,
                 new_size=log.new_size,
                 diff=diff_str,
+                diff_format=log.diff_format,
                 watcher_name=log.watcher.name if log.watcher else "Unknown",
                 watcher_url=log.watcher.url if log.watcher else ""
             ))
@@ -446,28 +468,11 @@ class ChangeLogService:
         Returns:
             Dictionary with change log statistics
         """
-        # Total logs
-        total_result = await db.execute(select(func.count(ChangeLog.id)))
-        total_logs = total_result.scalar()
-
-        # By type
-        new_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(ChangeLog.change_type == 'new')
-        )
-        new_logs = new_result.scalar()
-
-        modified_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(ChangeLog.change_type == 'modified')
-        )
-        modified_logs = modified_result.scalar()
-
-        error_result = await db.execute(
-            select(func.count(ChangeLog.id))
-            .where(ChangeLog.change_type == 'error')
-        )
-        error_logs = error_result.scalar()
+        buckets = await RollupService.get_buckets(db)
+        total_logs = sum(bucket['total_count'] for bucket in buckets)
+        new_logs = sum(bucket['new_count'] for bucket in buckets)
+        modified_logs = sum(bucket['modified_count'] for bucket in buckets)
+        error_logs = sum(bucket['error_count'] for bucket in buckets)
 
         return {
             "total": total_logs,
@@ -482,7 +487,10 @@ class ChangeLogService:
         watcher_id: int
     ):
         """
-        Get the latest snapshot for a watcher
+        Get the snapshot of a watcher (there is at most one)
+        
+        The content blob is deferred; use load_snapshot_content() when the
+        previous body is actually needed (e.g. to produce a diff).
         
         Args:
             db: Database session
@@ -493,12 +501,28 @@ class ChangeLogService:
         """
         from app.models.snapshot import Snapshot
         
-        query = select(Snapshot).where(Snapshot.watcher_id == watcher_id)
-        query = query.order_by(desc(Snapshot.created_at)).limit(1)
+        query = select(Snapshot).options(defer(Snapshot.content)).where(Snapshot.watcher_id == watcher_id)
         
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def load_snapshot_content(db: AsyncSession, snapshot) -> bytes:
+        """
+        Load the content of a snapshot
+        
+        Reads the blob store (or chunk store for binary content); legacy
+        snapshots fall back to the deferred inline content column.
+        
+        Args:
+            db: Database session
+            snapshot: Snapshot loaded by get_latest_snapshot()
+            
+        Returns:
+            Snapshot content bytes
+        """
+        return await ContentStore.load_snapshot(db, snapshot)
+
     @staticmethod
     def compute_hash(content: bytes) -> str:
         """
@@ -510,21 +534,177 @@ class ChangeLogService:
         Returns:
             Hex string hash
         """
-        import hashlib
         return hashlib.sha256(content).hexdigest()
 
     @staticmethod
-    def normalize_content(content: bytes, comparison_mode: str) -> bytes:
+    def get_fingerprint_algorithm() -> str:
+        """
+        Resolve the configured fingerprint algorithm
+        
+        Falls back to blake2b when xxh3 is configured but the optional
+        xxhash package is not installed.
+        
+        Returns:
+            Algorithm name ('sha256', 'blake2b' or 'xxh3')
+        """
+        return _resolve_fingerprint_algorithm(settings.FINGERPRINT_ALGORITHM)
+
+    @staticmethod
+    def get_comparison_options(watcher: Watcher) -> Optional[Dict[str, Any]]:
+        """
+        Collect the per-watcher settings that shape comparison
+        
+        The result is a plain dict so it can be sent to CPU pool workers.
+        
+        Args:
+            watcher: Watcher model instance
+            
+        Returns:
+            Options dict, or None if the watcher uses none
+        """
+        options = {}
+        if watcher.selector:
+            options['selector'] = watcher.selector
+            options['selector_type'] = watcher.selector_type or 'css'
+            options['extract_text'] = bool(watcher.extract_text)
+        if watcher.ignore_rules and (watcher.ignore_rules.get('regex') or watcher.ignore_rules.get('json_paths')):
+            options['ignore_rules'] = watcher.ignore_rules
+        return options or None
+
+    @staticmethod
+    def apply_comparison_options(content: bytes, options: Optional[Dict[str, Any]]) -> bytes:
+        """
+        Reduce content to the part that is compared
+        
+        Applies the watcher's selector, then its ignore rules. Both are
+        compiled once and cached in-process.
+        
+        Args:
+            content: Raw content bytes
+            options: Comparison options from get_comparison_options()
+            
+        Returns:
+            Content to fingerprint and diff
+        """
+        if not options:
+            return content
+        from app.utils.html_scope import scope_content
+        from app.utils.ignore_rules import apply_ignore_rules
+        
+        content = scope_content(content, options)
+        return apply_ignore_rules(content, options.get('ignore_rules'))
+
+    @staticmethod
+    def get_fingerprint_key(comparison_mode: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Identify how a fingerprint was computed
+        
+        Stored next to the fingerprint so a snapshot written under a different
+        algorithm, comparison mode or comparison options is never compared
+        against a new one.
+        
+        Args:
+            comparison_mode: Watcher comparison mode
+            options: Comparison options from get_comparison_options()
+            
+        Returns:
+            Fingerprint key, e.g. 'blake2b:content_aware'
+        """
+        key = f"{ChangeLogService.get_fingerprint_algorithm()}:{comparison_mode}"
+        if options:
+            digest = hashlib.blake2b(json.dumps(options, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+            key = f"{key}:{digest}"
+        return key
+
+    @staticmethod
+    def compute_fingerprint(content: bytes, comparison_mode: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Compute the comparison fingerprint of content
+        
+        Normalizes the content for the comparison mode and hashes it with the
+        configured fingerprint algorithm.
+        
+        Args:
+            content: Raw content bytes
+            comparison_mode: 'hash', 'content_aware', 'json', or 'disabled'
+            options: Comparison options from get_comparison_options()
+            
+        Returns:
+            Hex string fingerprint
+        """
+        normalized = ChangeLogService.normalize_content(content, comparison_mode, options)
+        algorithm = ChangeLogService.get_fingerprint_algorithm()
+
+        if algorithm == 'xxh3':
+            import xxhash
+            return xxhash.xxh3_128_hexdigest(normalized)
+        if algorithm == 'blake2b':
+            return hashlib.blake2b(normalized, digest_size=16).hexdigest()
+        return hashlib.sha256(normalized).hexdigest()
+
+    @staticmethod
+    def compute_simhash(content: bytes, comparison_mode: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Compute the SimHash of normalized content for similarity scoring
+        
+        Args:
+            content: Raw content bytes
+            comparison_mode: 'hash', 'content_aware', 'json', or 'disabled'
+            options: Comparison options from get_comparison_options()
+            
+        Returns:
+            SimHash as 16 hex characters
+        """
+        normalized = ChangeLogService.normalize_content(content, comparison_mode, options)
+        return simhash_utils.to_hex(simhash_utils.simhash(normalized))
+
+    @staticmethod
+    def compute_similarity(
+        old_content: bytes,
+        new_content: bytes,
+        old_simhash: str,
+        new_simhash: str,
+        comparison_mode: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> float:
+        """
+        Score a change between two versions of text content
+
+        Args:
+            old_content: Old raw content bytes
+            new_content: New raw content bytes
+            old_simhash: SimHash of the old content (from compute_simhash)
+            new_simhash: SimHash of the new content (from compute_simhash)
+            comparison_mode: 'hash', 'content_aware', 'json', or 'disabled'
+            options: Comparison options from get_comparison_options()
+
+        Returns:
+            Similarity between 0 and 1 (see simhash.compare)
+        """
+        return simhash_utils.compare(
+            simhash_utils.from_hex(old_simhash),
+            simhash_utils.from_hex(new_simhash),
+            ChangeLogService.normalize_content(old_content, comparison_mode, options),
+            ChangeLogService.normalize_content(new_content, comparison_mode, options)
+        )
+
+    @staticmethod
+    def normalize_content(content: bytes, comparison_mode: str, options: Optional[Dict[str, Any]] = None) -> bytes:
         """
         Normalize content based on comparison mode
         
+        A watcher's selector and ignore rules (if any) are applied first, so
+        only the selected region, minus volatile fields, is compared.
+        
         Args:
             content: Raw content bytes
-            comparison_mode: 'hash', 'content_aware', or 'disabled'
+            comparison_mode: 'hash', 'content_aware', 'json', or 'disabled'
+            options: Comparison options from get_comparison_options()
             
         Returns:
             Normalized content bytes
         """
+        content = ChangeLogService.apply_comparison_options(content, options)
         if comparison_mode == 'content_aware':
             try:
                 # Try to decode as text and normalize whitespace
@@ -536,45 +716,89 @@ class ChangeLogService:
             except UnicodeDecodeError:
                 # If not text, return as-is
                 return content
+        if comparison_mode == 'json':
+            from app.utils import json_diff
+            try:
+                # Sorted keys, no whitespace, normalized numbers
+                return json_diff.canonicalize(content)
+            except (ValueError, OverflowError, RecursionError):
+                # Not JSON (or nested too deeply to parse), compare raw bytes
+                return content
         return content
 
     @staticmethod
-    def compute_diff(old_content: bytes, new_content: bytes) -> Optional[bytes]:
+    def get_diff_format(diff: Optional[bytes], comparison_mode: str) -> Optional[str]:
+        """
+        Describe how a diff produced by compute_diff() is encoded
+        
+        Returns:
+            'json_pointer', 'summary', 'unified', or None without a diff
+        """
+        from app.utils.diff import SUMMARY_PREFIX
+        
+        if not diff:
+            return None
+        if comparison_mode == 'json' and diff.startswith(b'{'):
+            return 'json_pointer'
+        if diff.startswith(SUMMARY_PREFIX.encode('utf-8')):
+            return 'summary'
+        return 'unified'
+
+    @staticmethod
+    def compute_diff(
+        old_content: bytes,
+        new_content: bytes,
+        comparison_mode: str = 'hash',
+        options: Optional[Dict[str, Any]] = None
+    ) -> Optional[bytes]:
         """
         Compute unified diff between old and new content
         
+        Uses the line-interned Myers engine in app.utils.diff. Inputs over
+        DIFF_MAX_INPUT_BYTES, or diffs running past DIFF_TIME_BUDGET_SECONDS,
+        produce a size summary instead of a full diff. In 'json' mode a
+        JSON-pointer change list is produced instead when both sides parse.
+        Selectors and ignore rules are applied to both sides first.
+        
         Args:
             old_content: Previous content
             new_content: New content
+            comparison_mode: Watcher comparison mode
+            options: Comparison options from get_comparison_options()
             
         Returns:
             Diff as bytes or None if not computable
         """
+        from app.utils.diff import diff_text
+        
+        old_content = ChangeLogService.apply_comparison_options(old_content, options)
+        new_content = ChangeLogService.apply_comparison_options(new_content, options)
+        
+        if comparison_mode == 'json':
+            from app.utils import json_diff
+            try:
+                return json_diff.diff(old_content, new_content).encode('utf-8')
+            except (ValueError, OverflowError, RecursionError):
+                # Not JSON on one side (or nested too deeply), fall back to a text diff
+                pass
+        
         try:
-            import difflib
-            
             # Try to decode as text
             old_text = old_content.decode('utf-8')
             new_text = new_content.decode('utf-8')
-            
-            # Compute unified diff
-            old_lines = old_text.splitlines(keepends=True)
-            new_lines = new_text.splitlines(keepends=True)
-            
-            diff = difflib.unified_diff(
-                old_lines,
-                new_lines,
-                fromfile='old',
-                tofile='new',
-                lineterm=''
-            )
-            
-            diff_text = '\n'.join(diff)
-            return diff_text.encode('utf-8') if diff_text else None
-            
         except (UnicodeDecodeError, AttributeError):
             # Binary content, can't compute text diff
             return None
+        
+        result = diff_text(
+            old_text,
+            new_text,
+            max_input_bytes=settings.DIFF_MAX_INPUT_BYTES,
+            time_budget=settings.DIFF_TIME_BUDGET_SECONDS,
+            old_size=len(old_content),
+            new_size=len(new_content)
+        )
+        return result.encode('utf-8') if result else None
 
     @staticmethod
     async def create_change_log_for_watcher(
@@ -582,76 +806,209 @@ class ChangeLogService:
         watcher_id: int,
         response_body: str,
         status_code: int,
-        comparison_mode: str = 'hash'
-    ) -> ChangeLog:
+        comparison_mode: str = 'hash',
+        options: Optional[Dict[str, Any]] = None,
+        similarity_threshold: Optional[float] = None,
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None
+    ) -> Optional[ChangeLog]:
         """
         Create change log for a watcher execution
         
+        Unchanged results take a zero-write fast path: no change log row is
+        inserted and the snapshot is left alone (only a missing fingerprint on
+        a legacy snapshot, or a new ETag, is filled in). Check counters live
+        on the watcher. The snapshot's fingerprint is looked up in the
+        snapshot cache first, so unchanged checks usually read nothing.
+        
+        Changes are scored with a SimHash similarity and classified as minor,
+        moderate or major; changes at least as similar as similarity_threshold
+        are recorded without a diff.
+        
+        Content is stored once in content_blobs, keyed by its SHA256; the
+        snapshot and change log only reference it by hash. Binary content
+        types (image, pdf) are split into content-defined chunks instead: the
+        snapshot and change log store chunk manifests, chunks are stored once
+        in content_chunks, and the diff is a JSON summary of the chunks added
+        and removed (diff_format 'chunks'). When text content changes, the
+        previous version's blob is replaced by a reverse delta against the new
+        one (see ContentStore.store_reverse_delta).
+        
         Args:
             db: Database session
             watcher_id: Watcher ID
             response_body: Response body from execution
             status_code: HTTP status code
-            comparison_mode: Comparison mode ('hash', 'content_aware', 'disabled')
+            comparison_mode: Comparison mode ('hash', 'content_aware', 'json', 'disabled')
+            options: Comparison options from get_comparison_options()
+            similarity_threshold: Skip the diff when similarity >= this (0-1)
+            content_type: Watcher content type
+            etag: ETag header of the response
             
         Returns:
-            Created ChangeLog
+            Created ChangeLog, or None if the content is unchanged
         """
         from app.models.snapshot import Snapshot
-        from loguru import logger
+        from app.core.cpu_pool import cpu_pool
+        from app.core.snapshot_cache import snapshot_cache
         
         # Convert response to bytes
         new_content = response_body.encode('utf-8') if isinstance(response_body, str) else response_body
         new_size = len(new_content)
+        is_binary = ContentStore.is_binary_content_type(content_type)
+        storage = STORAGE_CHUNKS if is_binary else STORAGE_BLOB
+        new_chunks = None
+        old_chunks = None
         
-        # Get latest snapshot
-        latest_snapshot = await ChangeLogService.get_latest_snapshot(db, watcher_id=watcher_id)
-        
-        # Determine change type
-        if latest_snapshot is None:
-            change_type = 'new'
-            old_content = None
-            old_hash = None
-            old_size = None
-            diff = None
-        else:
-            old_content = latest_snapshot.content
-            old_hash = latest_snapshot.content_hash
-            old_size = latest_snapshot.content_size
+        # Normalization, hashing and diffing run in the CPU pool for large bodies
+        new_payload = cpu_pool.share(new_content)
+        old_payload = None
+        try:
+            # Fingerprint the new content once; it is stored on the snapshot
+            fingerprint_key = ChangeLogService.get_fingerprint_key(comparison_mode, options)
+            new_fingerprint = await cpu_pool.run(ChangeLogService.compute_fingerprint, new_payload, comparison_mode, options)
             
-            # Normalize content for comparison if needed
-            old_normalized = ChangeLogService.normalize_content(old_content, comparison_mode)
-            new_normalized = ChangeLogService.normalize_content(new_content, comparison_mode)
+            cached = snapshot_cache.get(watcher_id)
+            if cached is not None and cached.fingerprint == new_fingerprint and cached.fingerprint_key == fingerprint_key:
+                if etag != cached.etag:
+                    await db.execute(update(Snapshot).where(Snapshot.watcher_id == watcher_id).values(etag=etag))
+                    await db.commit()
+                    snapshot_cache.set(watcher_id, cached._replace(etag=etag))
+                logger.debug(f"Watcher {watcher_id}: content unchanged (cached), nothing read")
+                return None
             
-            # Compute hashes
-            old_compare_hash = ChangeLogService.compute_hash(old_normalized)
-            new_compare_hash = ChangeLogService.compute_hash(new_normalized)
+            # Get latest snapshot (metadata only, content is deferred)
+            latest_snapshot = await ChangeLogService.get_latest_snapshot(db, watcher_id=watcher_id)
             
-            if old_compare_hash == new_compare_hash:
-                change_type = 'unchanged'
+            # Determine change type
+            if latest_snapshot is None:
+                change_type = 'new'
+                old_content = None
+                old_hash = None
+                old_size = None
                 diff = None
+                diff_format = None
+                similarity = None
             else:
+                old_content = None
+                old_hash = latest_snapshot.content_hash
+                old_size = latest_snapshot.content_size
+                
+                # Compare stored fingerprint; only legacy snapshots (or ones written
+                # under another algorithm/mode) need their content re-processed
+                if latest_snapshot.fingerprint and latest_snapshot.fingerprint_key == fingerprint_key:
+                    old_fingerprint = latest_snapshot.fingerprint
+                else:
+                    old_content = await ChangeLogService.load_snapshot_content(db, latest_snapshot)
+                    old_payload = cpu_pool.share(old_content)
+                    old_fingerprint = await cpu_pool.run(ChangeLogService.compute_fingerprint, old_payload, comparison_mode, options)
+                
+                if old_fingerprint == new_fingerprint:
+                    if (latest_snapshot.fingerprint != new_fingerprint or latest_snapshot.fingerprint_key != fingerprint_key
+                            or latest_snapshot.etag != etag):
+                        latest_snapshot.fingerprint = new_fingerprint
+                        latest_snapshot.fingerprint_key = fingerprint_key
+                        latest_snapshot.etag = etag
+                        await db.commit()
+                    snapshot_cache.set_from_snapshot(latest_snapshot)
+                    logger.debug(f"Watcher {watcher_id}: content unchanged, nothing written")
+                    return None
+                
                 change_type = 'modified'
-                # Compute diff if not disabled
-                if comparison_mode != 'disabled':
-                    diff = ChangeLogService.compute_diff(old_content, new_content)
-                    logger.debug(f"Computed diff, length={len(diff) if diff else 0}, comparison_mode={comparison_mode}")
+                if is_binary:
+                    # Describe the change as chunks added/removed; the old side is
+                    # the snapshot's manifest, so its content is never loaded
+                    new_chunks = await cpu_pool.run(chunking.chunk, new_payload)
+                    if latest_snapshot.storage == STORAGE_CHUNKS:
+                        old_chunks = latest_snapshot.chunk_manifest
+                    else:
+                        # Snapshot stored another way (legacy inline or a blob)
+                        if old_content is None:
+                            old_content = await ChangeLogService.load_snapshot_content(db, latest_snapshot)
+                            old_payload = cpu_pool.share(old_content)
+                        old_chunks = await cpu_pool.run(chunking.chunk, old_payload)
+                    
+                    summary = chunking.summarize(old_chunks, new_chunks)
+                    similarity = summary.pop('similarity')
+                    diff = json.dumps(summary).encode('utf-8') if comparison_mode != 'disabled' else None
+                    diff_format = 'chunks' if diff else None
+                    new_simhash = None
                 else:
-                    diff = None
-                    logger.debug(f"Diff disabled, comparison_mode={comparison_mode}")
+                    if old_content is None:
+                        old_content = await ChangeLogService.load_snapshot_content(db, latest_snapshot)
+                        old_payload = cpu_pool.share(old_content)
+                    
+                    # Score the change; the old SimHash comes from the snapshot when comparable
+                    new_simhash = await cpu_pool.run(ChangeLogService.compute_simhash, new_payload, comparison_mode, options)
+                    if latest_snapshot.simhash and latest_snapshot.fingerprint_key == fingerprint_key:
+                        old_simhash = latest_snapshot.simhash
+                    else:
+                        old_simhash = await cpu_pool.run(ChangeLogService.compute_simhash, old_payload, comparison_mode, options)
+                    similarity = await cpu_pool.run(
+                        ChangeLogService.compute_similarity,
+                        old_payload, new_payload, old_simhash, new_simhash, comparison_mode, options
+                    )
+                
+                    # Compute diff if not disabled and the change is significant enough
+                    if similarity_threshold is not None and similarity >= similarity_threshold:
+                        diff = None
+                        logger.debug(f"Similarity {similarity:.3f} >= threshold {similarity_threshold}, diff skipped")
+                    elif comparison_mode != 'disabled':
+                        diff = await cpu_pool.run(ChangeLogService.compute_diff, old_payload, new_payload, comparison_mode, options)
+                        logger.debug(f"Computed diff, length={len(diff) if diff else 0}, comparison_mode={comparison_mode}")
+                    else:
+                        diff = None
+                        logger.debug(f"Diff disabled, comparison_mode={comparison_mode}")
+                    diff_format = ChangeLogService.get_diff_format(diff, comparison_mode)
+            
+            if change_type == 'new':
+                if is_binary:
+                    new_chunks = await cpu_pool.run(chunking.chunk, new_payload)
+                    new_simhash = None
+                else:
+                    new_simhash = await cpu_pool.run(ChangeLogService.compute_simhash, new_payload, comparison_mode, options)
+            new_hash = await cpu_pool.run(ChangeLogService.compute_hash, new_payload)
+            
+            # The previous version is kept as a reverse delta against this one
+            reverse_delta = None
+            if change_type == 'modified' and not is_binary and await ContentStore.can_store_delta(db, old_hash, new_hash):
+                reverse_delta = await cpu_pool.run(delta_utils.encode, new_payload, old_payload, settings.DIFF_TIME_BUDGET_SECONDS)
+        finally:
+            new_payload.release()
+            if old_payload is not None:
+                old_payload.release()
         
-        # Compute new hash
-        new_hash = ChangeLogService.compute_hash(new_content)
+        # New content is referenced twice: by the snapshot and by the change
+        # log's new side. The snapshot's reference to the old content moves to
+        # the change log's old side, unless it was stored another way (legacy
+        # inline row, or the content type switched), in which case the old
+        # content is stored again here and the snapshot's copy released.
+        if is_binary:
+            await ContentStore.put_chunks(db, new_content, new_chunks, references=2)
+        else:
+            await ContentStore.put_blob(db, new_content, new_hash, references=2, watcher_id=watcher_id)
+        if latest_snapshot is not None and latest_snapshot.storage != storage:
+            if is_binary:
+                await ContentStore.put_chunks(db, old_content, old_chunks)
+            else:
+                old_hash = await ContentStore.put_blob(db, old_content, watcher_id=watcher_id)
+            await ContentStore.release_snapshot(db, latest_snapshot)
+        if reverse_delta is not None:
+            await ContentStore.store_reverse_delta(db, old_hash, new_hash, reverse_delta)
         
         # Create change log
         change_log = ChangeLog(
             watcher_id=watcher_id,
             change_type=change_type,
-            old_content=old_content,
-            new_content=new_content,
+            storage=storage,
+            old_chunks=old_chunks,
+            new_chunks=new_chunks,
             old_hash=old_hash,
             new_hash=new_hash,
             diff=diff,
+            diff_format=diff_format,
+            similarity=similarity,
+            severity=simhash_utils.classify(similarity),
             old_size=old_size,
             new_size=new_size
         )
@@ -659,26 +1016,82 @@ class ChangeLogService:
         logger.debug(f"Watcher {watcher_id}: Created ChangeLog object with diff length={len(diff) if diff else 0}")
         
         db.add(change_log)
+        await db.flush()
+        await SearchService.index_change_log(db, change_log)
+        await RollupService.add_change_log(db, change_log)
         
         # Update or create snapshot
         if latest_snapshot:
-            latest_snapshot.content = new_content
+            latest_snapshot.content = None
+            latest_snapshot.storage = storage
+            latest_snapshot.chunk_manifest = new_chunks
             latest_snapshot.content_hash = new_hash
             latest_snapshot.content_size = new_size
+            latest_snapshot.fingerprint = new_fingerprint
+            latest_snapshot.fingerprint_key = fingerprint_key
+            latest_snapshot.simhash = new_simhash
+            latest_snapshot.etag = etag
             latest_snapshot.updated_at = datetime.now()
         else:
             # Create new snapshot
             snapshot = Snapshot(
                 watcher_id=watcher_id,
-                content=new_content,
+                storage=storage,
+                chunk_manifest=new_chunks,
                 content_hash=new_hash,
-                content_size=new_size
+                content_size=new_size,
+                fingerprint=new_fingerprint,
+                fingerprint_key=fingerprint_key,
+                simhash=new_simhash,
+                etag=etag
             )
             db.add(snapshot)
         
         await db.commit()
+        snapshot_cache.set_from_snapshot(latest_snapshot or snapshot)
+        await response_cache.bump(CHANGE_LOGS)
         await db.refresh(change_log)
         
-        logger.info(f"Created change log for watcher {watcher_id}: type={change_type}, size={new_size}, diff_length={len(change_log.diff) if change_log.diff else 0}")
+        logger.info(f"Created change log for watcher {watcher_id}: type={change_type}, size={new_size}, diff_length={len(diff) if diff else 0}")
         
         return change_log
+
+    @staticmethod
+    async def purge_unchanged_change_logs(db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Delete legacy 'unchanged' change logs in batches
+        
+        Older versions stored a full change log row for every unchanged check.
+        Each batch is committed separately to keep transactions and locks small.
+        
+        Args:
+            db: Database session
+            batch_size: Number of rows deleted per transaction
+            
+        Returns:
+            Total number of deleted rows
+        """
+        from sqlalchemy import delete as sql_delete
+        
+        total_deleted = 0
+        while True:
+            result = await db.execute(
+                select(ChangeLog.id)
+                .where(ChangeLog.change_type == 'unchanged')
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            )
+            ids = [row[0] for row in result.all()]
+            if not ids:
+                break
+            
+            await ContentStore.release_change_logs(db, ids)
+            await RollupService.remove_change_logs(db, ids)
+            await db.execute(sql_delete(ChangeLog).where(ChangeLog.id.in_(ids)))
+            await db.commit()
+            total_deleted += len(ids)
+            logger.info(f"Purged {total_deleted} unchanged change logs so far")
+        
+        if total_deleted:
+            await response_cache.bump(CHANGE_LOGS)
+        return total_deleted
@@ -0,0 +1,743 @@
+"""Content store - deduplicated storage of snapshot and change log content"""
+import hashlib
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select, update, delete, and_, desc, func
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from loguru import logger
+from app.config import settings
+from app.core.pack_archive import pack_archive
+from app.utils import compression, delta as delta_utils
+from app.models.compression_dictionary import CompressionDictionary
+from app.models.content_blob import ContentBlob
+from app.models.content_chunk import ContentChunk
+from app.models.change_log import ChangeLog
+from app.models.snapshot import Snapshot
+
+# Content types stored as chunk manifests instead of whole blobs
+BINARY_CONTENT_TYPES = ('image', 'pdf')
+
+# Values of Snapshot.storage / ChangeLog.storage (NULL = legacy inline columns)
+STORAGE_BLOB = 'blob'
+STORAGE_CHUNKS = 'chunks'
+
+# Values of ContentBlob.kind
+BLOB_FULL = 'full'
+BLOB_DELTA = 'delta'
+
+# Keep IN (...) lists to a reasonable size
+_QUERY_BATCH = 500
+
+
+# Dictionaries are immutable once trained, so they are cached by ID
+_dictionary_cache: Dict[int, bytes] = {}
+
+
+def _batches(items: List[Any]) -> List[List[Any]]:
+    return [items[i:i + _QUERY_BATCH] for i in range(0, len(items), _QUERY_BATCH)]
+
+
+async def _insert_references(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert content rows keyed by hash; a row another session inserted
+    meanwhile gains the new row's ref_count instead of failing the insert
+    """
+    if db.bind.dialect.name in ('mysql', 'mariadb'):
+        stmt = mysql.insert(model)
+        stmt = stmt.on_duplicate_key_update(ref_count=model.ref_count + stmt.inserted.ref_count)
+    else:
+        stmt = sqlite.insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['hash'], set_={'ref_count': model.ref_count + stmt.excluded.ref_count}
+        )
+    await db.execute(stmt, rows)
+
+
+class ContentStore:
+    """Service for content storage"""
+
+    @staticmethod
+    def is_binary_content_type(content_type: Optional[str]) -> bool:
+        """Whether a watcher content type is stored as chunks"""
+        return content_type in BINARY_CONTENT_TYPES
+
+    # Compression
+
+    @staticmethod
+    async def get_dictionary(db: AsyncSession, dictionary_id: int) -> bytes:
+        """Load a compression dictionary by ID (cached in-process)"""
+        if dictionary_id not in _dictionary_cache:
+            result = await db.execute(
+                select(CompressionDictionary.data).where(CompressionDictionary.id == dictionary_id)
+            )
+            data = result.scalar_one_or_none()
+            if data is None:
+                raise ValueError(f"Missing compression dictionary {dictionary_id}")
+            _dictionary_cache[dictionary_id] = data
+        return _dictionary_cache[dictionary_id]
+
+    @staticmethod
+    async def get_watcher_dictionary_id(db: AsyncSession, watcher_id: Optional[int]) -> Optional[int]:
+        """ID of the newest dictionary trained for a watcher, if any"""
+        if watcher_id is None:
+            return None
+        result = await db.execute(
+            select(CompressionDictionary.id)
+            .where(CompressionDictionary.watcher_id == watcher_id)
+            .order_by(desc(CompressionDictionary.id))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def encode(
+        db: AsyncSession,
+        data: bytes,
+        watcher_id: Optional[int] = None
+    ) -> Tuple[str, bytes, Optional[int]]:
+        """
+        Compress data for storage with the configured codec
+
+        zstd uses the watcher's trained dictionary when there is one. Large
+        payloads are compressed in the CPU pool.
+
+        Args:
+            db: Database session
+            data: Raw bytes
+            watcher_id: Watcher whose dictionary to use
+
+        Returns:
+            Tuple of (codec tag, stored bytes, dictionary ID or None)
+        """
+        from app.core.cpu_pool import cpu_pool
+
+        codec = compression.resolve_codec(settings.CONTENT_CODEC)
+        dictionary_id = None
+        dictionary = None
+        if codec == compression.CODEC_ZSTD:
+            dictionary_id = await ContentStore.get_watcher_dictionary_id(db, watcher_id)
+            if dictionary_id is not None:
+                dictionary = await ContentStore.get_dictionary(db, dictionary_id)
+
+        with cpu_pool.share(data) as payload:
+            tag, stored = await cpu_pool.run(compression.compress, payload, codec, dictionary)
+        return tag, stored, dictionary_id if tag == compression.CODEC_ZSTD else None
+
+    @staticmethod
+    async def decode(db: AsyncSession, data: bytes, codec: Optional[str], dictionary_id: Optional[int]) -> bytes:
+        """Decompress stored bytes according to their codec tag"""
+        dictionary = await ContentStore.get_dictionary(db, dictionary_id) if dictionary_id else None
+        return compression.decompress(data, codec, dictionary)
+
+    @staticmethod
+    async def train_dictionary(db: AsyncSession, watcher_id: int) -> Optional[CompressionDictionary]:
+        """
+        Train a zstd dictionary on a watcher's recent versions
+
+        New blobs of the watcher are compressed with it; older blobs keep
+        the dictionary (or none) they were written with.
+
+        Args:
+            db: Database session
+            watcher_id: Watcher ID
+
+        Returns:
+            Stored dictionary, or None if zstd is unavailable or there is too
+            little history to train on
+        """
+        result = await db.execute(
+            select(ChangeLog.new_hash)
+            .where(ChangeLog.watcher_id == watcher_id, ChangeLog.storage == STORAGE_BLOB)
+            .order_by(desc(ChangeLog.id))
+            .limit(settings.CONTENT_DICT_SAMPLES)
+        )
+        samples = [await ContentStore.load_blob(db, content_hash) for content_hash in set(result.scalars().all())]
+        data = compression.train_dictionary(samples, settings.CONTENT_DICT_SIZE)
+        if data is None:
+            return None
+
+        dictionary = CompressionDictionary(
+            watcher_id=watcher_id,
+            codec=compression.CODEC_ZSTD,
+            data=data,
+            size=len(data),
+            sample_count=len(samples)
+        )
+        db.add(dictionary)
+        await db.commit()
+        await db.refresh(dictionary)
+        logger.info(f"Trained {len(data)} byte dictionary for watcher {watcher_id} from {len(samples)} versions")
+        return dictionary
+
+    # Placement
+
+    @staticmethod
+    async def place(data: bytes, key: str) -> Dict[str, Any]:
+        """
+        Decide where stored bytes live
+
+        Bytes of at least ARCHIVE_MIN_BYTES are appended to a pack file and
+        only their location is kept in the database.
+
+        Args:
+            data: Stored (encoded) bytes
+            key: Blob hash, recorded in the pack index
+
+        Returns:
+            Column values: data, archive_path and stored_size
+        """
+        if settings.ARCHIVE_MIN_BYTES and len(data) >= settings.ARCHIVE_MIN_BYTES:
+            return {'data': None, 'archive_path': await pack_archive.append(data, key), 'stored_size': len(data)}
+        return {'data': data, 'archive_path': None, 'stored_size': len(data)}
+
+    @staticmethod
+    def fetch(data: Optional[bytes], archive_path: Optional[str]) -> bytes:
+        """Stored bytes of a blob, from the database or its pack file"""
+        if archive_path:
+            return pack_archive.read(archive_path)
+        return data
+
+    @staticmethod
+    async def archive_blobs(db: AsyncSession, batch_size: int = 100) -> int:
+        """
+        Move large blobs still stored in the database to pack files
+
+        Args:
+            db: Database session
+            batch_size: Blobs per transaction
+
+        Returns:
+            Number of blobs moved
+        """
+        if not settings.ARCHIVE_MIN_BYTES:
+            return 0
+        moved = 0
+        while True:
+            result = await db.execute(
+                select(ContentBlob.hash, ContentBlob.data)
+                .where(
+                    ContentBlob.archive_path.is_(None),
+                    func.length(ContentBlob.data) >= settings.ARCHIVE_MIN_BYTES
+                )
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for content_hash, data in rows:
+                await db.execute(
+                    update(ContentBlob)
+                    .where(ContentBlob.hash == content_hash)
+                    .values(**await ContentStore.place(data, content_hash))
+                )
+            await db.commit()
+            moved += len(rows)
+            logger.info(f"Moved {moved} blobs to pack files so far")
+        return moved
+
+    # Blobs
+
+    @staticmethod
+    async def put_blob(
+        db: AsyncSession,
+        content: bytes,
+        content_hash: Optional[str] = None,
+        references: int = 1,
+        watcher_id: Optional[int] = None
+    ) -> str:
+        """
+        Store content once under its SHA256, adding references
+
+        Reusing content that is currently stored as a delta (e.g. a page that
+        reverted to an older version) materializes it back to a full blob, so
+        it can serve as the base of newer deltas without forming a cycle.
+
+        Args:
+            db: Database session
+            content: Content bytes
+            content_hash: SHA256 of the content, if already known
+            references: Number of places now referencing the content
+            watcher_id: Watcher storing the content (selects the compression dictionary)
+
+        Returns:
+            Content hash (the blob key)
+        """
+        content_hash = content_hash or hashlib.sha256(content).hexdigest()
+        result = await db.execute(
+            select(ContentBlob.kind, ContentBlob.base_hash).where(ContentBlob.hash == content_hash)
+        )
+        existing = result.first()
+        if existing is None:
+            codec, data, dictionary_id = await ContentStore.encode(db, content, watcher_id)
+            # Watchers run concurrently and may store the same content at once
+            await _insert_references(db, ContentBlob, [dict(
+                hash=content_hash,
+                **await ContentStore.place(data, content_hash),
+                size=len(content),
+                ref_count=references,
+                codec=codec,
+                dictionary_id=dictionary_id,
+                kind=BLOB_FULL,
+                chain_length=0
+            )])
+            return content_hash
+
+        values = {'ref_count': ContentBlob.ref_count + references}
+        if existing.kind == BLOB_DELTA:
+            # Deltas may chain onto it from both sides now; make it a keyframe
+            codec, data, dictionary_id = await ContentStore.encode(db, content, watcher_id)
+            values.update(
+                **await ContentStore.place(data, content_hash),
+                codec=codec,
+                dictionary_id=dictionary_id,
+                kind=BLOB_FULL,
+                base_hash=None,
+                chain_length=max(settings.DELTA_KEYFRAME_INTERVAL - 1, 0)
+            )
+        await db.execute(update(ContentBlob).where(ContentBlob.hash == content_hash).values(**values))
+        if existing.kind == BLOB_DELTA:
+            await ContentStore.release_blobs(db, [existing.base_hash])
+        return content_hash
+
+    @staticmethod
+    async def load_blob(db: AsyncSession, content_hash: str) -> bytes:
+        """
+        Load blob content, applying reverse deltas up to the nearest full blob
+
+        Raises:
+            ValueError: If a blob in the chain is missing or the chain loops
+        """
+        deltas = []
+        seen = set()
+        current = content_hash
+        while True:
+            result = await db.execute(
+                select(
+                    ContentBlob.data, ContentBlob.archive_path, ContentBlob.kind, ContentBlob.base_hash,
+                    ContentBlob.codec, ContentBlob.dictionary_id
+                ).where(ContentBlob.hash == current)
+            )
+            row = result.first()
+            if row is None:
+                raise ValueError(f"Missing content blob {current}")
+            stored = ContentStore.fetch(row.data, row.archive_path)
+            data = await ContentStore.decode(db, stored, row.codec, row.dictionary_id)
+            if row.kind != BLOB_DELTA:
+                content = data
+                break
+            if current in seen:
+                raise ValueError(f"Delta chain cycle at content blob {current}")
+            seen.add(current)
+            deltas.append(data)
+            current = row.base_hash
+
+        for delta in reversed(deltas):
+            content = delta_utils.apply(content, delta)
+        return content
+
+    @staticmethod
+    async def can_store_delta(db: AsyncSession, old_hash: Optional[str], new_hash: str) -> bool:
+        """
+        Whether the old version may become a reverse delta against the new one
+
+        False when deltas are disabled, the hashes are equal, or the old blob is
+        already a delta or a keyframe (its chain reached DELTA_KEYFRAME_INTERVAL).
+        A missing old blob (legacy inline content, stored with this change)
+        counts as a fresh full blob.
+
+        Args:
+            db: Database session
+            old_hash: Hash of the previous version
+            new_hash: Hash of the new version
+
+        Returns:
+            True if a delta should be computed
+        """
+        interval = settings.DELTA_KEYFRAME_INTERVAL
+        if interval <= 1 or not old_hash or old_hash == new_hash:
+            return False
+        result = await db.execute(
+            select(ContentBlob.kind, ContentBlob.chain_length).where(ContentBlob.hash == old_hash)
+        )
+        row = result.first()
+        return row is None or (row.kind == BLOB_FULL and row.chain_length + 1 < interval)
+
+    @staticmethod
+    async def store_reverse_delta(db: AsyncSession, old_hash: str, new_hash: str, delta: bytes) -> bool:
+        """
+        Replace the old version's full blob with a delta against the new version
+
+        The new blob must be full (put_blob() guarantees that) and gains a
+        reference from the delta. The delta is kept only if it is at most
+        DELTA_MAX_RATIO of the full size.
+
+        Args:
+            db: Database session
+            old_hash: Hash of the previous version (a full blob)
+            new_hash: Hash of the new version (a full blob)
+            delta: delta.encode(new content, old content)
+
+        Returns:
+            True if the delta was stored
+        """
+        result = await db.execute(
+            select(ContentBlob.hash, ContentBlob.kind, ContentBlob.size, ContentBlob.chain_length)
+            .where(ContentBlob.hash.in_([old_hash, new_hash]))
+        )
+        rows = {row.hash: row for row in result.all()}
+        old, new = rows.get(old_hash), rows.get(new_hash)
+        if old is None or new is None or old.kind != BLOB_FULL or new.kind != BLOB_FULL:
+            return False
+        if len(delta) > old.size * settings.DELTA_MAX_RATIO:
+            return False
+
+        codec, data, dictionary_id = await ContentStore.encode(db, delta)
+        await db.execute(
+            update(ContentBlob)
+            .where(ContentBlob.hash == old_hash)
+            .values(
+                **await ContentStore.place(data, old_hash),
+                codec=codec,
+                dictionary_id=dictionary_id,
+                kind=BLOB_DELTA,
+                base_hash=new_hash,
+                chain_length=0
+            )
+        )
+        await db.execute(
+            update(ContentBlob)
+            .where(ContentBlob.hash == new_hash)
+            .values(
+                ref_count=ContentBlob.ref_count + 1,
+                chain_length=max(new.chain_length, old.chain_length + 1)
+            )
+        )
+        logger.debug(f"Stored {old_hash[:12]} as a {len(delta)} byte delta against {new_hash[:12]}")
+        return True
+
+    @staticmethod
+    async def release_blobs(db: AsyncSession, hashes: Sequence[Optional[str]]) -> None:
+        """
+        Drop one reference per hash; unreferenced blobs are deleted
+
+        A deleted delta releases its reference on its base in turn.
+
+        Args:
+            db: Database session
+            hashes: Blob hashes no longer stored somewhere (None entries are ignored)
+        """
+        counts = Counter(content_hash for content_hash in hashes if content_hash)
+        while counts:
+            by_decrement = defaultdict(list)
+            for content_hash, count in counts.items():
+                by_decrement[count].append(content_hash)
+
+            for decrement, batch_hashes in by_decrement.items():
+                for batch in _batches(batch_hashes):
+                    await db.execute(
+                        update(ContentBlob)
+                        .where(ContentBlob.hash.in_(batch))
+                        .values(ref_count=ContentBlob.ref_count - decrement)
+                    )
+
+            bases = []
+            for batch in _batches(list(counts)):
+                unreferenced = and_(ContentBlob.hash.in_(batch), ContentBlob.ref_count <= 0)
+                result = await db.execute(
+                    select(ContentBlob.base_hash).where(unreferenced, ContentBlob.base_hash.isnot(None))
+                )
+                bases.extend(result.scalars().all())
+                await db.execute(delete(ContentBlob).where(unreferenced))
+            counts = Counter(bases)
+
+    # Chunks
+
+    @staticmethod
+    async def put_chunks(
+        db: AsyncSession,
+        content: bytes,
+        manifest: Sequence[Sequence[Any]],
+        references: int = 1
+    ) -> None:
+        """
+        Store the chunks of a manifest, deduplicated against existing chunks
+
+        Each manifest entry adds `references` to its chunk's reference count,
+        so a manifest stored in two places is put once with references=2.
+
+        Args:
+            db: Database session
+            content: Payload the manifest was computed from
+            manifest: Manifest from app.utils.chunking.chunk()
+            references: Number of places the manifest is stored
+        """
+        counts = Counter(chunk_hash for chunk_hash, _ in manifest)
+        existing = set()
+        for batch in _batches(list(counts)):
+            result = await db.execute(select(ContentChunk.hash).where(ContentChunk.hash.in_(batch)))
+            existing.update(result.scalars().all())
+
+        # Existing chunks only gain references, grouped by increment
+        by_increment = defaultdict(list)
+        for chunk_hash in existing:
+            by_increment[counts[chunk_hash] * references].append(chunk_hash)
+        for increment, hashes in by_increment.items():
+            for batch in _batches(hashes):
+                await db.execute(
+                    update(ContentChunk)
+                    .where(ContentChunk.hash.in_(batch))
+                    .values(ref_count=ContentChunk.ref_count + increment)
+                )
+
+        offset = 0
+        added = {}
+        for chunk_hash, size in manifest:
+            if chunk_hash not in existing and chunk_hash not in added:
+                added[chunk_hash] = dict(
+                    hash=chunk_hash,
+                    data=content[offset:offset + size],
+                    size=size,
+                    ref_count=counts[chunk_hash] * references
+                )
+            offset += size
+        # Chunks shared with a manifest being stored concurrently may have
+        # been inserted since the lookup above
+        for batch in _batches(list(added.values())):
+            await _insert_references(db, ContentChunk, batch)
+
+        logger.debug(f"Stored manifest of {len(manifest)} chunks: {len(added)} new, {len(existing)} shared")
+
+    @staticmethod
+    async def load_chunks(db: AsyncSession, manifest: Sequence[Sequence[Any]]) -> bytes:
+        """
+        Reassemble a payload from its manifest
+
+        Args:
+            db: Database session
+            manifest: Chunk manifest
+
+        Returns:
+            Payload bytes
+
+        Raises:
+            ValueError: If a chunk is missing
+        """
+        data = {}
+        for batch in _batches(list({chunk_hash for chunk_hash, _ in manifest})):
+            result = await db.execute(
+                select(ContentChunk.hash, ContentChunk.data).where(ContentChunk.hash.in_(batch))
+            )
+            data.update(result.all())
+
+        missing = [chunk_hash for chunk_hash, _ in manifest if chunk_hash not in data]
+        if missing:
+            raise ValueError(f"Missing {len(missing)} content chunks, e.g. {missing[0]}")
+        return b''.join(data[chunk_hash] for chunk_hash, _ in manifest)
+
+    @staticmethod
+    async def release_chunks(db: AsyncSession, manifest: Optional[Sequence[Sequence[Any]]]) -> None:
+        """
+        Drop one reference per manifest entry; unreferenced chunks are deleted
+
+        Args:
+            db: Database session
+            manifest: Chunk manifest no longer stored somewhere
+        """
+        if not manifest:
+            return
+        counts = Counter(chunk_hash for chunk_hash, _ in manifest)
+        by_decrement = defaultdict(list)
+        for chunk_hash, count in counts.items():
+            by_decrement[count].append(chunk_hash)
+
+        for decrement, hashes in by_decrement.items():
+            for batch in _batches(hashes):
+                await db.execute(
+                    update(ContentChunk)
+                    .where(ContentChunk.hash.in_(batch))
+                    .values(ref_count=ContentChunk.ref_count - decrement)
+                )
+        for batch in _batches(list(counts)):
+            await db.execute(
+                delete(ContentChunk).where(ContentChunk.hash.in_(batch), ContentChunk.ref_count <= 0)
+            )
+
+    # Rows
+
+    @staticmethod
+    async def load_snapshot(db: AsyncSession, snapshot: Snapshot) -> bytes:
+        """
+        Load a snapshot's content, whatever its storage
+
+        Args:
+            db: Database session
+            snapshot: Snapshot (the inline content column may be deferred)
+
+        Returns:
+            Content bytes
+        """
+        if snapshot.storage == STORAGE_BLOB:
+            return await ContentStore.load_blob(db, snapshot.content_hash)
+        if snapshot.storage == STORAGE_CHUNKS:
+            return await ContentStore.load_chunks(db, snapshot.chunk_manifest)
+        await db.refresh(snapshot, attribute_names=['content'])
+        return snapshot.content
+
+    @staticmethod
+    async def load_change_log(db: AsyncSession, change_log: ChangeLog) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """
+        Load the old and new content of a change log, whatever its storage
+
+        Args:
+            db: Database session
+            change_log: Change log (inline content columns may be deferred)
+
+        Returns:
+            Tuple of (old content or None, new content)
+        """
+        if change_log.storage == STORAGE_BLOB:
+            old = await ContentStore.load_blob(db, change_log.old_hash) if change_log.old_hash else None
+            return old, await ContentStore.load_blob(db, change_log.new_hash)
+        if change_log.storage == STORAGE_CHUNKS:
+            old = await ContentStore.load_chunks(db, change_log.old_chunks) if change_log.old_chunks else None
+            return old, await ContentStore.load_chunks(db, change_log.new_chunks)
+        await db.refresh(change_log, attribute_names=['old_content', 'new_content'])
+        return change_log.old_content, change_log.new_content
+
+    @staticmethod
+    async def release_snapshot(db: AsyncSession, snapshot: Snapshot) -> None:
+        """Release the content referenced by a snapshot that is replaced or deleted"""
+        if snapshot.storage == STORAGE_BLOB:
+            await ContentStore.release_blobs(db, [snapshot.content_hash])
+        elif snapshot.storage == STORAGE_CHUNKS:
+            await ContentStore.release_chunks(db, snapshot.chunk_manifest)
+
+    @staticmethod
+    async def release_change_log(db: AsyncSession, change_log: ChangeLog) -> None:
+        """Release the content referenced by a change log that is about to be deleted"""
+        if change_log.storage == STORAGE_BLOB:
+            await ContentStore.release_blobs(db, [change_log.old_hash, change_log.new_hash])
+        elif change_log.storage == STORAGE_CHUNKS:
+            await ContentStore.release_chunks(db, change_log.old_chunks)
+            await ContentStore.release_chunks(db, change_log.new_chunks)
+
+    @staticmethod
+    async def release_change_logs(db: AsyncSession, log_ids: Sequence[int]) -> None:
+        """
+        Release the content referenced by change logs about to be deleted in bulk
+
+        Only storage metadata is read, never the inline content columns.
+
+        Args:
+            db: Database session
+            log_ids: Change log IDs
+        """
+        for batch in _batches(list(log_ids)):
+            result = await db.execute(
+                select(ChangeLog.storage, ChangeLog.old_hash, ChangeLog.new_hash, ChangeLog.old_chunks, ChangeLog.new_chunks)
+                .where(ChangeLog.id.in_(batch), ChangeLog.storage.isnot(None))
+            )
+            hashes = []
+            for storage, old_hash, new_hash, old_chunks, new_chunks in result.all():
+                if storage == STORAGE_BLOB:
+                    hashes.extend([old_hash, new_hash])
+                else:
+                    await ContentStore.release_chunks(db, old_chunks)
+                    await ContentStore.release_chunks(db, new_chunks)
+            await ContentStore.release_blobs(db, hashes)
+
+    @staticmethod
+    async def release_watcher(db: AsyncSession, watcher_id: int) -> None:
+        """
+        Release the content referenced by a watcher's snapshots and change logs
+
+        Call before deleting the watcher (its rows are removed by cascade).
+
+        Args:
+            db: Database session
+            watcher_id: Watcher ID
+        """
+        result = await db.execute(
+            select(Snapshot.storage, Snapshot.content_hash, Snapshot.chunk_manifest)
+            .where(Snapshot.watcher_id == watcher_id, Snapshot.storage.isnot(None))
+        )
+        hashes = []
+        for storage, content_hash, manifest in result.all():
+            if storage == STORAGE_BLOB:
+                hashes.append(content_hash)
+            else:
+                await ContentStore.release_chunks(db, manifest)
+        await ContentStore.release_blobs(db, hashes)
+
+        result = await db.execute(
+            select(ChangeLog.id).where(ChangeLog.watcher_id == watcher_id, ChangeLog.storage.isnot(None))
+        )
+        await ContentStore.release_change_logs(db, result.scalars().all())
+
+    # Backfill
+
+    @staticmethod
+    async def migrate_inline_content(db: AsyncSession, batch_size: int = 100) -> Tuple[int, int]:
+        """
+        Move legacy inline snapshot and change log content into content_blobs
+
+        Rows are processed in batches, each committed separately. Hashes are
+        recomputed from the content, so the blob key always matches the data.
+
+        Args:
+            db: Database session
+            batch_size: Rows per transaction
+
+        Returns:
+            Tuple of (snapshots migrated, change logs migrated)
+        """
+        snapshots = 0
+        while True:
+            result = await db.execute(
+                select(Snapshot).where(Snapshot.storage.is_(None)).order_by(Snapshot.id).limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                break
+            for snapshot in rows:
+                snapshot.content_hash = await ContentStore.put_blob(
+                    db, snapshot.content or b'', watcher_id=snapshot.watcher_id
+                )
+                snapshot.content = None
+                snapshot.storage = STORAGE_BLOB
+            await db.commit()
+            snapshots += len(rows)
+            logger.info(f"Moved {snapshots} snapshots to the blob store so far")
+
+        change_logs = 0
+        while True:
+            result = await db.execute(
+                select(ChangeLog)
+                .options(undefer(ChangeLog.old_content), undefer(ChangeLog.new_content))
+                .where(ChangeLog.storage.is_(None))
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                break
+            for change_log in rows:
+                if change_log.old_content is not None:
+                    change_log.old_hash = await ContentStore.put_blob(
+                        db, change_log.old_content, watcher_id=change_log.watcher_id
+                    )
+                else:
+                    change_log.old_hash = None
+                change_log.new_hash = await ContentStore.put_blob(
+                    db, change_log.new_content or b'', watcher_id=change_log.watcher_id
+                )
+                change_log.old_content = None
+                change_log.new_content = None
+                change_log.storage = STORAGE_BLOB
+            await db.commit()
+            change_logs += len(rows)
+            logger.info(f"Moved {change_logs} change logs to the blob store so far")
+
+        return snapshots, change_logs
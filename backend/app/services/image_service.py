@@ -4,6 +4,7 @@ from sqlalchemy import select, delete as sql_delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.image import Image
+from app.utils.pagination import paginate
 
 
 class ImageService:
@@ -20,15 +21,16 @@ class ImageService:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        monitor_id: Optional[int] = None
+        monitor_id: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> List[Image]:
-        """Get list of images with optional filtering"""
+        """Get list of images with optional filtering, newest first (cursor replaces skip)"""
         query = select(Image)
         
         if monitor_id:
             query = query.where(Image.monitor_id == monitor_id)
         
-        query = query.order_by(Image.downloaded_at.desc()).offset(skip).limit(limit)
+        query = paginate(query, Image.downloaded_at, Image.id, 'downloaded_at', True, cursor, skip, limit)
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -0,0 +1,253 @@
+"""Retention service - deletes old change logs and compacts content storage"""
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+from app.config import settings
+from app.core.pack_archive import pack_archive, parse_location
+from app.core.response_cache import response_cache, CHANGE_LOGS
+from app.models.change_log import ChangeLog
+from app.models.content_blob import ContentBlob
+from app.models.content_chunk import ContentChunk
+from app.services.content_store import ContentStore
+from app.services.rollup_service import RollupService
+
+
+class RetentionService:
+    """Service for retention rules and storage compaction"""
+
+    @staticmethod
+    async def get_store_size(db: AsyncSession) -> int:
+        """Bytes held by the content store (blobs, in the DB or packs, plus chunks)"""
+        blobs = await db.execute(
+            select(func.coalesce(func.sum(func.coalesce(ContentBlob.stored_size, func.length(ContentBlob.data))), 0))
+        )
+        chunks = await db.execute(select(func.coalesce(func.sum(ContentChunk.size), 0)))
+        return int(blobs.scalar() or 0) + int(chunks.scalar() or 0)
+
+    @staticmethod
+    async def get_daily_keep_ids(db: AsyncSession, watcher_id: Optional[int] = None) -> Set[int]:
+        """
+        IDs of the first and last change of each day, per watcher
+
+        Args:
+            db: Database session
+            watcher_id: Limit to one watcher
+
+        Returns:
+            Change log IDs spared by the version and size rules
+        """
+        if not settings.RETENTION_KEEP_DAILY:
+            return set()
+        query = (
+            select(func.min(ChangeLog.id), func.max(ChangeLog.id))
+            .group_by(ChangeLog.watcher_id, func.date(ChangeLog.detected_at))
+        )
+        if watcher_id is not None:
+            query = query.where(ChangeLog.watcher_id == watcher_id)
+        result = await db.execute(query)
+        keep = set()
+        for first_id, last_id in result.all():
+            keep.update((first_id, last_id))
+        return keep
+
+    @staticmethod
+    async def delete_change_logs(db: AsyncSession, log_ids: List[int]) -> int:
+        """
+        Delete change logs in small batches, releasing their content
+
+        Each batch is its own transaction, followed by a short pause so the
+        watchers running alongside are not starved of the database.
+
+        Args:
+            db: Database session
+            log_ids: Change log IDs to delete
+
+        Returns:
+            Number of deleted rows
+        """
+        batch_size = max(settings.RETENTION_BATCH_SIZE, 1)
+        deleted = 0
+        for start in range(0, len(log_ids), batch_size):
+            batch = log_ids[start:start + batch_size]
+            await ContentStore.release_change_logs(db, batch)
+            await RollupService.remove_change_logs(db, batch)
+            result = await db.execute(delete(ChangeLog).where(ChangeLog.id.in_(batch)))
+            await db.commit()
+            await response_cache.bump(CHANGE_LOGS)
+            deleted += result.rowcount
+            if settings.RETENTION_BATCH_PAUSE_SECONDS > 0:
+                await asyncio.sleep(settings.RETENTION_BATCH_PAUSE_SECONDS)
+        return deleted
+
+    @staticmethod
+    async def apply_max_age(db: AsyncSession) -> int:
+        """Delete change logs older than RETENTION_MAX_AGE_DAYS (no daily exemption)"""
+        if not settings.RETENTION_MAX_AGE_DAYS:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.RETENTION_MAX_AGE_DAYS)
+        result = await db.execute(
+            select(ChangeLog.id).where(ChangeLog.detected_at < cutoff).order_by(ChangeLog.id)
+        )
+        deleted = await RetentionService.delete_change_logs(db, list(result.scalars().all()))
+        if deleted:
+            logger.info(f"Retention: deleted {deleted} change logs older than {settings.RETENTION_MAX_AGE_DAYS} days")
+        return deleted
+
+    @staticmethod
+    async def apply_max_versions(db: AsyncSession) -> int:
+        """Keep at most RETENTION_MAX_VERSIONS change logs per watcher, plus the daily first/last"""
+        limit = settings.RETENTION_MAX_VERSIONS
+        if not limit:
+            return 0
+        result = await db.execute(
+            select(ChangeLog.watcher_id)
+            .group_by(ChangeLog.watcher_id)
+            .having(func.count(ChangeLog.id) > limit)
+        )
+        deleted = 0
+        for watcher_id in result.scalars().all():
+            keep = await RetentionService.get_daily_keep_ids(db, watcher_id)
+            ids_result = await db.execute(
+                select(ChangeLog.id)
+                .where(ChangeLog.watcher_id == watcher_id)
+                .order_by(ChangeLog.id.desc())
+                .offset(limit)
+            )
+            expired = [log_id for log_id in ids_result.scalars().all() if log_id not in keep]
+            deleted += await RetentionService.delete_change_logs(db, expired)
+        if deleted:
+            logger.info(f"Retention: deleted {deleted} change logs beyond {limit} per watcher")
+        return deleted
+
+    @staticmethod
+    async def apply_size_budget(db: AsyncSession) -> int:
+        """Delete the oldest change logs until the content store fits MAX_ARCHIVE_SIZE_MB"""
+        if not settings.MAX_ARCHIVE_SIZE_MB:
+            return 0
+        budget = settings.MAX_ARCHIVE_SIZE_MB * 1024 * 1024
+        size = await RetentionService.get_store_size(db)
+        if size <= budget:
+            return 0
+
+        keep = await RetentionService.get_daily_keep_ids(db)
+        batch_size = max(settings.RETENTION_BATCH_SIZE, 1)
+        deleted = 0
+        last_id = 0
+        while size > budget:
+            result = await db.execute(
+                select(ChangeLog.id)
+                .where(ChangeLog.id > last_id)
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            )
+            ids = list(result.scalars().all())
+            if not ids:
+                logger.warning(
+                    f"Retention: content store is {size / 1024 / 1024:.1f} MB, over the "
+                    f"{settings.MAX_ARCHIVE_SIZE_MB} MB budget, but only daily first/last changes "
+                    f"and current snapshots are left"
+                )
+                break
+            last_id = ids[-1]
+            deleted += await RetentionService.delete_change_logs(
+                db, [log_id for log_id in ids if log_id not in keep]
+            )
+            size = await RetentionService.get_store_size(db)
+        if deleted:
+            logger.info(f"Retention: deleted {deleted} change logs to fit the {settings.MAX_ARCHIVE_SIZE_MB} MB budget")
+        return deleted
+
+    @staticmethod
+    async def compact(db: AsyncSession) -> int:
+        """
+        Compact the blob store and pack files
+
+        Sweeps unreferenced blobs and chunks, then rewrites the live records of
+        packs with at least RETENTION_PACK_COMPACT_RATIO dead bytes into the
+        current pack and deletes packs nothing references any more. The newest
+        pack is never compacted since it is still being appended to, nor is
+        any pack appended to within RETENTION_PACK_GRACE_SECONDS: blobs are
+        written to a pack before their row is committed, so a recent pack
+        may hold records that no committed row references yet.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Bytes freed on disk by removed packs, net of rewritten records
+        """
+        blobs = await db.execute(delete(ContentBlob).where(ContentBlob.ref_count <= 0))
+        chunks = await db.execute(delete(ContentChunk).where(ContentChunk.ref_count <= 0))
+        await db.commit()
+        if blobs.rowcount or chunks.rowcount:
+            logger.info(f"Compaction: swept {blobs.rowcount} blobs and {chunks.rowcount} chunks without references")
+
+        settled_before = time.time() - settings.RETENTION_PACK_GRACE_SECONDS
+        names = [
+            name for name in pack_archive.pack_names()[:-1]
+            if pack_archive.last_write(name) < settled_before
+        ]
+        if not names:
+            return 0
+        result = await db.execute(
+            select(ContentBlob.hash, ContentBlob.archive_path).where(ContentBlob.archive_path.isnot(None))
+        )
+        live: Dict[str, List[Any]] = defaultdict(list)
+        for content_hash, location in result.all():
+            live[parse_location(location)[0]].append((content_hash, location))
+
+        freed = 0
+        for name in names:
+            records = live.get(name, [])
+            pack_size = pack_archive.pack_size(name)
+            live_bytes = sum(parse_location(location)[2] for _, location in records)
+            if records and pack_size - live_bytes < pack_size * settings.RETENTION_PACK_COMPACT_RATIO:
+                continue
+
+            for content_hash, location in records:
+                new_location = await pack_archive.append(pack_archive.read(location), content_hash)
+                # Only move the record if the blob was not rewritten meanwhile
+                await db.execute(
+                    update(ContentBlob)
+                    .where(ContentBlob.hash == content_hash, ContentBlob.archive_path == location)
+                    .values(archive_path=new_location)
+                )
+            await db.commit()
+
+            remaining = await db.execute(
+                select(func.count()).select_from(ContentBlob).where(ContentBlob.archive_path.like(f"{name}:%"))
+            )
+            if remaining.scalar():
+                logger.warning(f"Compaction: {name} is still referenced, keeping it")
+                continue
+            pack_archive.remove(name)
+            freed += pack_size - live_bytes
+        return freed
+
+    @staticmethod
+    async def run(db: AsyncSession) -> Dict[str, int]:
+        """
+        Apply all retention rules, then compact storage
+
+        Args:
+            db: Database session
+
+        Returns:
+            Report of deleted change logs per rule and bytes freed
+        """
+        size_before = await RetentionService.get_store_size(db)
+        report = {
+            'deleted_by_age': await RetentionService.apply_max_age(db),
+            'deleted_by_versions': await RetentionService.apply_max_versions(db),
+            'deleted_by_size': await RetentionService.apply_size_budget(db),
+        }
+        report['pack_bytes_freed'] = await RetentionService.compact(db)
+        report['store_bytes_before'] = size_before
+        report['store_bytes_after'] = await RetentionService.get_store_size(db)
+        report['freed_bytes'] = size_before - report['store_bytes_after']
+        return report
@@ -0,0 +1,308 @@
+"""Rollup service - hourly and daily change statistics per watcher"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, update, delete, and_, func, desc, inspect
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+from app.models.change_log import ChangeLog
+from app.models.change_stat import ChangeStatHourly, ChangeStatDaily
+from app.models.watcher import Watcher
+from app.schemas.change_log import FrequencyDataPoint, TopWatcher
+
+ROLLUPS = (ChangeStatHourly, ChangeStatDaily)
+
+COUNT_COLUMNS = ('total_count', 'new_count', 'modified_count', 'error_count', 'size_sum')
+TYPE_COLUMNS = {'new': 'new_count', 'modified': 'modified_count', 'error': 'error_count'}
+
+
+def bucket_start(model, detected_at: datetime) -> datetime:
+    """Start of the hour or day (depending on the rollup) containing detected_at"""
+    start = detected_at.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+    if model is ChangeStatDaily:
+        start = start.replace(hour=0)
+    return start
+
+
+def _aggregate(model, rows: Iterable[Tuple[int, datetime, str, int]]) -> List[dict]:
+    """Rollup rows for (watcher_id, detected_at, change_type, new_size) change log rows"""
+    buckets: Dict[Tuple[int, datetime], dict] = {}
+    for watcher_id, detected_at, change_type, new_size in rows:
+        key = (watcher_id, bucket_start(model, detected_at))
+        stat = buckets.get(key)
+        if stat is None:
+            stat = buckets[key] = {
+                'watcher_id': key[0], 'bucket': key[1],
+                'total_count': 0, 'new_count': 0, 'modified_count': 0, 'error_count': 0,
+                'size_sum': 0, 'min_size': None, 'max_size': None, 'last_change': None
+            }
+        stat['total_count'] += 1
+        if change_type in TYPE_COLUMNS:
+            stat[TYPE_COLUMNS[change_type]] += 1
+        if new_size is not None:
+            stat['size_sum'] += new_size
+            stat['min_size'] = new_size if stat['min_size'] is None else min(stat['min_size'], new_size)
+            stat['max_size'] = new_size if stat['max_size'] is None else max(stat['max_size'], new_size)
+        if stat['last_change'] is None or detected_at > stat['last_change']:
+            stat['last_change'] = detected_at
+    return list(buckets.values())
+
+
+class RollupService:
+    """Service for the change statistics rollups"""
+
+    @staticmethod
+    async def merge(db: AsyncSession, model, stats: List[dict]) -> None:
+        """
+        Add rollup rows to the stored ones (insert or update in one statement)
+
+        Args:
+            db: Database session
+            model: ChangeStatHourly or ChangeStatDaily
+            stats: Rows from _aggregate()
+        """
+        if not stats:
+            return
+        if db.bind.dialect.name in ('mysql', 'mariadb'):
+            stmt = mysql.insert(model).values(stats)
+            new = stmt.inserted
+            lowest, highest = func.least, func.greatest
+        else:
+            stmt = sqlite.insert(model).values(stats)
+            new = stmt.excluded
+            # SQLite's multi-argument min()/max() are scalar
+            lowest, highest = func.min, func.max
+
+        values = {name: getattr(model, name) + getattr(new, name) for name in COUNT_COLUMNS}
+        values['min_size'] = func.coalesce(lowest(model.min_size, new.min_size), new.min_size, model.min_size)
+        values['max_size'] = func.coalesce(highest(model.max_size, new.max_size), new.max_size, model.max_size)
+        values['last_change'] = func.coalesce(highest(model.last_change, new.last_change), new.last_change, model.last_change)
+
+        if db.bind.dialect.name in ('mysql', 'mariadb'):
+            stmt = stmt.on_duplicate_key_update(**values)
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=['watcher_id', 'bucket'], set_=values)
+        await db.execute(stmt)
+
+    @staticmethod
+    async def add_change_log(db: AsyncSession, change_log: ChangeLog) -> None:
+        """
+        Count a flushed change log in the rollups (committed with the change log)
+
+        Args:
+            db: Database session
+            change_log: Flushed change log
+        """
+        if 'detected_at' in inspect(change_log).unloaded:
+            # Server default, not loaded back by the flush
+            await db.refresh(change_log, attribute_names=['detected_at'])
+        row = (change_log.watcher_id, change_log.detected_at, change_log.change_type, change_log.new_size)
+        for model in ROLLUPS:
+            await RollupService.merge(db, model, _aggregate(model, [row]))
+
+    @staticmethod
+    async def remove_change_logs(db: AsyncSession, log_ids: Sequence[int]) -> None:
+        """
+        Subtract change logs about to be deleted from the rollups
+
+        Counts and size sums are exact; min/max sizes and last_change keep
+        covering the deleted rows until the rollups are rebuilt.
+
+        Args:
+            db: Database session
+            log_ids: Change log IDs
+        """
+        if not log_ids:
+            return
+        result = await db.execute(
+            select(ChangeLog.watcher_id, ChangeLog.detected_at, ChangeLog.change_type, ChangeLog.new_size)
+            .where(ChangeLog.id.in_(list(log_ids)))
+        )
+        rows = result.all()
+        for model in ROLLUPS:
+            for stat in _aggregate(model, rows):
+                await db.execute(
+                    update(model)
+                    .where(model.watcher_id == stat['watcher_id'], model.bucket == stat['bucket'])
+                    .values({name: getattr(model, name) - stat[name] for name in COUNT_COLUMNS})
+                )
+            await db.execute(delete(model).where(model.total_count <= 0))
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, batch_size: int = 5000) -> int:
+        """
+        Recompute both rollups from the change_logs table
+
+        Args:
+            db: Database session
+            batch_size: Change logs read per batch
+
+        Returns:
+            Number of change logs counted
+        """
+        for model in ROLLUPS:
+            await db.execute(delete(model))
+        await db.commit()
+
+        counted = 0
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(ChangeLog.id, ChangeLog.watcher_id, ChangeLog.detected_at, ChangeLog.change_type, ChangeLog.new_size)
+                .where(ChangeLog.id > last_id)
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for model in ROLLUPS:
+                await RollupService.merge(db, model, _aggregate(model, [row[1:] for row in rows]))
+            await db.commit()
+            counted += len(rows)
+            last_id = rows[-1].id
+            logger.info(f"Rolled up {counted} change logs so far")
+        return counted
+
+    # Reads
+
+    @staticmethod
+    def _filters(model, watcher_id: Optional[int], date_from: Optional[str], date_to: Optional[str]) -> List:
+        """Filters on a rollup for a watcher and an inclusive YYYY-MM-DD range"""
+        filters = []
+        if watcher_id:
+            filters.append(model.watcher_id == watcher_id)
+        if date_from:
+            filters.append(model.bucket >= datetime.fromisoformat(date_from))
+        if date_to:
+            filters.append(model.bucket < datetime.fromisoformat(date_to) + timedelta(days=1))
+        return filters
+
+    @staticmethod
+    async def get_buckets(
+        db: AsyncSession,
+        watcher_id: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        group_by: str = "day"
+    ) -> List[dict]:
+        """
+        Change counts and size aggregates per hour/day/week/month, across watchers
+
+        Weeks start on Monday; weeks and months are summed from the daily rollup.
+
+        Args:
+            db: Database session
+            watcher_id: Filter by watcher ID
+            date_from: Filter from date (YYYY-MM-DD)
+            date_to: Filter to date (YYYY-MM-DD)
+            group_by: hour/day/week/month
+
+        Returns:
+            Buckets in date order, each with 'date' and the rollup columns
+        """
+        model = ChangeStatHourly if group_by == "hour" else ChangeStatDaily
+        query = select(
+            model.bucket,
+            func.sum(model.total_count).label('total_count'),
+            func.sum(model.new_count).label('new_count'),
+            func.sum(model.modified_count).label('modified_count'),
+            func.sum(model.error_count).label('error_count'),
+            func.sum(model.size_sum).label('size_sum'),
+            func.min(model.min_size).label('min_size'),
+            func.max(model.max_size).label('max_size')
+        ).group_by(model.bucket).order_by(model.bucket)
+
+        filters = RollupService._filters(model, watcher_id, date_from, date_to)
+        if filters:
+            query = query.where(and_(*filters))
+        result = await db.execute(query)
+
+        buckets: Dict[datetime, dict] = {}
+        for row in result.all():
+            start = row.bucket
+            if group_by == "week":
+                start = start - timedelta(days=start.weekday())
+            elif group_by == "month":
+                start = start.replace(day=1)
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = defaultdict(int, date=start, min_size=None, max_size=None)
+            for name in COUNT_COLUMNS:
+                bucket[name] += int(getattr(row, name) or 0)
+            if row.min_size is not None:
+                bucket['min_size'] = row.min_size if bucket['min_size'] is None else min(bucket['min_size'], row.min_size)
+            if row.max_size is not None:
+                bucket['max_size'] = row.max_size if bucket['max_size'] is None else max(bucket['max_size'], row.max_size)
+        return list(buckets.values())
+
+    @staticmethod
+    def to_frequency_data(buckets: List[dict], group_by: str) -> List[FrequencyDataPoint]:
+        """Chart points for get_buckets() results"""
+        date_format = '%Y-%m-%d %H:00' if group_by == "hour" else '%Y-%m-%d'
+        return [
+            FrequencyDataPoint(
+                date=bucket['date'].strftime(date_format),
+                count=bucket['total_count'],
+                new_count=bucket['new_count'],
+                modified_count=bucket['modified_count'],
+                error_count=bucket['error_count']
+            )
+            for bucket in buckets
+        ]
+
+    @staticmethod
+    async def get_top_watchers(
+        db: AsyncSession,
+        watcher_id: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 10
+    ) -> List[TopWatcher]:
+        """
+        Watchers with the most changes, from the daily rollup
+
+        Args:
+            db: Database session
+            watcher_id: Filter by watcher ID
+            date_from: Filter from date (YYYY-MM-DD)
+            date_to: Filter to date (YYYY-MM-DD)
+            limit: Number of watchers
+
+        Returns:
+            Top watchers by change count
+        """
+        counts = select(
+            ChangeStatDaily.watcher_id,
+            func.sum(ChangeStatDaily.total_count).label('change_count'),
+            func.max(ChangeStatDaily.last_change).label('last_change')
+        ).group_by(ChangeStatDaily.watcher_id)
+
+        filters = RollupService._filters(ChangeStatDaily, watcher_id, date_from, date_to)
+        if filters:
+            counts = counts.where(and_(*filters))
+
+        counts = counts.order_by(desc('change_count')).limit(limit).subquery()
+        result = await db.execute(
+            select(
+                Watcher.id,
+                Watcher.name,
+                Watcher.url,
+                Watcher.execution_mode,
+                counts.c.change_count,
+                counts.c.last_change
+            ).join(counts, Watcher.id == counts.c.watcher_id).order_by(desc(counts.c.change_count))
+        )
+
+        return [
+            TopWatcher(
+                id=row.id,
+                name=row.name,
+                url=row.url,
+                execution_mode=row.execution_mode,
+                change_count=int(row.change_count),
+                last_change=row.last_change
+            )
+            for row in result.all()
+        ]
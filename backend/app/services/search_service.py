@@ -0,0 +1,187 @@
+"""Search service - full-text search over change log diffs"""
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from sqlalchemy import select, and_, inspect
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from loguru import logger
+from app.config import settings
+from app.models.change_log import ChangeLog
+from app.models.change_log_search import ChangeLogSearch
+
+# Diff formats whose text is worth indexing ('chunks' is a binary summary)
+SEARCHABLE_DIFF_FORMATS = ('unified', 'json_pointer', 'summary')
+
+# InnoDB ignores shorter words (innodb_ft_min_token_size)
+MIN_TOKEN_LENGTH = 3
+
+# "quoted phrase" or a bare term
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+# Characters with a meaning in BOOLEAN MODE queries
+_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+_WORD = re.compile(r'^\w+$')
+
+
+class SearchTerm(NamedTuple):
+    """One term of a search query"""
+    text: str
+    phrase: bool  # match the words in sequence
+    prefix: bool  # match words starting with text
+
+
+class SearchService:
+    """Service for change log search"""
+
+    @staticmethod
+    def parse_query(query: str) -> List[SearchTerm]:
+        """
+        Split a search query into terms; all terms must match
+
+        'word' matches a whole word, 'word*' any word starting with it, and
+        '"some phrase"' the words in sequence. Terms with punctuation (e.g.
+        'foo.bar') are matched as phrases.
+        """
+        terms = []
+        for phrase, word in _TERM.findall(query or ''):
+            if phrase:
+                text = _OPERATORS.sub(' ', phrase).strip()
+                if text:
+                    terms.append(SearchTerm(' '.join(text.split()), True, False))
+                continue
+            prefix = word.endswith('*')
+            text = _OPERATORS.sub(' ', word).strip()
+            if not text:
+                continue
+            if _WORD.match(text):
+                terms.append(SearchTerm(text, False, prefix))
+            else:
+                terms.append(SearchTerm(' '.join(text.split()), True, False))
+        return terms
+
+    @staticmethod
+    def to_boolean_mode(terms: List[SearchTerm]) -> str:
+        """MATCH ... AGAINST query requiring every term"""
+        parts = []
+        for term in terms:
+            if term.phrase:
+                parts.append(f'+"{term.text}"')
+            else:
+                parts.append(f"+{term.text}{'*' if term.prefix else ''}")
+        return ' '.join(parts)
+
+    @staticmethod
+    def matching_ids(
+        db: AsyncSession,
+        query: str,
+        watcher_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ):
+        """
+        Subquery of IDs of change logs whose diff matches a search query
+
+        On MariaDB/MySQL terms go through the FULLTEXT index; terms shorter
+        than the index's minimum word length, and every term on other
+        databases, are matched with LIKE on the (already narrowed) text.
+
+        Args:
+            db: Database session (its dialect picks the strategy)
+            query: Search query (see parse_query)
+            watcher_id: Limit to one watcher
+            date_from: Changes detected at or after this time
+            date_to: Changes detected at or before this time
+
+        Returns:
+            Select of change_log_search.change_log_id, for ChangeLog.id.in_()
+        """
+        terms = SearchService.parse_query(query)
+        filters = []
+        if watcher_id:
+            filters.append(ChangeLogSearch.watcher_id == watcher_id)
+        if date_from:
+            filters.append(ChangeLogSearch.detected_at >= date_from)
+        if date_to:
+            filters.append(ChangeLogSearch.detected_at <= date_to)
+
+        fulltext = db.bind.dialect.name in ('mysql', 'mariadb')
+        indexed = [term for term in terms if fulltext and len(term.text) >= MIN_TOKEN_LENGTH]
+        if indexed:
+            filters.append(match(ChangeLogSearch.content, against=SearchService.to_boolean_mode(indexed)).in_boolean_mode())
+        for term in terms:
+            if term not in indexed:
+                filters.append(ChangeLogSearch.content.contains(term.text, autoescape=True))
+
+        return select(ChangeLogSearch.change_log_id).where(and_(*filters))
+
+    @staticmethod
+    def get_text(diff: Optional[bytes], diff_format: Optional[str]) -> Optional[str]:
+        """Searchable text of a diff, or None if it is not indexed"""
+        if not diff or diff_format not in SEARCHABLE_DIFF_FORMATS:
+            return None
+        return diff[:settings.SEARCH_INDEX_MAX_BYTES].decode('utf-8', errors='ignore')
+
+    @staticmethod
+    async def index_change_log(db: AsyncSession, change_log: ChangeLog) -> bool:
+        """
+        Add a change log's diff to the search table (committed with the change log)
+
+        Args:
+            db: Database session
+            change_log: Flushed change log with its diff loaded
+
+        Returns:
+            Whether the change log was indexed
+        """
+        text = SearchService.get_text(change_log.diff, change_log.diff_format)
+        if text is None:
+            return False
+        if 'detected_at' in inspect(change_log).unloaded:
+            # Server default, not loaded back by the flush
+            await db.refresh(change_log, attribute_names=['detected_at'])
+        db.add(ChangeLogSearch(
+            change_log_id=change_log.id,
+            watcher_id=change_log.watcher_id,
+            detected_at=change_log.detected_at,
+            content=text
+        ))
+        return True
+
+    @staticmethod
+    async def backfill(db: AsyncSession, batch_size: int = 500) -> int:
+        """
+        Index change logs written before the search table existed
+
+        Args:
+            db: Database session
+            batch_size: Change logs per transaction
+
+        Returns:
+            Number of change logs indexed
+        """
+        indexed = 0
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(ChangeLog)
+                .options(undefer(ChangeLog.diff))
+                .outerjoin(ChangeLogSearch, ChangeLogSearch.change_log_id == ChangeLog.id)
+                .where(
+                    ChangeLog.id > last_id,
+                    ChangeLogSearch.change_log_id.is_(None),
+                    ChangeLog.diff.isnot(None)
+                )
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                break
+            for change_log in rows:
+                indexed += await SearchService.index_change_log(db, change_log)
+            await db.commit()
+            last_id = rows[-1].id
+            db.expunge_all()
+            logger.info(f"Indexed {indexed} change logs for search so far")
+        return indexed
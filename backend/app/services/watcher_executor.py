@@ -1,15 +1,25 @@
 """Watcher executor service - executes watchers automatically and manually"""
+import asyncio
 import aiohttp
 import json
-from typing import Dict, Any, Optional
+from collections import defaultdict
+from typing import Dict, Any, Optional, Union
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from loguru import logger
+from app.database import AsyncSessionLocal
 from app.models.watcher import Watcher
 from app.models.cookie import Cookie
 from app.services.cookie_service import CookieService
-from app.services.watcher_service import WatcherService
+from app.services.content_store import ContentStore
+from app.core.snapshot_cache import snapshot_cache
+from app.core.response_cache import response_cache, WATCHERS
+from app.core.cpu_pool import cpu_pool
+
+# Runs of one watcher (scheduled and manual) are serialized so that two
+# first checks cannot both create its snapshot
+_watcher_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
 
 
 class WatcherExecutor:
@@ -18,7 +28,7 @@ class WatcherExecutor:
     @staticmethod
     async def execute_watcher(db: AsyncSession, watcher: Watcher) -> Dict[str, Any]:
         """
-        Execute a single watcher
+        Execute a single watcher, after any run of it already in progress
         
         Args:
             db: Database session
@@ -27,6 +37,16 @@ class WatcherExecutor:
         Returns:
             Execution result
         """
+        async with _watcher_locks[watcher.id]:
+            # End the transaction the caller's reads started, so this run
+            # sees what a run it waited for committed (snapshot, counters)
+            await db.commit()
+            await db.refresh(watcher)
+            return await WatcherExecutor._execute_watcher(db, watcher)
+
+    @staticmethod
+    async def _execute_watcher(db: AsyncSession, watcher: Watcher) -> Dict[str, Any]:
+        """Execute a single watcher (see execute_watcher)"""
         try:
             logger.info(f"Executing watcher {watcher.id}: {watcher.name}")
             
@@ -47,21 +67,22 @@ class WatcherExecutor:
                 logger.info(f"Using {len(cookies)} cookies for watcher {watcher.id}")
             
             # Make HTTP request
+            # Binary content types are compared and stored as raw bytes
+            binary = ContentStore.is_binary_content_type(watcher.content_type)
+            # Revalidate against the ETag of the response the snapshot matches
+            snapshot_state = snapshot_cache.get(watcher.id)
+            cached_etag = snapshot_state.etag if snapshot_state else None
             response_body, response_headers, response_cookies, status_code = await WatcherExecutor._make_http_request(
-                request_data, cookies_to_send
+                request_data, cookies_to_send, binary, cached_etag
             )
             
             # Save cookies if configured
             if watcher.save_cookies:
                 await WatcherExecutor._save_cookies(db, watcher.id, response_cookies)
             
-            # Update watcher status
-            await WatcherService.update_status(
-                db, 
-                watcher.id, 
-                "success", 
-                None
-            )
+            # Update watcher status (committed with the check below)
+            watcher.status = "success"
+            watcher.error_message = None
             
             # Update last_checked_at
             watcher.last_checked_at = datetime.now(timezone.utc)
@@ -69,16 +90,32 @@ class WatcherExecutor:
             
             # Create change log
             from app.services.change_log_service import ChangeLogService
-            await ChangeLogService.create_change_log_for_watcher(
-                db, watcher.id, response_body, status_code, watcher.comparison_mode
-            )
+            if status_code == 304 and cached_etag:
+                # Not modified since the snapshot, nothing to compare
+                change_log = None
+            else:
+                change_log = await ChangeLogService.create_change_log_for_watcher(
+                    db, watcher.id, response_body, status_code, watcher.comparison_mode,
+                    ChangeLogService.get_comparison_options(watcher),
+                    watcher.similarity_threshold,
+                    watcher.content_type,
+                    WatcherExecutor._get_header(response_headers, 'ETag')
+                )
+            
+            # Unchanged checks only bump the counters above
+            if change_log is not None:
+                watcher.last_changed_at = change_log.detected_at or datetime.now(timezone.utc)
+                watcher.change_count = (watcher.change_count or 0) + 1
             
             await db.commit()
+            await response_cache.bump(WATCHERS)
             
             result = {
                 'status': 'success',
                 'status_code': status_code,
-                'response_body': response_body,
+                'change_type': change_log.change_type if change_log else 'unchanged',
+                'severity': change_log.severity if change_log else None,
+                'response_body': f"<binary content, {len(response_body)} bytes>" if binary else response_body,
                 'response_headers': response_headers,
                 'cookies_saved': len(response_cookies) if watcher.save_cookies else 0,
                 'cookies_used': len(cookies_to_send)
@@ -91,14 +128,11 @@ class WatcherExecutor:
             logger.error(f"Error executing watcher {watcher.id}: {e}")
             
             # Update watcher status with error
-            await WatcherService.update_status(
-                db, 
-                watcher.id, 
-                "error", 
-                str(e)
-            )
+            watcher.status = "error"
+            watcher.error_message = str(e)
             
             await db.commit()
+            await response_cache.bump(WATCHERS)
             
             return {
                 'status': 'error',
@@ -108,14 +142,18 @@ class WatcherExecutor:
     @staticmethod
     async def _make_http_request(
         request_data: Dict[str, Any],
-        cookies: Optional[Dict[str, str]] = None
-    ) -> tuple[str, Dict[str, str], Dict[str, str], int]:
+        cookies: Optional[Dict[str, str]] = None,
+        binary: bool = False,
+        etag: Optional[str] = None
+    ) -> tuple[Union[str, bytes], Dict[str, str], Dict[str, str], int]:
         """
         Make HTTP request
         
         Args:
             request_data: Request configuration
             cookies: Cookies to send
+            binary: Return the body as bytes instead of decoded text
+            etag: Send as If-None-Match on GET requests (a 304 has no body)
             
         Returns:
             Tuple of (response_body, response_headers, cookies, status_code)
@@ -124,6 +162,8 @@ class WatcherExecutor:
         method = request_data.get('method', 'GET').upper()
         headers = request_data.get('headers', {})
         body = request_data.get('body')
+        if etag and method == 'GET' and WatcherExecutor._get_header(headers, 'If-None-Match') is None:
+            headers = {**headers, 'If-None-Match': etag}
 
         connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
         timeout = aiohttp.ClientTimeout(total=30, connect=10, sock_read=10)
@@ -157,7 +197,7 @@ class WatcherExecutor:
                     request_kwargs['data'] = body
 
             async with session.request(**request_kwargs) as response:
-                response_body = await response.text()
+                response_body = await response.read() if binary else await response.text()
                 response_headers = dict(response.headers)
 
                 # Extract cookies
@@ -167,6 +207,12 @@ class WatcherExecutor:
 
                 return response_body, response_headers, cookies_dict, response.status
 
+    @staticmethod
+    def _get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+        """Case-insensitive header lookup"""
+        name = name.lower()
+        return next((value for key, value in headers.items() if key.lower() == name), None)
+
     @staticmethod
     async def _save_cookies(db: AsyncSession, watcher_id: int, cookies: Dict[str, str]):
         """Save cookies from response"""
@@ -230,8 +276,23 @@ class WatcherExecutor:
             
             logger.info(f"Found {len(due_watchers)} watchers due for execution")
             
-            for watcher in due_watchers:
-                await WatcherExecutor.execute_watcher(db, watcher)
+            # Run due watchers concurrently, as many at a time as the CPU pool
+            # has workers, so change detection is spread across cores. Each
+            # task has its own session: an AsyncSession cannot be shared.
+            semaphore = asyncio.Semaphore(cpu_pool.max_workers)
+
+            async def run(watcher_id: int):
+                async with semaphore:
+                    async with AsyncSessionLocal() as task_db:
+                        watcher = await task_db.get(Watcher, watcher_id)
+                        if watcher is not None:
+                            await WatcherExecutor.execute_watcher(task_db, watcher)
+
+            watcher_ids = [watcher.id for watcher in due_watchers]
+            results = await asyncio.gather(*(run(watcher_id) for watcher_id in watcher_ids), return_exceptions=True)
+            for watcher_id, result in zip(watcher_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error executing watcher {watcher_id}: {result}")
                 
         except Exception as e:
             logger.error(f"Error executing scheduled watchers: {e}")
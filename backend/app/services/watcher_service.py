@@ -1,9 +1,24 @@
 """Watcher service - business logic for watchers"""
-from typing import List, Optional
-from sqlalchemy import select, func
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select, update, insert, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.watcher import Watcher
-from app.schemas.watcher import WatcherCreate, WatcherUpdate, WatcherStatistics
+from app.models.snapshot import Snapshot
+from app.schemas.watcher import WatcherCreate, WatcherUpdate, WatcherStatistics, WatcherImportError
+from app.services.content_store import ContentStore
+from app.core.snapshot_cache import snapshot_cache
+from app.core.response_cache import response_cache, WATCHERS, CHANGE_LOGS
+from app.utils.html_scope import compile_selector
+from app.utils.pagination import paginate
+
+# Fields that change the request a watcher sends
+REQUEST_FIELDS = {'url', 'method', 'headers', 'body'}
+
+# Watcher fields shown in change log lists and statistics (cached under CHANGE_LOGS)
+CHANGE_LOG_FIELDS = {'name', 'url', 'execution_mode'}
 
 
 class WatcherService:
@@ -15,9 +30,108 @@ class WatcherService:
         watcher = Watcher(**watcher_data.model_dump())
         db.add(watcher)
         await db.commit()
+        await response_cache.bump(WATCHERS)
         await db.refresh(watcher)
         return watcher
 
+    @staticmethod
+    def parse_import(data: str) -> Tuple[List[WatcherCreate], List[WatcherImportError]]:
+        """
+        Parse and validate watchers from a JSON array or NDJSON (one object per line)
+
+        Args:
+            data: Import document
+
+        Returns:
+            Tuple of (valid watchers, errors of invalid records)
+        """
+        text = data.strip()
+        if text.startswith('['):
+            try:
+                records = list(enumerate(json.loads(text), start=1))
+            except json.JSONDecodeError as e:
+                return [], [WatcherImportError(index=0, error=f"Invalid JSON: {e}")]
+        else:
+            records = []
+            errors = []
+            for line_number, line in enumerate(text.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append((line_number, json.loads(line)))
+                except json.JSONDecodeError as e:
+                    errors.append(WatcherImportError(index=line_number, error=f"Invalid JSON: {e}"))
+            if errors:
+                return [], errors
+
+        watchers = []
+        errors = []
+        for index, record in records:
+            try:
+                watchers.append(WatcherCreate.model_validate(record))
+            except ValidationError as e:
+                details = "; ".join(
+                    f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in e.errors()
+                )
+                errors.append(WatcherImportError(index=index, error=details))
+        return watchers, errors
+
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        watchers: List[WatcherCreate],
+        skip_existing: bool = False,
+        batch_size: int = 500
+    ) -> Tuple[int, int]:
+        """
+        Insert watchers with one multi-row INSERT and commit per batch
+
+        Args:
+            db: Database session
+            watchers: Validated watchers
+            skip_existing: Leave out watchers whose (url, method) is already watched
+            batch_size: Watchers per INSERT and transaction
+
+        Returns:
+            Tuple of (created, skipped)
+        """
+        created = 0
+        skipped = 0
+        for start in range(0, len(watchers), max(batch_size, 1)):
+            rows = [watcher.model_dump() for watcher in watchers[start:start + batch_size]]
+            if skip_existing:
+                keys = {(row['url'], row['method']) for row in rows}
+                result = await db.execute(
+                    select(Watcher.url, Watcher.method).where(tuple_(Watcher.url, Watcher.method).in_(list(keys)))
+                )
+                existing = set(result.all())
+                kept = []
+                for row in rows:
+                    key = (row['url'], row['method'])
+                    if key not in existing:
+                        existing.add(key)  # also drops duplicates within the import
+                        kept.append(row)
+                skipped += len(rows) - len(kept)
+                rows = kept
+            if rows:
+                await db.execute(insert(Watcher).values(rows))
+                await db.commit()
+                created += len(rows)
+        if created:
+            await response_cache.bump(WATCHERS)
+        return created, skipped
+
+    @staticmethod
+    async def export_watchers(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the configuration of every watcher, in the import format, oldest first"""
+        fields = list(WatcherCreate.model_fields)
+        result = await db.stream(
+            select(*(getattr(Watcher, field) for field in fields)).order_by(Watcher.id),
+            execution_options={'yield_per': batch_size}
+        )
+        async for row in result:
+            yield dict(zip(fields, row))
+
     @staticmethod
     async def get_watcher(db: AsyncSession, watcher_id: int) -> Optional[Watcher]:
         """Get watcher by ID"""
@@ -32,9 +146,10 @@ class WatcherService:
         is_active: Optional[bool] = None,
         execution_mode: Optional[str] = None,
         content_type: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Watcher]:
-        """Get list of watchers with optional filters"""
+        """Get list of watchers with optional filters, newest first (cursor replaces skip)"""
         query = select(Watcher)
 
         if is_active is not None:
@@ -49,7 +164,7 @@ class WatcherService:
                 (Watcher.url.ilike(f"%{search}%"))
             )
 
-        query = query.offset(skip).limit(limit).order_by(Watcher.created_at.desc())
+        query = paginate(query, Watcher.created_at, Watcher.id, 'created_at', True, cursor, skip, limit)
         result = await db.execute(query)
         return list(result.scalars().all())
 
@@ -76,16 +191,35 @@ class WatcherService:
         watcher_id: int,
         watcher_data: WatcherUpdate
     ) -> Optional[Watcher]:
-        """Update watcher"""
+        """
+        Update watcher
+
+        Raises:
+            ValueError: If the resulting selector is invalid for its type
+        """
         watcher = await WatcherService.get_watcher(db, watcher_id)
         if not watcher:
             return None
 
         update_data = watcher_data.model_dump(exclude_unset=True)
+        if update_data.keys() & {'selector', 'selector_type'}:
+            selector = update_data.get('selector', watcher.selector)
+            if selector:
+                compile_selector(selector, update_data.get('selector_type') or watcher.selector_type or 'css')
         for field, value in update_data.items():
             setattr(watcher, field, value)
 
+        # The stored ETag belongs to the old request
+        if update_data.keys() & REQUEST_FIELDS:
+            await db.execute(update(Snapshot).where(Snapshot.watcher_id == watcher_id).values(etag=None))
+
         await db.commit()
+        if update_data.keys() & CHANGE_LOG_FIELDS:
+            await response_cache.bump(WATCHERS, CHANGE_LOGS)
+        else:
+            await response_cache.bump(WATCHERS)
+        if update_data.keys() & REQUEST_FIELDS:
+            snapshot_cache.invalidate(watcher_id)
         await db.refresh(watcher)
         return watcher
 
@@ -96,8 +230,12 @@ class WatcherService:
         if not watcher:
             return False
 
+        # Chunk references held by the watcher's snapshots and change logs
+        await ContentStore.release_watcher(db, watcher_id)
         await db.delete(watcher)
         await db.commit()
+        snapshot_cache.invalidate(watcher_id)
+        await response_cache.bump(WATCHERS, CHANGE_LOGS)
         return True
 
     @staticmethod
@@ -115,6 +253,7 @@ class WatcherService:
         watcher.status = status
         watcher.error_message = error_message
         await db.commit()
+        await response_cache.bump(WATCHERS)
         await db.refresh(watcher)
         return watcher
 
@@ -125,6 +264,7 @@ class WatcherService:
         if watcher:
             watcher.check_count += 1
             await db.commit()
+            await response_cache.bump(WATCHERS)
 
     @staticmethod
     async def increment_change_count(db: AsyncSession, watcher_id: int) -> None:
@@ -133,59 +273,52 @@ class WatcherService:
         if watcher:
             watcher.change_count += 1
             await db.commit()
+            await response_cache.bump(WATCHERS)
 
     @staticmethod
     async def get_statistics(db: AsyncSession) -> WatcherStatistics:
         """Get watcher statistics"""
-        # Total watchers
-        total_result = await db.execute(select(func.count(Watcher.id)))
-        total_watchers = total_result.scalar() or 0
-
-        # Active watchers
-        active_result = await db.execute(
-            select(func.count(Watcher.id)).where(Watcher.is_active == True)
+        # One grouped scan; every figure is a sum over the groups
+        result = await db.execute(
+            select(
+                Watcher.execution_mode,
+                Watcher.status,
+                Watcher.content_type,
+                Watcher.is_active,
+                func.count(Watcher.id).label('count'),
+                func.sum(Watcher.check_count).label('checks'),
+                func.sum(Watcher.change_count).label('changes')
+            ).group_by(Watcher.execution_mode, Watcher.status, Watcher.content_type, Watcher.is_active)
         )
-        active_watchers = active_result.scalar() or 0
+
+        total_watchers = 0
+        active_watchers = 0
+        total_checks = 0
+        total_changes = 0
+        by_execution_mode = defaultdict(int)
+        by_status = defaultdict(int)
+        by_content_type = defaultdict(int)
+        for row in result.all():
+            total_watchers += row.count
+            if row.is_active:
+                active_watchers += row.count
+            total_checks += int(row.checks or 0)
+            total_changes += int(row.changes or 0)
+            by_execution_mode[row.execution_mode] += row.count
+            by_status[row.status] += row.count
+            by_content_type[row.content_type] += row.count
 
         # Inactive watchers
         inactive_watchers = total_watchers - active_watchers
 
-        # Total checks and changes
-        checks_result = await db.execute(select(func.sum(Watcher.check_count)))
-        total_checks = checks_result.scalar() or 0
-
-        changes_result = await db.execute(select(func.sum(Watcher.change_count)))
-        total_changes = changes_result.scalar() or 0
-
-        # By execution mode
-        execution_mode_result = await db.execute(
-            select(Watcher.execution_mode, func.count(Watcher.id))
-            .group_by(Watcher.execution_mode)
-        )
-        by_execution_mode = {mode: count for mode, count in execution_mode_result.all()}
-
-        # By status
-        status_result = await db.execute(
-            select(Watcher.status, func.count(Watcher.id))
-            .group_by(Watcher.status)
-        )
-        by_status = {status: count for status, count in status_result.all()}
-
-        # By content type
-        content_type_result = await db.execute(
-            select(Watcher.content_type, func.count(Watcher.id))
-            .group_by(Watcher.content_type)
-        )
-        by_content_type = {content_type: count for content_type, count in content_type_result.all()}
-
         return WatcherStatistics(
             total_watchers=total_watchers,
             active_watchers=active_watchers,
             inactive_watchers=inactive_watchers,
             total_checks=total_checks,
             total_changes=total_changes,
-            by_execution_mode=by_execution_mode,
-            by_status=by_status,
-            by_content_type=by_content_type
+            by_execution_mode=dict(by_execution_mode),
+            by_status=dict(by_status),
+            by_content_type=dict(by_content_type)
         )
 
@@ -0,0 +1,106 @@
+"""Content-defined chunking for binary payloads
+
+Splits bytes at boundaries chosen by a Gear rolling hash, so an insertion or
+deletion only changes the chunks around it and the rest of the file maps to
+the same chunks as before. Chunks are identified by their SHA256.
+"""
+import hashlib
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+MIN_CHUNK_SIZE = 2 * 1024
+AVG_CHUNK_BITS = 13  # average chunk ~8 KiB past the minimum
+MAX_CHUNK_SIZE = 64 * 1024
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+# Boundary test on the high bits: they depend on the last ~64 bytes
+_BOUNDARY_MASK = ((1 << AVG_CHUNK_BITS) - 1) << (64 - AVG_CHUNK_BITS)
+_GEAR = tuple(
+    int.from_bytes(hashlib.blake2b(bytes([value]), digest_size=8).digest(), 'big')
+    for value in range(256)
+)
+
+
+def cut_points(data: bytes) -> List[int]:
+    """
+    Find chunk end offsets
+
+    Args:
+        data: Payload bytes
+
+    Returns:
+        Ascending end offsets; the last one is len(data)
+    """
+    gear = _GEAR
+    mask = _BOUNDARY_MASK
+    size = len(data)
+    cuts = []
+    start = 0
+    while start < size:
+        end = min(start + MAX_CHUNK_SIZE, size)
+        position = start + MIN_CHUNK_SIZE
+        cut = end
+        if position < end:
+            value = 0
+            for byte in data[position:end]:
+                value = ((value << 1) + gear[byte]) & _MASK64
+                position += 1
+                if not value & mask:
+                    cut = position
+                    break
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def chunk(data: bytes) -> List[List[Any]]:
+    """
+    Chunk a payload into a manifest
+
+    Args:
+        data: Payload bytes
+
+    Returns:
+        Manifest: list of [sha256 hex, size] in payload order
+    """
+    manifest = []
+    start = 0
+    for end in cut_points(data):
+        manifest.append([hashlib.sha256(data[start:end]).hexdigest(), end - start])
+        start = end
+    return manifest
+
+
+def summarize(old_manifest: Sequence[Sequence[Any]], new_manifest: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Describe a change between two manifests as chunks added and removed
+
+    Args:
+        old_manifest: Previous manifest
+        new_manifest: New manifest
+
+    Returns:
+        Dict with chunk counts and byte totals, plus 'similarity' (share of
+        bytes kept, 1.0 = identical)
+    """
+    sizes = {chunk_hash: size for chunk_hash, size in list(old_manifest) + list(new_manifest)}
+    old_counts = Counter(chunk_hash for chunk_hash, _ in old_manifest)
+    new_counts = Counter(chunk_hash for chunk_hash, _ in new_manifest)
+    added = new_counts - old_counts
+    removed = old_counts - new_counts
+    kept = old_counts & new_counts
+
+    kept_bytes = sum(sizes[h] * n for h, n in kept.items())
+    old_bytes = sum(size for _, size in old_manifest)
+    new_bytes = sum(size for _, size in new_manifest)
+    largest = max(old_bytes, new_bytes)
+
+    return {
+        'chunks_added': sum(added.values()),
+        'chunks_removed': sum(removed.values()),
+        'chunks_unchanged': sum(kept.values()),
+        'bytes_added': sum(sizes[h] * n for h, n in added.items()),
+        'bytes_removed': sum(sizes[h] * n for h, n in removed.items()),
+        'bytes_unchanged': kept_bytes,
+        'similarity': kept_bytes / largest if largest else 1.0,
+    }
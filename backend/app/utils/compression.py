@@ -0,0 +1,126 @@
+"""Content compression - zlib, or zstd with optional trained dictionaries
+
+zstd requires the optional zstandard package; without it the zstd codec
+falls back to zlib. Every stored payload carries the tag of the codec that
+actually produced it, so data written under another setting stays readable.
+"""
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from loguru import logger
+
+CODEC_NONE = 'none'
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+@lru_cache(maxsize=None)
+def resolve_codec(codec: Optional[str]) -> str:
+    """
+    Validate a configured codec once per value
+
+    Args:
+        codec: 'zstd', 'zlib' or 'none'
+
+    Returns:
+        Usable codec name
+    """
+    codec = (codec or CODEC_NONE).lower()
+    if codec == CODEC_ZSTD:
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("CONTENT_CODEC=zstd but zstandard is not installed, using zlib")
+            return CODEC_ZLIB
+        return CODEC_ZSTD
+    if codec in (CODEC_ZLIB, CODEC_NONE):
+        return codec
+    logger.warning(f"Unknown CONTENT_CODEC '{codec}', using zlib")
+    return CODEC_ZLIB
+
+
+@lru_cache(maxsize=64)
+def _zstd_dictionary(dictionary: bytes):
+    import zstandard
+    return zstandard.ZstdCompressionDict(dictionary)
+
+
+def compress(data: bytes, codec: str, dictionary: Optional[bytes] = None) -> Tuple[str, bytes]:
+    """
+    Compress data
+
+    Args:
+        data: Raw bytes
+        codec: Codec from resolve_codec()
+        dictionary: Trained zstd dictionary (ignored by other codecs)
+
+    Returns:
+        Tuple of (codec tag, stored bytes); data that does not shrink is
+        returned as-is with the 'none' tag
+    """
+    if codec == CODEC_ZSTD:
+        import zstandard
+        dict_data = _zstd_dictionary(dictionary) if dictionary else None
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(data)
+    elif codec == CODEC_ZLIB:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+    else:
+        return CODEC_NONE, data
+
+    if len(compressed) >= len(data):
+        return CODEC_NONE, data
+    return codec, compressed
+
+
+def decompress(data: bytes, codec: Optional[str], dictionary: Optional[bytes] = None) -> bytes:
+    """
+    Decompress stored bytes
+
+    Args:
+        data: Stored bytes
+        codec: Codec tag stored with the data (None = uncompressed)
+        dictionary: zstd dictionary the data was compressed with
+
+    Returns:
+        Raw bytes
+
+    Raises:
+        ValueError: If the codec is unknown or unavailable
+    """
+    if not codec or codec == CODEC_NONE:
+        return data
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_ZSTD:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ValueError("Content is zstd-compressed but zstandard is not installed") from e
+        dict_data = _zstd_dictionary(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    raise ValueError(f"Unknown content codec '{codec}'")
+
+
+def train_dictionary(samples: List[bytes], size: int) -> Optional[bytes]:
+    """
+    Train a zstd dictionary from sample payloads
+
+    Args:
+        samples: Recent payloads of one watcher
+        size: Target dictionary size in bytes
+
+    Returns:
+        Dictionary bytes, or None if zstd is unavailable or there is too
+        little sample data to train on
+    """
+    if resolve_codec(CODEC_ZSTD) != CODEC_ZSTD or not samples:
+        return None
+    import zstandard
+    try:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+    except zstandard.ZstdError as e:
+        logger.debug(f"zstd dictionary training failed: {e}")
+        return None
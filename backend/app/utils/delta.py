@@ -0,0 +1,118 @@
+"""Binary deltas - a document as copies from a base document plus literal inserts
+
+Lines are matched with the diff engine in app.utils.diff; matched runs become
+COPY (offset, length) instructions against the base and everything else is
+inserted literally. Used to store older versions as reverse deltas against
+their successor.
+
+Format: MAGIC, varint target length, then instructions:
+    0x01 varint offset, varint length   copy from base
+    0x02 varint length, bytes           insert literal
+"""
+import time
+from typing import List, Optional, Tuple
+from app.utils.diff import DiffBudgetExceeded, intern_lines, matching_blocks
+
+MAGIC = b'VD1'
+_COPY = 0x01
+_INSERT = 0x02
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode(base: bytes, target: bytes, time_budget: Optional[float] = None) -> Optional[bytes]:
+    """
+    Encode target as a delta against base
+
+    Args:
+        base: Document the delta is applied to
+        target: Document the delta reproduces
+        time_budget: Give up after this many seconds (None = no limit)
+
+    Returns:
+        Delta bytes, or None if the time budget ran out
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    a, b = intern_lines(base_lines, target_lines)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    try:
+        blocks = matching_blocks(a, b, deadline)
+    except DiffBudgetExceeded:
+        return None
+
+    offsets: List[int] = [0]
+    for line in base_lines:
+        offsets.append(offsets[-1] + len(line))
+
+    out = bytearray(MAGIC)
+    out += _varint(len(target))
+    position = 0
+    for i, j, size in blocks:
+        if j > position:
+            literal = b''.join(target_lines[position:j])
+            out.append(_INSERT)
+            out += _varint(len(literal))
+            out += literal
+        if size:
+            out.append(_COPY)
+            out += _varint(offsets[i])
+            out += _varint(offsets[i + size] - offsets[i])
+        position = j + size
+    return bytes(out)
+
+
+def apply(base: bytes, delta: bytes) -> bytes:
+    """
+    Rebuild a document from its base and delta
+
+    Raises:
+        ValueError: If the delta is malformed or does not fit the base
+    """
+    if not delta.startswith(MAGIC):
+        raise ValueError("Not a delta")
+    length, pos = _read_varint(delta, len(MAGIC))
+    parts = []
+    try:
+        while pos < len(delta):
+            op = delta[pos]
+            pos += 1
+            if op == _COPY:
+                offset, pos = _read_varint(delta, pos)
+                size, pos = _read_varint(delta, pos)
+                parts.append(base[offset:offset + size])
+            elif op == _INSERT:
+                size, pos = _read_varint(delta, pos)
+                parts.append(delta[pos:pos + size])
+                pos += size
+            else:
+                raise ValueError(f"Unknown delta instruction {op}")
+    except IndexError as e:
+        raise ValueError("Truncated delta") from e
+
+    result = b''.join(parts)
+    if len(result) != length:
+        raise ValueError(f"Delta produced {len(result)} bytes, expected {length}")
+    return result
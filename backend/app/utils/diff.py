@@ -0,0 +1,396 @@
+"""Diff engine - line-interned patience/Myers diff with size and time caps
+
+Produces unified diff text in the same format as difflib.unified_diff, but
+compares lines as interned integers. Lines unique to both sides are used as
+patience anchors to split large inputs; the gaps between anchors are diffed
+with the linear-space (middle snake) variant of Myers' O(ND) algorithm.
+Inputs above a size cap, or diffs that exceed a CPU time budget, fall back
+to a short summary instead of stalling the caller.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# (tag, i1, i2, j1, j2) - same shape as difflib.SequenceMatcher opcodes
+Opcode = Tuple[str, int, int, int, int]
+
+# First line of summary-only results
+SUMMARY_PREFIX = "[Diff skipped"
+
+
+class DiffBudgetExceeded(Exception):
+    """Raised when a diff runs past its time budget"""
+    pass
+
+
+def intern_lines(old_lines: Sequence[str], new_lines: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """
+    Map lines to integer ids so comparisons are int == int
+
+    Args:
+        old_lines: Lines of the old document
+        new_lines: Lines of the new document
+
+    Returns:
+        Tuple of (old ids, new ids)
+    """
+    table: Dict[str, int] = {}
+    old_ids = [table.setdefault(line, len(table)) for line in old_lines]
+    new_ids = [table.setdefault(line, len(table)) for line in new_lines]
+    return old_ids, new_ids
+
+
+def _middle_snake(
+    a: List[int], alo: int, ahi: int,
+    b: List[int], blo: int, bhi: int,
+    deadline: Optional[float]
+) -> Tuple[int, int, int, int, int]:
+    """
+    Find the middle snake of the shortest edit script
+
+    Returns:
+        Tuple of (edit distance, x start, y start, x end, y end), with
+        coordinates relative to (alo, blo)
+    """
+    n = ahi - alo
+    m = bhi - blo
+    delta = n - m
+    odd = delta & 1
+    vmax = (n + m + 1) // 2 + 1
+    offset = vmax
+    vf = [0] * (2 * vmax + 2)
+    vb = [0] * (2 * vmax + 2)
+
+    for d in range(vmax):
+        if deadline is not None and time.monotonic() > deadline:
+            raise DiffBudgetExceeded()
+
+        # Forward pass
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[offset + k - 1] < vf[offset + k + 1]):
+                x = vf[offset + k + 1]
+            else:
+                x = vf[offset + k - 1] + 1
+            y = x - k
+            xs, ys = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            vf[offset + k] = x
+            if odd:
+                c = delta - k
+                if -(d - 1) <= c <= d - 1 and x + vb[offset + c] >= n:
+                    return 2 * d - 1, xs, ys, x, y
+
+        # Backward pass (u, v count from the end)
+        for c in range(-d, d + 1, 2):
+            if c == -d or (c != d and vb[offset + c - 1] < vb[offset + c + 1]):
+                u = vb[offset + c + 1]
+            else:
+                u = vb[offset + c - 1] + 1
+            v = u - c
+            us, vs = u, v
+            while u < n and v < m and a[ahi - 1 - u] == b[bhi - 1 - v]:
+                u += 1
+                v += 1
+            vb[offset + c] = u
+            if not odd:
+                k = delta - c
+                if -d <= k <= d and u + vf[offset + k] >= n:
+                    return 2 * d, n - u, m - v, n - us, m - vs
+
+    # Unreachable: the paths always meet within vmax rounds
+    raise RuntimeError("middle snake not found")
+
+
+def _unique_anchors(
+    a: List[int], alo: int, ahi: int,
+    b: List[int], blo: int, bhi: int
+) -> List[Tuple[int, int]]:
+    """
+    Patience step: longest increasing run of lines unique to both ranges
+
+    Returns:
+        List of (i, j) anchor pairs in ascending order
+    """
+    a_pos: Dict[int, int] = {}
+    for i in range(alo, ahi):
+        a_pos[a[i]] = -1 if a[i] in a_pos else i
+    b_pos: Dict[int, int] = {}
+    for j in range(blo, bhi):
+        b_pos[b[j]] = -1 if b[j] in b_pos else j
+
+    pairs = [
+        (i, b_pos[value]) for value, i in a_pos.items()
+        if i >= 0 and b_pos.get(value, -1) >= 0
+    ]
+    if not pairs:
+        return []
+    pairs.sort()
+
+    # Longest increasing subsequence on j (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous: List[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos else -1
+
+    anchors = []
+    index = tail_index[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def matching_blocks(a: List[int], b: List[int], deadline: Optional[float] = None) -> List[Tuple[int, int, int]]:
+    """
+    Compute matching blocks between two sequences
+
+    Args:
+        a: Old sequence (interned)
+        b: New sequence (interned)
+        deadline: time.monotonic() value after which DiffBudgetExceeded is raised
+
+    Returns:
+        List of (i, j, size) triples in ascending order, terminated by
+        (len(a), len(b), 0) like difflib.SequenceMatcher.get_matching_blocks()
+    """
+    blocks: List[Tuple[int, int, int]] = []
+
+    def add(i: int, j: int, size: int):
+        if size <= 0:
+            return
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            pi, pj, psize = blocks[-1]
+            blocks[-1] = (pi, pj, psize + size)
+        else:
+            blocks.append((i, j, size))
+
+    # Explicit stack instead of recursion; entries are sub-problems or
+    # pending matches, processed in left-to-right order
+    stack: List[tuple] = [('diff', 0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if item[0] == 'match':
+            add(item[1], item[2], item[3])
+            continue
+
+        _, alo, ahi, blo, bhi = item
+        if deadline is not None and time.monotonic() > deadline:
+            raise DiffBudgetExceeded()
+
+        # Strip common prefix and suffix
+        prefix = 0
+        while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+            prefix += 1
+        add(alo, blo, prefix)
+        alo += prefix
+        blo += prefix
+
+        suffix = 0
+        while alo < ahi - suffix and blo < bhi - suffix and a[ahi - 1 - suffix] == b[bhi - 1 - suffix]:
+            suffix += 1
+        ahi -= suffix
+        bhi -= suffix
+
+        pending = [('match', ahi, bhi, suffix)]
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi) if alo < ahi and blo < bhi else []
+        if anchors:
+            # Split at the anchors; each gap becomes its own sub-problem
+            next_i, next_j = ahi, bhi
+            for i, j in reversed(anchors):
+                pending.append(('diff', i + 1, next_i, j + 1, next_j))
+                pending.append(('match', i, j, 1))
+                next_i, next_j = i, j
+            pending.append(('diff', alo, next_i, blo, next_j))
+        elif alo < ahi and blo < bhi and not set(a[alo:ahi]).isdisjoint(b[blo:bhi]):
+            d, xs, ys, xe, ye = _middle_snake(a, alo, ahi, b, blo, bhi, deadline)
+            if d > 1:
+                pending.append(('diff', alo + xe, ahi, blo + ye, bhi))
+                pending.append(('match', alo + xs, blo + ys, xe - xs))
+                pending.append(('diff', alo, alo + xs, blo, blo + ys))
+            # d <= 1 with both sides non-empty cannot occur once the common
+            # prefix and suffix are stripped; nothing left to match
+        stack.extend(pending)
+
+    blocks.append((len(a), len(b), 0))
+    return blocks
+
+
+def get_opcodes(blocks: List[Tuple[int, int, int]]) -> List[Opcode]:
+    """Convert matching blocks to difflib-style opcodes"""
+    i = j = 0
+    opcodes: List[Opcode] = []
+    for ai, bj, size in blocks:
+        tag = ''
+        if i < ai and j < bj:
+            tag = 'replace'
+        elif i < ai:
+            tag = 'delete'
+        elif j < bj:
+            tag = 'insert'
+        if tag:
+            opcodes.append((tag, i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(('equal', ai, i, bj, j))
+    return opcodes
+
+
+def group_opcodes(opcodes: List[Opcode], n: int = 3) -> Iterator[List[Opcode]]:
+    """Group opcodes into hunks with n lines of context (as difflib)"""
+    codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    nn = n + n
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Convert a range to the unified diff 'start,length' format"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    fromfile: str = 'old',
+    tofile: str = 'new',
+    n: int = 3,
+    lineterm: str = '\n',
+    deadline: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Generate a unified diff, output-compatible with difflib.unified_diff
+
+    Args:
+        old_lines: Lines of the old document
+        new_lines: Lines of the new document
+        fromfile: Old file label
+        tofile: New file label
+        n: Context lines
+        lineterm: Terminator for control lines
+        deadline: time.monotonic() value after which DiffBudgetExceeded is raised
+
+    Returns:
+        Iterator of diff lines
+    """
+    a, b = intern_lines(old_lines, new_lines)
+    opcodes = get_opcodes(matching_blocks(a, b, deadline))
+
+    started = False
+    for group in group_opcodes(opcodes, n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}{lineterm}"
+            yield f"+++ {tofile}{lineterm}"
+
+        first, last = group[0], group[-1]
+        file1_range = _format_range(first[1], last[2])
+        file2_range = _format_range(first[3], last[4])
+        yield f"@@ -{file1_range} +{file2_range} @@{lineterm}"
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in old_lines[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in ('replace', 'delete'):
+                for line in old_lines[i1:i2]:
+                    yield '-' + line
+            if tag in ('replace', 'insert'):
+                for line in new_lines[j1:j2]:
+                    yield '+' + line
+
+
+def summarize(old_size: int, new_size: int, reason: str) -> str:
+    """
+    Build the summary-only result used when a full diff is not produced
+
+    Args:
+        old_size: Old content size in bytes
+        new_size: New content size in bytes
+        reason: Why the diff was skipped
+
+    Returns:
+        Summary text
+    """
+    return (
+        f"{SUMMARY_PREFIX}: {reason}]\n"
+        f"Old size: {old_size} bytes\n"
+        f"New size: {new_size} bytes\n"
+        f"Size change: {new_size - old_size:+d} bytes"
+    )
+
+
+def diff_text(
+    old_text: str,
+    new_text: str,
+    max_input_bytes: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    old_size: Optional[int] = None,
+    new_size: Optional[int] = None
+) -> Optional[str]:
+    """
+    Diff two documents within size and time caps
+
+    Args:
+        old_text: Old document
+        new_text: New document
+        max_input_bytes: Largest combined input diffed line by line (None = no cap)
+        time_budget: CPU time budget in seconds (None = no budget)
+        old_size: Old size in bytes, if already known
+        new_size: New size in bytes, if already known
+
+    Returns:
+        Unified diff text, a summary if a cap was hit, or None if identical
+    """
+    old_size = len(old_text.encode('utf-8')) if old_size is None else old_size
+    new_size = len(new_text.encode('utf-8')) if new_size is None else new_size
+
+    if max_input_bytes and old_size + new_size > max_input_bytes:
+        return summarize(old_size, new_size, f"content too large (limit {max_input_bytes} bytes)")
+
+    deadline = time.monotonic() + time_budget if time_budget else None
+    try:
+        lines = list(unified_diff(
+            old_text.splitlines(keepends=True),
+            new_text.splitlines(keepends=True),
+            fromfile='old',
+            tofile='new',
+            lineterm='',
+            deadline=deadline
+        ))
+    except DiffBudgetExceeded:
+        return summarize(old_size, new_size, f"diff exceeded time budget ({time_budget}s)")
+
+    return '\n'.join(lines) if lines else None
@@ -0,0 +1,100 @@
+"""HTML region scoping - restrict comparison to a CSS/XPath-selected part of a page
+
+Requires the optional lxml and cssselect packages. Compiled selectors are
+cached, so each watcher's selector is compiled once per process.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector: str, selector_type: str = 'css'):
+    """
+    Compile a CSS or XPath selector
+
+    Args:
+        selector: CSS selector or XPath expression
+        selector_type: 'css' or 'xpath'
+
+    Returns:
+        Compiled lxml XPath object
+
+    Raises:
+        ValueError: If the selector is invalid
+    """
+    from lxml import etree
+
+    try:
+        if selector_type == 'xpath':
+            return etree.XPath(selector)
+        from cssselect import GenericTranslator, SelectorError
+        try:
+            return etree.XPath(GenericTranslator().css_to_xpath(selector))
+        except SelectorError as e:
+            raise ValueError(f"Invalid CSS selector '{selector}': {e}") from e
+    except etree.XPathError as e:
+        raise ValueError(f"Invalid {selector_type} selector '{selector}': {e}") from e
+
+
+def extract_region(
+    content: bytes,
+    selector: str,
+    selector_type: str = 'css',
+    extract_text: bool = False
+) -> bytes:
+    """
+    Extract the selected region(s) of an HTML document
+
+    Args:
+        content: HTML bytes
+        selector: CSS selector or XPath expression
+        selector_type: 'css' or 'xpath'
+        extract_text: Keep only the text of the matched elements
+
+    Returns:
+        Matched elements (HTML, or text if extract_text), one per line;
+        empty bytes if nothing matched
+    """
+    from lxml import etree, html
+
+    compiled = compile_selector(selector, selector_type)
+    if not content.strip():
+        return b''
+    try:
+        document = html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return b''
+
+    parts = []
+    for match in compiled(document):
+        if isinstance(match, str):
+            # XPath text()/attribute results
+            parts.append(re.sub(r'\s+', ' ', match).strip() if extract_text else str(match))
+        elif extract_text:
+            parts.append(re.sub(r'\s+', ' ', match.text_content()).strip())
+        else:
+            parts.append(etree.tostring(match, encoding='unicode', method='html', with_tail=False))
+
+    return '\n'.join(parts).encode('utf-8')
+
+
+def scope_content(content: bytes, options: Optional[dict]) -> bytes:
+    """
+    Apply a watcher's selector options to content, if any
+
+    Args:
+        content: Raw content bytes
+        options: Comparison options (see ChangeLogService.get_comparison_options)
+
+    Returns:
+        Scoped content, or the content unchanged without a selector
+    """
+    if not options or not options.get('selector'):
+        return content
+    return extract_region(
+        content,
+        options['selector'],
+        options.get('selector_type') or 'css',
+        bool(options.get('extract_text'))
+    )
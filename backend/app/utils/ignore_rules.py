@@ -0,0 +1,138 @@
+"""Ignore rules - strip volatile fields (timestamps, nonces, counters) before comparison
+
+Rules are a dict like {"regex": [...], "json_paths": [...]}. They are
+compiled once per distinct rule set and cached in-process.
+
+JSON paths accept JSON pointers ("/data/timestamp") or dotted paths
+("data.timestamp", "$.items[*].id"); "*" matches any key or index.
+"""
+import json
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+WILDCARD = '*'
+
+_DOTTED_TOKEN = re.compile(r'\[(\d+|\*)\]|\[["\']([^"\']*)["\']\]|([^.\[\]]+)')
+
+
+def parse_json_path(path: str) -> Tuple[Any, ...]:
+    """
+    Split a JSON pointer or dotted path into tokens
+
+    Args:
+        path: '/a/0/b', 'a[0].b', '$.a.*.b'
+
+    Returns:
+        Tuple of keys (str), indices (int) or WILDCARD
+    """
+    if path.startswith('/'):
+        tokens = [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
+        return tuple(int(token) if token.isdigit() else token for token in tokens)
+
+    if path.startswith('$'):
+        path = path[1:].lstrip('.')
+    tokens: List[Any] = []
+    for index, quoted, key in _DOTTED_TOKEN.findall(path):
+        if index:
+            tokens.append(WILDCARD if index == WILDCARD else int(index))
+        elif quoted:
+            tokens.append(quoted)
+        else:
+            tokens.append(key)
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=1024)
+def compile_rules(rules_key: str) -> Tuple[Tuple[re.Pattern, ...], Tuple[Tuple[Any, ...], ...]]:
+    """
+    Compile a rule set
+
+    Args:
+        rules_key: Rule dict serialized with sorted keys (the cache key)
+
+    Returns:
+        Tuple of (compiled regexes, parsed JSON paths)
+
+    Raises:
+        ValueError: If a regex is invalid
+    """
+    rules = json.loads(rules_key)
+    patterns = []
+    for pattern in rules.get('regex') or []:
+        try:
+            patterns.append(re.compile(pattern))
+        except re.error as e:
+            raise ValueError(f"Invalid ignore regex '{pattern}': {e}") from e
+    paths = tuple(parse_json_path(path) for path in rules.get('json_paths') or [] if path)
+    return tuple(patterns), paths
+
+
+def _remove_path(value: Any, tokens: Tuple[Any, ...]):
+    """Delete every node matching the path tokens"""
+    if not tokens:
+        return
+    head, rest = tokens[0], tokens[1:]
+
+    if isinstance(value, dict):
+        keys = list(value) if head == WILDCARD else [head] if isinstance(head, str) and head in value else []
+        for key in keys:
+            if rest:
+                _remove_path(value[key], rest)
+            else:
+                del value[key]
+    elif isinstance(value, list):
+        if head == WILDCARD:
+            indices = range(len(value))
+        elif isinstance(head, int) and head < len(value):
+            indices = [head]
+        else:
+            indices = []
+        if rest:
+            for index in indices:
+                _remove_path(value[index], rest)
+        else:
+            for index in sorted(indices, reverse=True):
+                del value[index]
+
+
+def apply_ignore_rules(content: bytes, rules: Optional[dict]) -> bytes:
+    """
+    Remove ignored fields from content
+
+    JSON paths apply only when the content parses as JSON; the result is then
+    re-serialized (indented, key order preserved). Regexes are applied to
+    the text afterwards, with matches removed.
+
+    Args:
+        content: Content bytes
+        rules: Ignore rule dict, or None
+
+    Returns:
+        Content without ignored parts
+    """
+    if not rules:
+        return content
+    patterns, paths = compile_rules(json.dumps(rules, sort_keys=True))
+
+    if paths:
+        try:
+            document = json.loads(content.decode('utf-8'))
+            if document is not None:
+                for tokens in paths:
+                    _remove_path(document, tokens)
+                content = json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')
+        except (ValueError, RecursionError):
+            # Not JSON, or nested too deeply to parse or re-serialize: leave it as is
+            pass
+
+    if patterns:
+        try:
+            text = content.decode('utf-8')
+        except UnicodeDecodeError:
+            return content
+        for pattern in patterns:
+            text = pattern.sub('', text)
+        content = text.encode('utf-8')
+
+    return content
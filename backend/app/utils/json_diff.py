@@ -0,0 +1,185 @@
+"""Structure-aware JSON comparison - canonical form and JSON-pointer change lists"""
+import json
+from decimal import Decimal
+from typing import Any, Dict, List
+
+_MISSING = object()
+
+# Numbers whose magnitude is outside 1e-30..1e30 are written in scientific
+# notation; expanding them (e.g. 1e99999999) would take unbounded time and memory
+MAX_PLAIN_EXPONENT = 30
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"Non-standard JSON constant: {name}")
+
+
+def parse(content: bytes) -> Any:
+    """
+    Parse JSON content, keeping decimal numbers exact
+
+    Raises:
+        ValueError: If the content is not valid UTF-8 JSON (NaN and Infinity included)
+    """
+    return json.loads(content.decode('utf-8'), parse_float=Decimal, parse_constant=_reject_constant)
+
+
+def _plain_range(value: Decimal) -> bool:
+    """Whether a finite, non-zero Decimal is small enough to write out in full"""
+    return -MAX_PLAIN_EXPONENT <= value.adjusted() <= MAX_PLAIN_EXPONENT
+
+
+def _number(value) -> str:
+    """Canonical number: 1, 1.0 and 1e0 all become '1'; 1e40 becomes '1E+40'"""
+    if isinstance(value, int) and abs(value) < 10 ** (MAX_PLAIN_EXPONENT + 1):
+        return str(value)
+    if not isinstance(value, Decimal):
+        value = Decimal(value) if isinstance(value, int) else Decimal(repr(value))
+    if value.is_zero():
+        return '0'
+    # Strip trailing zeros by hand: normalize() overflows the default context
+    sign, digits, exponent = value.as_tuple()
+    while len(digits) > 1 and digits[-1] == 0:
+        digits = digits[:-1]
+        exponent += 1
+    value = Decimal((sign, digits, exponent))
+    if not _plain_range(value):
+        return format(value, 'E')
+    if value.as_tuple().exponent >= 0:
+        return str(int(value))
+    return format(value, 'f')
+
+
+def canonical_dumps(value: Any) -> str:
+    """
+    Serialize parsed JSON canonically: sorted keys, no whitespace, normalized numbers
+
+    Args:
+        value: Parsed JSON value
+
+    Returns:
+        Canonical JSON text
+    """
+    parts: List[str] = []
+    # Explicit stack so deeply nested documents cannot hit the recursion
+    # limit; it holds values still to serialize and literal text as 1-tuples
+    stack: List[Any] = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, tuple):
+            parts.append(item[0])
+        elif isinstance(item, dict):
+            pieces: List[Any] = [('{',)]
+            for index, (key, child) in enumerate(sorted(item.items())):
+                pieces.append(((',' if index else '') + json.dumps(key, ensure_ascii=False) + ':',))
+                pieces.append(child)
+            pieces.append(('}',))
+            stack.extend(reversed(pieces))
+        elif isinstance(item, list):
+            pieces = [('[',)]
+            for index, child in enumerate(item):
+                if index:
+                    pieces.append((',',))
+                pieces.append(child)
+            pieces.append((']',))
+            stack.extend(reversed(pieces))
+        elif isinstance(item, bool) or item is None or isinstance(item, str):
+            parts.append(json.dumps(item, ensure_ascii=False))
+        else:
+            parts.append(_number(item))
+    return ''.join(parts)
+
+
+def canonicalize(content: bytes) -> bytes:
+    """
+    Canonical bytes of JSON content
+
+    Raises:
+        ValueError: If the content is not valid UTF-8 JSON
+    """
+    return canonical_dumps(parse(content)).encode('utf-8')
+
+
+def escape_pointer_token(token: str) -> str:
+    """Escape a key for use in a JSON pointer (RFC 6901)"""
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def _plain(value: Any) -> Any:
+    """Convert Decimals back to JSON-serializable numbers"""
+    if isinstance(value, Decimal):
+        if not value.is_zero() and not _plain_range(value):
+            return _number(value)
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Compare scalars the way the canonical form does (1 == 1.0, but True != 1)"""
+    if isinstance(old, bool) or isinstance(new, bool):
+        return type(old) is type(new) and old == new
+    if isinstance(old, (int, Decimal)) and isinstance(new, (int, Decimal)):
+        return _number(old) == _number(new)
+    return type(old) is type(new) and old == new
+
+
+def pointer_changes(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """
+    List differences between two parsed JSON documents as JSON pointers
+
+    Objects are compared key by key and arrays index by index.
+
+    Args:
+        old: Old parsed value
+        new: New parsed value
+        path: Pointer prefix
+
+    Returns:
+        List of {'op': 'added'|'removed'|'changed', 'path': ..., 'old'/'new': ...}
+    """
+    changes: List[Dict[str, Any]] = []
+    # Explicit stack so deeply nested documents cannot hit the recursion limit
+    stack = [(path, old, new)]
+    while stack:
+        current, old_value, new_value = stack.pop()
+
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            for key in sorted(set(old_value) | set(new_value), reverse=True):
+                stack.append((
+                    f"{current}/{escape_pointer_token(key)}",
+                    old_value.get(key, _MISSING),
+                    new_value.get(key, _MISSING)
+                ))
+        elif isinstance(old_value, list) and isinstance(new_value, list):
+            for index in reversed(range(max(len(old_value), len(new_value)))):
+                stack.append((
+                    f"{current}/{index}",
+                    old_value[index] if index < len(old_value) else _MISSING,
+                    new_value[index] if index < len(new_value) else _MISSING
+                ))
+        elif old_value is _MISSING:
+            changes.append({'op': 'added', 'path': current, 'new': _plain(new_value)})
+        elif new_value is _MISSING:
+            changes.append({'op': 'removed', 'path': current, 'old': _plain(old_value)})
+        elif not _same(old_value, new_value):
+            changes.append({'op': 'changed', 'path': current, 'old': _plain(old_value), 'new': _plain(new_value)})
+
+    return changes
+
+
+def diff(old_content: bytes, new_content: bytes) -> str:
+    """
+    JSON-pointer change list between two JSON documents
+
+    Raises:
+        ValueError: If either side is not valid UTF-8 JSON
+
+    Returns:
+        Change list serialized as JSON text
+    """
+    changes = pointer_changes(parse(old_content), parse(new_content))
+    return json.dumps({'changes': changes}, ensure_ascii=False, indent=2)
@@ -0,0 +1,121 @@
+"""Keyset (cursor) pagination
+
+A cursor is an opaque token holding the sort key and ID of the last row of a
+page. The next page starts strictly after it:
+
+    WHERE sort < :value OR (sort = :value AND id < :id)   -- descending
+
+which a (sort, id) index answers by seeking, so the cost of a page does not
+depend on how deep it is, unlike OFFSET. Ties on the sort key are broken by
+ID, so rows are never skipped or repeated.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from sqlalchemy import and_, or_, asc, desc
+from sqlalchemy.sql import Select
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(key: str, value: Any, row_id: int) -> str:
+    """
+    Build the cursor for the row after (value, row_id)
+
+    Args:
+        key: Name of the sort column, checked when the cursor is used
+        value: Sort value of the last row
+        row_id: ID of the last row
+
+    Returns:
+        URL-safe cursor
+    """
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps([key, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, key: str) -> Tuple[Any, int]:
+    """
+    Read a cursor
+
+    Args:
+        cursor: Cursor from encode_cursor()
+        key: Sort column the query uses
+
+    Returns:
+        Tuple of (sort value, row ID)
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another sort
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_key, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_key != key or not isinstance(row_id, int):
+        raise ValueError(f"Cursor does not match the sort order ({key})")
+    return value, row_id
+
+
+def paginate(
+    query: Select,
+    sort_column,
+    id_column,
+    key: str,
+    descending: bool = True,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Select:
+    """
+    Order a query by (sort_column, id_column) and select one page
+
+    Args:
+        query: Filtered query
+        sort_column: Column the page is sorted by
+        id_column: Unique tie-breaker (the primary key)
+        key: Name of the sort column recorded in cursors
+        descending: Sort direction
+        cursor: Start after this cursor (keyset paging); skip is ignored
+        skip: Rows to skip when no cursor is given (offset paging)
+        limit: Page size
+
+    Returns:
+        Query for the page
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor, key)
+        if descending:
+            query = query.where(or_(sort_column < value, and_(sort_column == value, id_column < row_id)))
+        else:
+            query = query.where(or_(sort_column > value, and_(sort_column == value, id_column > row_id)))
+    elif skip:
+        query = query.offset(skip)
+
+    direction = desc if descending else asc
+    return query.order_by(direction(sort_column), direction(id_column)).limit(limit)
+
+
+def next_cursor(items: Sequence[Any], key: str, limit: int) -> Optional[str]:
+    """
+    Cursor of the page after `items`, or None if this was the last page
+
+    Args:
+        items: Rows or response objects of the page, with `id` and `key` attributes
+        key: Sort attribute
+        limit: Requested page size
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(key, getattr(last, key), last.id)
@@ -0,0 +1,169 @@
+"""SimHash similarity - cheap near-duplicate scoring for change severity
+
+Documents are reduced to a 64-bit SimHash over word shingles (byte shingles
+for binary content). Only the bottom-k shingle hashes are used, which keeps
+the cost bounded on large pages while staying consistent between versions.
+
+A SimHash over a handful of distinct shingles (short or repetitive pages)
+flips on small edits, so such versions are scored by word overlap instead.
+"""
+import hashlib
+import heapq
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+HASH_BITS = 64
+SHINGLE_SIZE = 3
+MAX_FEATURES = 4096
+MIN_FEATURES = 32  # distinct shingles needed on both sides to trust the SimHash
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def _tokens(content: bytes) -> List[bytes]:
+    """Words for text, overlapping 8-byte windows for binary content"""
+    try:
+        return [word.encode('utf-8') for word in _WORD.findall(content.decode('utf-8').lower())]
+    except UnicodeDecodeError:
+        return [content[i:i + 8] for i in range(0, max(len(content) - 7, 1), 4)]
+
+
+def _shingles(content: bytes) -> Iterable[bytes]:
+    """Word shingles for text, byte shingles for binary content"""
+    try:
+        words = _WORD.findall(content.decode('utf-8').lower())
+    except UnicodeDecodeError:
+        return (content[i:i + 8] for i in range(0, max(len(content) - 7, 1), 4))
+    if len(words) < SHINGLE_SIZE:
+        return [' '.join(words).encode('utf-8')]
+    return (
+        ' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8')
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    )
+
+
+def simhash(content: bytes) -> int:
+    """
+    Compute the 64-bit SimHash of content
+
+    Args:
+        content: Content bytes (normalized)
+
+    Returns:
+        SimHash as an unsigned 64-bit integer
+    """
+    features = {
+        int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'big')
+        for shingle in _shingles(content)
+    }
+    if len(features) > MAX_FEATURES:
+        features = heapq.nsmallest(MAX_FEATURES, features)
+    if not features:
+        return 0
+
+    threshold = len(features) / 2
+    value = 0
+    for bit in range(HASH_BITS):
+        mask = 1 << bit
+        if sum(1 for feature in features if feature & mask) > threshold:
+            value |= mask
+    return value
+
+
+def similarity(a: int, b: int) -> float:
+    """
+    Similarity of two SimHashes (1.0 = identical)
+
+    Args:
+        a: First SimHash
+        b: Second SimHash
+
+    Returns:
+        1 - hamming distance / 64
+    """
+    return 1.0 - bin(a ^ b).count('1') / HASH_BITS
+
+
+def feature_count(content: bytes, limit: int = MIN_FEATURES) -> int:
+    """Number of distinct shingles in content, counted up to limit"""
+    seen = set()
+    for shingle in _shingles(content):
+        seen.add(shingle)
+        if len(seen) >= limit:
+            break
+    return len(seen)
+
+
+def token_similarity(old_content: bytes, new_content: bytes) -> float:
+    """
+    Share of words two versions have in common, counted with multiplicity
+
+    Linear in the content size, unlike a line or character diff ratio, which
+    is quadratic on the repetitive pages it is needed for.
+
+    Args:
+        old_content: Old content bytes (normalized)
+        new_content: New content bytes (normalized)
+
+    Returns:
+        2 * common words / total words (1.0 = same words)
+    """
+    old_tokens = Counter(_tokens(old_content))
+    new_tokens = Counter(_tokens(new_content))
+    total = sum(old_tokens.values()) + sum(new_tokens.values())
+    if not total:
+        return 1.0
+    return 2 * sum((old_tokens & new_tokens).values()) / total
+
+
+def compare(old_hash: int, new_hash: int, old_content: bytes, new_content: bytes) -> float:
+    """
+    Similarity of two versions
+
+    Uses the SimHashes when both versions have at least MIN_FEATURES distinct
+    shingles, and token_similarity() otherwise.
+
+    Args:
+        old_hash: SimHash of the old version
+        new_hash: SimHash of the new version
+        old_content: Old content bytes (normalized)
+        new_content: New content bytes (normalized)
+
+    Returns:
+        Similarity between 0 and 1 (1.0 = identical)
+    """
+    if feature_count(old_content) >= MIN_FEATURES and feature_count(new_content) >= MIN_FEATURES:
+        return similarity(old_hash, new_hash)
+    return token_similarity(old_content, new_content)
+
+
+def classify(score: Optional[float]) -> Optional[str]:
+    """
+    Map a similarity score to a change severity
+
+    Unrelated documents score around 0.5, so 'major' starts well above that.
+
+    Args:
+        score: Similarity from similarity()
+
+    Returns:
+        'minor', 'moderate', 'major', or None without a score
+    """
+    if score is None:
+        return None
+    if score >= 0.9:
+        return 'minor'
+    if score >= 0.7:
+        return 'moderate'
+    return 'major'
+
+
+def to_hex(value: int) -> str:
+    """Serialize a SimHash for storage"""
+    return f"{value:016x}"
+
+
+def from_hex(value: Optional[str]) -> Optional[int]:
+    """Parse a stored SimHash"""
+    return int(value, 16) if value else None
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script to move large content blobs from the database to pack files
+
+Blobs whose stored size is at least ARCHIVE_MIN_BYTES are appended to pack
+files under ARCHIVE_DIR; the database keeps only their location. New blobs
+are placed this way automatically; this handles blobs written before.
+
+Usage:
+    python archive_content_blobs.py [--batch-size 100]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.content_store import ContentStore
+
+
+async def archive(batch_size: int):
+    async with AsyncSessionLocal() as db:
+        moved = await ContentStore.archive_blobs(db, batch_size=batch_size)
+        print(f"Moved {moved} blob(s) to pack files")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move large content blobs to pack files")
+    parser.add_argument("--batch-size", type=int, default=100, help="Blobs moved per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(archive(args.batch_size))
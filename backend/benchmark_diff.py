@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the diff engine against the previous difflib path
+
+Generates HTML-like documents of roughly 10 KB, 1 MB and 10 MB, mutates a
+share of their lines and times difflib.unified_diff against
+app.utils.diff.unified_diff on the same input.
+
+Usage:
+    python benchmark_diff.py [--change-ratio 0.05] [--difflib-max-mb 10]
+"""
+import sys
+import os
+import time
+import random
+import difflib
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.diff import unified_diff
+
+SIZES = [
+    ("10 KB", 10 * 1024),
+    ("1 MB", 1024 * 1024),
+    ("10 MB", 10 * 1024 * 1024),
+]
+
+
+def make_document(size: int, rng: random.Random) -> list:
+    """Build a list of HTML-ish lines totalling about `size` bytes"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = f'<tr id="row-{i}"><td>{rng.randint(0, 10**6)}</td><td>item {i}</td></tr>\n'
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return lines
+
+
+def mutate(lines: list, ratio: float, rng: random.Random) -> list:
+    """Replace, delete or insert about `ratio` of the lines"""
+    new_lines = list(lines)
+    for _ in range(max(1, int(len(lines) * ratio))):
+        op = rng.random()
+        pos = rng.randrange(len(new_lines))
+        if op < 0.5:
+            new_lines[pos] = f'<tr class="changed"><td>{rng.randint(0, 10**6)}</td></tr>\n'
+        elif op < 0.75:
+            del new_lines[pos]
+        else:
+            new_lines.insert(pos, f'<tr class="added"><td>{rng.randint(0, 10**6)}</td></tr>\n')
+    return new_lines
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark diff engines")
+    parser.add_argument("--change-ratio", type=float, default=0.05, help="Share of lines changed")
+    parser.add_argument("--difflib-max-mb", type=float, default=10, help="Skip difflib above this size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'size':>8} {'lines':>8} {'difflib (s)':>12} {'engine (s)':>11} {'speedup':>8} {'same output':>12}")
+
+    for label, size in SIZES:
+        old_lines = make_document(size, rng)
+        new_lines = mutate(old_lines, args.change_ratio, rng)
+
+        engine_time, engine_diff = timed(
+            lambda: list(unified_diff(old_lines, new_lines, 'old', 'new', lineterm=''))
+        )
+
+        if size <= args.difflib_max_mb * 1024 * 1024:
+            difflib_time, difflib_diff = timed(
+                lambda: list(difflib.unified_diff(old_lines, new_lines, 'old', 'new', lineterm=''))
+            )
+            speedup = f"{difflib_time / engine_time:.1f}x" if engine_time else "-"
+            same = "yes" if engine_diff == difflib_diff else "no"
+            difflib_col = f"{difflib_time:.3f}"
+        else:
+            difflib_col, speedup, same = "skipped", "-", "-"
+
+        print(f"{label:>8} {len(old_lines):>8} {difflib_col:>12} {engine_time:>11.3f} {speedup:>8} {same:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark reverse-delta version storage
+
+Builds a page history (an HTML-like page where a few lines change per
+version), stores it the way the blob store does - newest version full, older
+versions as reverse deltas against their successor, a full keyframe every N
+versions - and reports storage per version and reconstruction latency for
+several keyframe intervals.
+
+Usage:
+    python benchmark_storage.py [--size-mb 2] [--versions 100] [--changes 5]
+"""
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils import delta as delta_utils
+
+INTERVALS = [1, 5, 10, 20, 50]
+
+
+def make_page(size: int, rng: random.Random) -> list:
+    """Build a list of HTML-ish lines totalling about `size` bytes"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = f'<tr id="row-{i}"><td>{rng.randint(0, 10**6)}</td><td>item {i}</td></tr>\n'.encode()
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return lines
+
+
+def make_history(size: int, versions: int, changes: int, rng: random.Random) -> list:
+    """Successive page versions, each with `changes` lines edited, added or removed"""
+    lines = make_page(size, rng)
+    history = [b''.join(lines)]
+    for version in range(1, versions):
+        for _ in range(changes):
+            op = rng.random()
+            pos = rng.randrange(len(lines))
+            if op < 0.6:
+                lines[pos] = f'<tr class="v{version}"><td>{rng.randint(0, 10**6)}</td></tr>\n'.encode()
+            elif op < 0.8:
+                del lines[pos]
+            else:
+                lines.insert(pos, f'<tr class="added"><td>{version}</td></tr>\n'.encode())
+        history.append(b''.join(lines))
+    return history
+
+
+def store(history: list, interval: int) -> tuple:
+    """
+    Store the history version by version
+
+    Returns:
+        Tuple of (stored entries: ('full', data) or ('delta', data), seconds spent encoding)
+    """
+    stored = []
+    run = 0  # deltas chained into the current full version
+    encode_time = 0.0
+    for index, content in enumerate(history):
+        if index and run + 1 < interval:
+            start = time.perf_counter()
+            delta = delta_utils.encode(content, history[index - 1])
+            encode_time += time.perf_counter() - start
+            stored[index - 1] = ('delta', delta)
+            run += 1
+        else:
+            run = 0
+        stored.append(('full', content))
+    return stored, encode_time
+
+
+def reconstruct(stored: list, index: int) -> bytes:
+    """Rebuild a version by applying deltas from the nearest newer full version"""
+    end = index
+    while stored[end][0] == 'delta':
+        end += 1
+    content = stored[end][1]
+    for position in range(end - 1, index - 1, -1):
+        content = delta_utils.apply(content, stored[position][1])
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reverse-delta version storage")
+    parser.add_argument("--size-mb", type=float, default=2, help="Page size")
+    parser.add_argument("--versions", type=int, default=100, help="Versions in the history")
+    parser.add_argument("--changes", type=int, default=5, help="Lines changed per version")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    history = make_history(int(args.size_mb * 1024 * 1024), args.versions, args.changes, rng)
+    raw = sum(len(content) for content in history)
+    print(f"{len(history)} versions, {raw / len(history) / 1024:.0f} KB each, {raw / 1024 / 1024:.1f} MB raw")
+    print(f"{'interval':>8} {'stored MB':>10} {'KB/version':>11} {'ratio':>7} {'encode ms/v':>12} {'avg read ms':>12} {'max read ms':>12}")
+
+    for interval in INTERVALS:
+        stored, encode_time = store(history, interval)
+        size = sum(len(data) for _, data in stored)
+
+        latencies = []
+        for index, content in enumerate(history):
+            start = time.perf_counter()
+            rebuilt = reconstruct(stored, index)
+            latencies.append(time.perf_counter() - start)
+            assert rebuilt == content, f"version {index} did not round-trip"
+
+        print(
+            f"{interval:>8} {size / 1024 / 1024:>10.2f} {size / len(history) / 1024:>11.1f} "
+            f"{raw / size:>6.1f}x {encode_time / len(history) * 1000:>12.1f} "
+            f"{sum(latencies) / len(latencies) * 1000:>12.2f} {max(latencies) * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
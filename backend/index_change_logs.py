@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to index existing change log diffs for full-text search
+
+Change logs are indexed in change_log_search when they are written; this
+handles change logs written before the search table existed.
+
+Usage:
+    python index_change_logs.py [--batch-size 500]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.search_service import SearchService
+
+
+async def index(batch_size: int):
+    async with AsyncSessionLocal() as db:
+        indexed = await SearchService.backfill(db, batch_size=batch_size)
+        print(f"Indexed {indexed} change log(s) for search")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index existing change log diffs for full-text search")
+    parser.add_argument("--batch-size", type=int, default=500, help="Change logs indexed per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(index(args.batch_size))
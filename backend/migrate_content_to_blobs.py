@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script to move legacy inline snapshot and change log content into the blob store
+
+Content written by older versions lives in snapshots.content and
+change_logs.old_content/new_content. This moves it to content_blobs, where
+each distinct body is stored once, in small batches. Safe to re-run.
+
+Usage:
+    python migrate_content_to_blobs.py [--batch-size 100]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.content_store import ContentStore
+
+
+async def migrate(batch_size: int):
+    async with AsyncSessionLocal() as db:
+        snapshots, change_logs = await ContentStore.migrate_inline_content(db, batch_size=batch_size)
+        print(f"Moved {snapshots} snapshot(s) and {change_logs} change log(s) to the blob store")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move inline content to the blob store")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows moved per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.batch_size))
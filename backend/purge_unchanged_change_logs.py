@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to purge legacy 'unchanged' change logs
+
+Unchanged checks no longer write change log rows; this removes the rows
+written by older versions, in small batches.
+
+Usage:
+    python purge_unchanged_change_logs.py [--batch-size 1000]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.change_log_service import ChangeLogService
+
+
+async def purge(batch_size: int):
+    async with AsyncSessionLocal() as db:
+        deleted = await ChangeLogService.purge_unchanged_change_logs(db, batch_size=batch_size)
+        print(f"Deleted {deleted} unchanged change log(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge legacy 'unchanged' change logs")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(purge(args.batch_size))
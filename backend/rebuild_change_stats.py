@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the hourly and daily change statistics rollups
+
+The rollups are updated with every change log written or deleted; this
+fills them for change logs written before they existed, and recomputes the
+min/max sizes left over from deleted change logs. Changes detected while
+it runs can be counted twice, so run it with the scheduler stopped.
+
+Usage:
+    python rebuild_change_stats.py [--batch-size 5000]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.rollup_service import RollupService
+
+
+async def rebuild(batch_size: int):
+    async with AsyncSessionLocal() as db:
+        counted = await RollupService.rebuild(db, batch_size=batch_size)
+        print(f"Rolled up {counted} change log(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the change statistics rollups")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Change logs read per batch")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.batch_size))
@@ -6,13 +6,16 @@ sys.path.insert(0, '/app')
 
 from app.database import AsyncSessionLocal
 from app.models.change_log import ChangeLog
+from app.services.content_store import ContentStore
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 
 async def test_diff():
     async with AsyncSessionLocal() as db:
         # Get a recent modified change log
         result = await db.execute(
             select(ChangeLog)
+            .options(undefer(ChangeLog.diff))
             .where(ChangeLog.change_type == 'modified')
             .order_by(ChangeLog.id.desc())
             .limit(1)
@@ -23,17 +26,19 @@ async def test_diff():
             print("No modified change logs found")
             return
             
+        old_content, new_content = await ContentStore.load_change_log(db, log)
+        
         print(f"Change log ID: {log.id}")
-        print(f"Old content length: {len(log.old_content) if log.old_content else 0}")
-        print(f"New content length: {len(log.new_content) if log.new_content else 0}")
+        print(f"Old content length: {len(old_content) if old_content else 0}")
+        print(f"New content length: {len(new_content) if new_content else 0}")
         print(f"Diff length: {len(log.diff) if log.diff else 0}")
         
-        if log.old_content and log.new_content:
+        if old_content and new_content:
             # Test compute_diff
             import difflib
             try:
-                old_text = log.old_content.decode('utf-8')
-                new_text = log.new_content.decode('utf-8')
+                old_text = old_content.decode('utf-8')
+                new_text = new_content.decode('utf-8')
                 old_lines = old_text.splitlines(keepends=True)
                 new_lines = new_text.splitlines(keepends=True)
                 diff = difflib.unified_diff(old_lines, new_lines, fromfile='old', tofile='new', lineterm='')
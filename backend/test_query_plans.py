@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Check that the hot query shapes are served by an index
+
+Runs the ChangeLogService, WatcherService and CookieService methods and the
+workflow executions endpoint behind the per-watcher and per-workflow reads,
+records the SELECT statements they send and runs EXPLAIN on each. Exits
+with status 1 if any of them falls back to a full table scan because no
+index fits, or does not use the index listed for it in EXPECTED_INDEXES.
+A scan the optimizer picks although an index would do (usual on near-empty
+tables) is reported as a warning.
+
+Usage:
+    python test_query_plans.py
+"""
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Response
+from sqlalchemy import event, select
+from app.api.workflows.executions import get_workflow_executions
+from app.database import Base, engine, AsyncSessionLocal
+from app.models.cookie import Cookie
+from app.services.change_log_service import ChangeLogService
+from app.services.cookie_service import CookieService
+from app.services.watcher_service import WatcherService
+from app.utils.pagination import encode_cursor
+
+NOW = datetime.now(timezone.utc)
+WEEK_AGO = (NOW - timedelta(days=7)).date().isoformat()
+MONTH_AGO = (NOW - timedelta(days=30)).date().isoformat()
+
+
+async def drain(records):
+    """Consume a streamed result"""
+    async for _ in records:
+        pass
+
+
+# Each check runs the code that serves the query; the statements it sends
+# are what gets explained
+QUERIES = {
+    "change log history of a watcher": lambda db: ChangeLogService.get_change_logs_with_filters(
+        db, watcher_id=1
+    ),
+    "change log history of a watcher in a date range": lambda db: ChangeLogService.get_change_logs_with_filters(
+        db, watcher_id=1, date_from=WEEK_AGO
+    ),
+    "change log page after a cursor": lambda db: ChangeLogService.get_change_logs_with_filters(
+        db, cursor=encode_cursor('detected_at', NOW, 1000)
+    ),
+    "change log export of a watcher": lambda db: drain(ChangeLogService.stream_export(
+        db, ChangeLogService.build_filters(db, watcher_id=1)
+    )),
+    "change statistics in a date range": lambda db: ChangeLogService.get_statistics(
+        db, date_from=MONTH_AGO
+    ),
+    "change statistics of a watcher": lambda db: ChangeLogService.get_statistics(
+        db, watcher_id=1, date_from=MONTH_AGO
+    ),
+    "snapshot of a watcher": lambda db: ChangeLogService.get_latest_snapshot(db, 1),
+    # Cookie replacement after each execution (WatcherExecutor._save_cookies,
+    # which also writes, so only its read is run here)
+    "cookies of a watcher": lambda db: db.execute(select(Cookie).where(Cookie.watcher_id == 1)),
+    "expired cookies": lambda db: CookieService.get_expired_cookies(db),
+    "cookies expiring soon": lambda db: CookieService.get_cookies_expiring_soon(db),
+    "watcher page after a cursor": lambda db: WatcherService.get_watchers(
+        db, cursor=encode_cursor('created_at', NOW, 1000)
+    ),
+    "execution history of a workflow": lambda db: get_workflow_executions(
+        1, Response(), skip=0, limit=100, cursor=None, db=db
+    ),
+}
+
+# Queries that must use one specific index, not just any index
+EXPECTED_INDEXES = {
+    # One snapshot per watcher since 014
+    "snapshot of a watcher": "ix_snapshots_watcher_id",
+}
+
+
+async def capture(check) -> list:
+    """
+    SELECT statements a check sends, as (statement, parameters) in the
+    driver's paramstyle
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    try:
+        async with AsyncSessionLocal() as db:
+            await check(db)
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', record)
+    return statements
+
+
+async def explain(conn, statement: str, params) -> list:
+    """
+    Plan of a statement as (table, access, index, usable indexes) rows;
+    access is 'scan' for a full table scan
+
+    Supports MySQL/MariaDB EXPLAIN and SQLite EXPLAIN QUERY PLAN.
+    """
+    if conn.dialect.name == 'sqlite':
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)
+        plan = []
+        for row in result.all():
+            detail = row[-1]
+            words = detail.split()
+            if words[0] in ('SCAN', 'SEARCH'):
+                index = detail.split(' INDEX ', 1)[1].split()[0] if ' INDEX ' in detail else None
+                access = 'scan' if words[0] == 'SCAN' and index is None else 'index'
+                plan.append((words[1], access, index, index))
+        return plan
+
+    result = await conn.exec_driver_sql(f"EXPLAIN {statement}", params)
+    plan = []
+    for row in result.mappings().all():
+        access = 'scan' if row['type'] == 'ALL' else row['type']
+        plan.append((row['table'], access, row['key'], row['possible_keys']))
+    return plan
+
+
+async def main() -> int:
+    failures = 0
+    for name, check in QUERIES.items():
+        statements = await capture(check)
+        plan = []
+        async with engine.connect() as conn:
+            for statement, params in statements:
+                plan += await explain(conn, statement, params)
+        # Scans of derived tables (e.g. a LIMITed subquery) read a temporary result
+        scans = [
+            usable for table, access, _, usable in plan
+            if access == 'scan' and table in Base.metadata.tables
+        ]
+        expected = EXPECTED_INDEXES.get(name)
+        if any(not usable for usable in scans) or (
+            expected and expected not in [index for _, _, index, _ in plan]
+        ):
+            status = "FAIL"
+            failures += 1
+        else:
+            status = "warn" if scans else "ok"
+        steps = ", ".join(f"{table}: {access} {index or ''}".rstrip() for table, access, index, _ in plan)
+        print(f"[{status:>4}] {name}: {steps}")
+    await engine.dispose()
+
+    if failures:
+        print(f"\n{failures} of {len(QUERIES)} queries fall back to a full table scan or miss their expected index")
+        return 1
+    print(f"\nAll {len(QUERIES)} queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Script to train per-watcher zstd compression dictionaries
+
+Each watcher's recent versions (CONTENT_DICT_SAMPLES) train a dictionary
+that new content of that watcher is compressed with. Re-run periodically
+as pages evolve; older content keeps the dictionary it was written with.
+Requires the optional zstandard package and CONTENT_CODEC=zstd.
+
+Usage:
+    python train_compression_dictionaries.py [--watcher-id 1]
+"""
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.watcher import Watcher
+from app.services.content_store import ContentStore
+
+
+async def train(watcher_id: int = None):
+    async with AsyncSessionLocal() as db:
+        if watcher_id is not None:
+            watcher_ids = [watcher_id]
+        else:
+            result = await db.execute(select(Watcher.id).order_by(Watcher.id))
+            watcher_ids = list(result.scalars().all())
+
+        trained = 0
+        for current_id in watcher_ids:
+            dictionary = await ContentStore.train_dictionary(db, current_id)
+            if dictionary is None:
+                print(f"Watcher {current_id}: not enough history (or zstd unavailable), skipped")
+                continue
+            trained += 1
+            print(f"Watcher {current_id}: {dictionary.size} byte dictionary from {dictionary.sample_count} versions")
+
+        print(f"Trained {trained} dictionar{'y' if trained == 1 else 'ies'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train per-watcher zstd compression dictionaries")
+    parser.add_argument("--watcher-id", type=int, default=None, help="Only train this watcher")
+    args = parser.parse_args()
+
+    asyncio.run(train(args.watcher_id))
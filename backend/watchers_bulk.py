@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script to import and export watchers in bulk
+
+Imports take a JSON array of watchers or NDJSON (one watcher per line) with
+the fields of POST /api/watchers, validate every record, then insert them in
+batches with one multi-row INSERT per transaction. Exports write the same
+format, so an export can be imported elsewhere.
+
+Usage:
+    python watchers_bulk.py import watchers.ndjson [--skip-existing] [--skip-invalid] [--batch-size 500]
+    python watchers_bulk.py export watchers.ndjson [--format ndjson|json]
+
+Use - as the file for stdin/stdout.
+"""
+import sys
+import os
+import json
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.watcher_service import WatcherService
+
+
+async def import_watchers(path: str, skip_existing: bool, skip_invalid: bool, batch_size: int) -> int:
+    if path == '-':
+        data = sys.stdin.read()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = f.read()
+
+    watchers, errors = WatcherService.parse_import(data)
+    for error in errors:
+        print(f"Record {error.index}: {error.error}", file=sys.stderr)
+    if errors and not skip_invalid:
+        print(f"{len(errors)} invalid record(s), nothing imported (use --skip-invalid to import the rest)", file=sys.stderr)
+        return 1
+
+    async with AsyncSessionLocal() as db:
+        created, skipped = await WatcherService.bulk_create(
+            db, watchers, skip_existing=skip_existing, batch_size=batch_size
+        )
+    print(f"Created {created} watcher(s), skipped {skipped} existing, {len(errors)} invalid", file=sys.stderr)
+    return 0
+
+
+async def export_watchers(path: str, output_format: str) -> int:
+    out = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+    count = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            if output_format == 'json':
+                out.write('[')
+            async for watcher in WatcherService.export_watchers(db):
+                if output_format == 'json':
+                    out.write((',\n' if count else '') + json.dumps(watcher))
+                else:
+                    out.write(json.dumps(watcher) + '\n')
+                count += 1
+            if output_format == 'json':
+                out.write(']\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Exported {count} watcher(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import and export watchers in bulk")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Create watchers from a JSON or NDJSON file")
+    import_parser.add_argument("file", help="JSON array or NDJSON file, - for stdin")
+    import_parser.add_argument("--skip-existing", action="store_true", help="Skip watchers whose URL and method are already watched")
+    import_parser.add_argument("--skip-invalid", action="store_true", help="Import the valid records even if some are invalid")
+    import_parser.add_argument("--batch-size", type=int, default=500, help="Watchers per INSERT and transaction")
+
+    export_parser = commands.add_parser("export", help="Write every watcher's configuration")
+    export_parser.add_argument("file", help="Output file, - for stdout")
+    export_parser.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+
+    args = parser.parse_args()
+    if args.command == "import":
+        sys.exit(asyncio.run(import_watchers(args.file, args.skip_existing, args.skip_invalid, args.batch_size)))
+    sys.exit(asyncio.run(export_watchers(args.file, args.format)))
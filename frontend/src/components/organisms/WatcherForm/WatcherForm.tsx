@@ -365,6 +365,7 @@ export const WatcherForm: React.FC<WatcherFormProps> = ({
             >
               <option value="hash">Hash Comparison</option>
               <option value="content_aware">Content Aware</option>
+              <option value="json">JSON Structure</option>
               <option value="disabled">Disabled</option>
             </select>
           </div>
@@ -11,11 +11,16 @@ export interface ChangeLog {
   old_hash?: string;
   old_size?: number;
   archive_path?: string;
+  similarity?: number; // 1.0 = identical to the previous content
+  severity?: 'minor' | 'moderate' | 'major';
   detected_at: string; // ISO date string
 }
 
+export type DiffFormat = 'unified' | 'json_pointer' | 'summary' | 'chunks';
+
 export interface ChangeLogWithDiff extends ChangeLog {
   diff?: string;
+  diff_format?: DiffFormat;
 }
 
 export interface ChangeLogListResponse extends ChangeLog {
@@ -36,7 +41,7 @@ export interface ChangeLogFilters {
 }
 
 export interface FrequencyDataPoint {
-  date: string; // YYYY-MM-DD
+  date: string; // YYYY-MM-DD (YYYY-MM-DD HH:00 when grouped by hour)
   count: number;
   new_count: number;
   modified_count: number;
@@ -80,9 +85,11 @@ export interface ChangeLogComparisonItem {
   id: number;
   detected_at: string; // ISO date string
   change_type: string;
+  severity?: 'minor' | 'moderate' | 'major';
   old_size?: number;
   new_size: number;
   diff?: string;
+  diff_format?: DiffFormat;
   watcher_name: string;
   watcher_url: string;
 }
@@ -96,7 +103,7 @@ export interface ChangeLogComparison {
 export interface ChangeLogFiltersExtended extends ChangeLogFilters {
   skip?: number;
   limit?: number;
-  group_by?: 'day' | 'week' | 'month';
+  group_by?: 'hour' | 'day' | 'week' | 'month';
 }
 
 // Chart data types
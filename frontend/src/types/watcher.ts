@@ -14,6 +14,11 @@ export enum ContentType {
   PDF = "pdf"
 }
 
+export interface IgnoreRules {
+  regex?: string[];
+  json_paths?: string[];
+}
+
 export interface Watcher {
   id: number;
   name: string;
@@ -29,6 +34,11 @@ export interface Watcher {
   use_cookies: boolean;
   cookie_watcher_id?: number;
   comparison_mode: string;
+  selector?: string;
+  selector_type: 'css' | 'xpath';
+  extract_text: boolean;
+  ignore_rules?: IgnoreRules;
+  similarity_threshold?: number;
   status: string;
   error_message?: string;
   check_count: number;
@@ -53,6 +63,11 @@ export interface WatcherCreate {
   use_cookies?: boolean;
   cookie_watcher_id?: number;
   comparison_mode?: string;
+  selector?: string;
+  selector_type?: 'css' | 'xpath';
+  extract_text?: boolean;
+  ignore_rules?: IgnoreRules;
+  similarity_threshold?: number;
 }
 
 export interface WatcherUpdate {
@@ -69,6 +84,11 @@ export interface WatcherUpdate {
   use_cookies?: boolean;
   cookie_watcher_id?: number;
   comparison_mode?: string;
+  selector?: string;
+  selector_type?: 'css' | 'xpath';
+  extract_text?: boolean;
+  ignore_rules?: IgnoreRules;
+  similarity_threshold?: number;
 }
 
 export interface WatcherStatistics {